@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark the asyncio detection API against blocking calls on the event loop.
+
+A local stand-in upload server streams length-prefixed files over several
+concurrent TCP connections. The intake side saves each upload to a temp
+directory and detects it, either by calling ``detect_file`` directly on the
+event loop (blocking) or through ``finspect.aio``. A heartbeat task records
+the worst event-loop stall in each mode.
+
+Usage:
+    python benchmarks/bench_aio.py [--uploads 400] [--clients 8] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import struct
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finspect import aio  # noqa: E402
+from finspect.detect import detect_file  # noqa: E402
+
+
+def build_payloads() -> list:
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(200):
+            zf.writestr(f"batch/doc{i:03d}.txt", b"Lorem ipsum dolor sit amet.\n" * 400)
+    return [
+        archive.getvalue(),
+        b"%PDF-1.5\n" + os.urandom(256 * 1024),
+        b"\x89PNG\r\n\x1a\n" + os.urandom(128 * 1024),
+        b"plain text upload\n" * 5000,
+    ]
+
+
+async def serve_uploads(reader, writer, payloads, count) -> None:
+    """Stand-in upload server: send count framed payloads, then a zero frame."""
+    for i in range(count):
+        data = payloads[i % len(payloads)]
+        writer.write(struct.pack("!I", len(data)) + data)
+        await writer.drain()
+    writer.write(struct.pack("!I", 0))
+    await writer.drain()
+    writer.close()
+
+
+async def receive_uploads(port, directory, client):
+    """Yield the path of each upload saved from one connection."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    index = 0
+    try:
+        while True:
+            (size,) = struct.unpack("!I", await reader.readexactly(4))
+            if size == 0:
+                return
+            path = directory / f"c{client}-{index}.bin"
+            path.write_bytes(await reader.readexactly(size))
+            index += 1
+            yield path
+    finally:
+        writer.close()
+
+
+async def heartbeat(stall: list, interval: float = 0.005) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stall[0] = max(stall[0], time.perf_counter() - start - interval)
+
+
+async def run(mode, args, payloads, directory):
+    per_client = args.uploads // args.clients
+
+    async def handler(reader, writer):
+        await serve_uploads(reader, writer, payloads, per_client)
+
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    detector = aio.AsyncDetector(args.concurrency, use_libmagic=not args.no_libmagic)
+
+    async def intake(client):
+        done = 0
+        uploads = receive_uploads(port, directory, client)
+        if mode == "blocking":
+            async for path in uploads:
+                detect_file(path, use_libmagic=not args.no_libmagic)
+                done += 1
+        else:
+            async for _ in detector.detect_many(uploads):
+                done += 1
+        return done
+
+    stall = [0.0]
+    beat = asyncio.ensure_future(heartbeat(stall))
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(intake(c) for c in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+    detector.close()
+    server.close()
+    await server.wait_closed()
+    return sum(counts), elapsed, stall[0]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=400, help="total uploads")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent connections")
+    parser.add_argument("--concurrency", type=int, default=8, help="aio detections in flight")
+    parser.add_argument("--no-libmagic", action="store_true")
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    print(f"{'mode':>9} {'files':>6} {'seconds':>8} {'files/s':>8} {'max stall ms':>13}")
+    for mode in ("blocking", "aio"):
+        with tempfile.TemporaryDirectory() as tmp:
+            count, elapsed, stall = asyncio.run(run(mode, args, payloads, Path(tmp)))
+        print(f"{mode:>9} {count:>6} {elapsed:>8.3f} {count / elapsed:>8.0f} {stall * 1000:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Measure memory held by the entries of a large archive result.
+
+Builds the entry list for a synthetic archive three ways and reports the
+bytes each retains, as measured by tracemalloc:
+
+    dataclass  plain dataclasses with eager containers (previous models)
+    slotted    the current slotted EntryResult with lazy containers
+    table      the same entries packed into a columnar EntryTable
+
+Usage:
+    python benchmarks/bench_models.py [--entries 10000]
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finspect.models import DetectionResult, EntryResult, EntryTable  # noqa: E402
+
+
+@dataclass
+class LegacyEntryResult:
+    """EntryResult as it was before the slotted models."""
+    name: str
+    media_type: str
+    confidence: int
+    size_bytes: Optional[int] = None
+    is_directory: bool = False
+    error: Optional[str] = None
+    source: Optional[str] = None
+    container_inference: Optional[str] = None
+    entries: List["LegacyEntryResult"] = field(default_factory=list)
+
+
+MEDIA_TYPES = ["application/pdf", "text/plain", "image/png", "application/xml"]
+
+
+def build(cls, count: int) -> list:
+    return [
+        cls(
+            name=f"batch/folder{i // 100:03d}/document{i:06d}.pdf",
+            media_type=MEDIA_TYPES[i % len(MEDIA_TYPES)],
+            confidence=100,
+            size_bytes=i * 37,
+            source="magic_bytes"
+        )
+        for i in range(count)
+    ]
+
+
+def measure(make) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = make()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return retained
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10000, help="archive entries")
+    args = parser.parse_args()
+
+    count = args.entries
+    layouts = {
+        "dataclass": lambda: build(LegacyEntryResult, count),
+        "slotted": lambda: DetectionResult(entries=build(EntryResult, count)),
+        "table": lambda: DetectionResult(entries=EntryTable(build(EntryResult, count))),
+    }
+
+    baseline = None
+    print(f"{'layout':>10} {'bytes':>12} {'per entry':>10} {'vs dataclass':>13}")
+    for name, make in layouts.items():
+        retained = measure(make)
+        baseline = baseline or retained
+        print(f"{name:>10} {retained:>12,} {retained / count:>10.1f} {retained / baseline:>12.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark JSON report serialization backends.
+
+Builds a report of synthetic container results and times writing it with
+stdlib ``json.dump(indent=2)`` (the previous report writer) against each
+installed ``finspect.serialize`` backend, indented and compact.
+
+Usage:
+    python benchmarks/bench_serialize.py [--results 20000] [--entries 20]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finspect import serialize  # noqa: E402
+from finspect.models import DetectionResult, EntryResult  # noqa: E402
+
+
+def build_results(count: int, entries: int) -> list:
+    results = []
+    for i in range(count):
+        result = DetectionResult(
+            path=f"/data/batch/{i:07d}.zip",
+            size_bytes=i * 1024,
+            is_container=True,
+            media_type="application/zip",
+            description="ZIP archive",
+            confidence=100,
+            entries=[
+                EntryResult(name=f"docs/{j:04d}.pdf", media_type="application/pdf", confidence=100)
+                for j in range(entries)
+            ]
+        )
+        result.sources["magic_bytes"] = "504b0304"
+        results.append(result)
+    return results
+
+
+def timed(write) -> float:
+    start = time.perf_counter()
+    write(io.StringIO())
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--results", type=int, default=20000, help="results in the report")
+    parser.add_argument("--entries", type=int, default=20, help="entries per container")
+    args = parser.parse_args()
+
+    results = build_results(args.results, args.entries)
+    backends = [b for b in serialize.BACKENDS if b == 'json'
+                or (b == 'orjson' and serialize.HAS_ORJSON)
+                or (b == 'msgspec' and serialize.HAS_MSGSPEC)]
+
+    cases = {
+        "json.dump + to_dict": lambda f: json.dump(
+            {"results": [r.to_dict() for r in results]}, f, indent=2
+        ),
+    }
+    for backend in backends:
+        for compact in (False, True):
+            label = f"{backend}{' compact' if compact else ''}"
+            cases[label] = lambda f, b=backend, c=compact: serialize.dump(
+                {"results": results}, f, c, b
+            )
+
+    baseline = None
+    print(f"{'writer':>22} {'seconds':>8} {'speedup':>8}")
+    for label, write in cases.items():
+        elapsed = timed(write)
+        baseline = baseline or elapsed
+        print(f"{label:>22} {elapsed:>8.3f} {baseline / elapsed:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark the finspect daemon against a subprocess per file.
+
+Generates a small corpus (see ``corpus.py``) and detects every file:
+
+    subprocess    ``python -m finspect.cli FILE --json`` once per file
+    serve path    one client connection sending path requests
+    serve fd      one client connection passing open descriptors
+    serve xN      N client threads, one connection each
+
+Usage:
+    python benchmarks/bench_server.py [--files 200] [--clients 4] [--no-libmagic]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import build_corpus  # noqa: E402
+from finspect.client import FinspectClient  # noqa: E402
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+
+def wait_for_socket(path: Path, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        if time.monotonic() > deadline:
+            raise RuntimeError("Daemon did not start")
+        time.sleep(0.05)
+
+
+def timed(run: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="files in the corpus")
+    parser.add_argument("--subprocess-files", type=int, default=50,
+                        help="files timed with a subprocess each (the slow baseline)")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent client threads")
+    parser.add_argument("--no-libmagic", action="store_true", help="use the fallback detector")
+    args = parser.parse_args()
+
+    flags = ["--no-libmagic"] if args.no_libmagic else []
+    env = {**os.environ, "PYTHONPATH": str(PACKAGE_ROOT)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / "corpus"
+        paths = build_corpus(corpus, args.files, max_size=256 * 1024)
+        socket_path = Path(tmp) / "finspect.sock"
+
+        def subprocess_each() -> None:
+            for path in paths[:args.subprocess_files]:
+                subprocess.run(
+                    [sys.executable, "-m", "finspect.cli", str(path), "--json", *flags],
+                    env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+
+        def serve_paths(batch: List[Path] = paths) -> None:
+            with FinspectClient(str(socket_path)) as client:
+                for path in batch:
+                    client.detect_file(str(path))
+
+        def serve_fds() -> None:
+            with FinspectClient(str(socket_path)) as client:
+                for path in paths:
+                    with open(path, "rb") as f:
+                        client.detect_fd(f.fileno(), name=str(path))
+
+        def serve_concurrent() -> None:
+            threads = [
+                threading.Thread(target=serve_paths, args=(paths[i::args.clients],))
+                for i in range(args.clients)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "finspect.cli", "serve", "--socket", str(socket_path), *flags],
+            env=env, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_socket(socket_path)
+            cases = [
+                ("subprocess", min(args.subprocess_files, len(paths)), subprocess_each),
+                ("serve path", len(paths), serve_paths),
+                ("serve fd", len(paths), serve_fds),
+                (f"serve x{args.clients}", len(paths), serve_concurrent),
+            ]
+            baseline = None
+            print(f"{'mode':>12} {'files':>6} {'seconds':>8} {'req/s':>9} {'speedup':>8}")
+            for label, count, run in cases:
+                elapsed = timed(run)
+                rate = count / elapsed
+                baseline = baseline or rate
+                print(f"{label:>12} {count:>6} {elapsed:>8.3f} {rate:>9.1f} {rate / baseline:>7.1f}x")
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the signature index against the old linear scan.
+
+The linear scan below is the pre-index ``_check_magic_bytes`` loop. Both
+are run with the stock signature table and again with ``--extra`` synthetic
+signatures added, to show that index lookups do not grow with table size.
+
+Usage:
+    python benchmarks/bench_signatures.py [--extra 500] [--rounds 200000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finspect.detect import BOMS, MAGIC_SIGNATURES, _build_signature_index  # noqa: E402
+from finspect.models import MimeGuess  # noqa: E402
+
+
+SAMPLES = [
+    b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n",
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR",
+    b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00",
+    b"RIFF\x24\x00\x00\x00WAVEfmt ",
+    b"Plain text that matches no signature at all.\n",
+    b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1\x00\x00",
+]
+
+
+def linear_scan(data: bytes, signatures: dict) -> object:
+    """The pre-index lookup: BOMs, then every signature, then offsets."""
+    for bom, encoding in BOMS.items():
+        if data.startswith(bom):
+            return MimeGuess("text/plain", f"Plain text ({encoding})", 90, "bom", bom.hex())
+    for sig, (mime, desc, conf) in signatures.items():
+        if data.startswith(sig):
+            return MimeGuess(mime, desc, conf, "magic_bytes", sig.hex())
+    if len(data) > 8 and data[4:8] == b"ftyp":
+        return MimeGuess("video/mp4", "MP4 video", 95, "magic_bytes", "ftyp")
+    if len(data) > 12 and data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return MimeGuess("audio/wav", "WAV audio", 95, "magic_bytes", "RIFF...WAVE")
+    if len(data) > 262 and data[257:262] == b"ustar":
+        return MimeGuess("application/x-tar", "TAR archive", 95, "magic_bytes", "ustar@257")
+    return None
+
+
+def synthetic_signatures(count: int) -> dict:
+    """Random 4-8 byte signatures that never match the samples."""
+    rng = random.Random(1234)
+    sigs = {}
+    while len(sigs) < count:
+        sig = bytes([0xF0 | rng.randrange(16)]) + rng.randbytes(rng.randrange(3, 8))
+        sigs[sig] = ("application/x-synthetic", "Synthetic", 50)
+    return sigs
+
+
+def bench(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for i in range(rounds):
+        fn(SAMPLES[i % len(SAMPLES)])
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--extra", type=int, default=500, help="synthetic signatures to add")
+    parser.add_argument("--rounds", type=int, default=200000, help="lookups per run")
+    args = parser.parse_args()
+
+    stock = dict(MAGIC_SIGNATURES)
+    grown = dict(stock)
+    grown.update(synthetic_signatures(args.extra))
+
+    stock_index = _build_signature_index()
+    grown_index = _build_signature_index()
+    for sig, (mime, desc, conf) in synthetic_signatures(args.extra).items():
+        grown_index.add(((0, sig),), mime, desc, conf, "magic_bytes", sig.hex())
+
+    rows = [
+        ("linear", len(stock), bench(lambda d: linear_scan(d, stock), args.rounds)),
+        ("index", len(stock_index), bench(stock_index.match, args.rounds)),
+        ("linear", len(grown), bench(lambda d: linear_scan(d, grown), args.rounds)),
+        ("index", len(grown_index), bench(grown_index.match, args.rounds)),
+    ]
+
+    print(f"{'matcher':<8} {'signatures':>10} {'ns/lookup':>10}")
+    for name, count, elapsed in rows:
+        print(f"{name:<8} {count:>10} {elapsed / args.rounds * 1e9:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark finspect CLI startup: end-to-end latency of one-file runs.
+
+Times ``python -m finspect.cli FILE`` for a PDF, a ZIP and ``--json``
+output against a bare interpreter, then lists the slowest imports of a
+PDF run as reported by ``python -X importtime``.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 20] [--top 15] [--no-libmagic]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = PACKAGE_ROOT / "tests" / "fixtures"
+
+
+def median_ms(cmd: List[str], env: dict, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def slowest_imports(cmd: List[str], env: dict, top: int) -> List[tuple]:
+    """(cumulative us, self us, module) for the slowest imports of one run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *cmd[1:]],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), int(own), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="runs per case (median reported)")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--no-libmagic", action="store_true", help="use the fallback detector")
+    args = parser.parse_args()
+
+    flags = ["--no-libmagic"] if args.no_libmagic else []
+    env = {**os.environ, "PYTHONPATH": str(PACKAGE_ROOT)}
+    cli = [sys.executable, "-m", "finspect.cli"]
+    pdf = str(FIXTURES_DIR / "sample.pdf")
+
+    cases = [
+        ("python -c pass", [sys.executable, "-c", "pass"]),
+        ("import cli", [sys.executable, "-c", "import finspect.cli"]),
+        ("pdf", [*cli, pdf, *flags]),
+        ("pdf --json", [*cli, pdf, "--json", *flags]),
+        ("zip", [*cli, str(FIXTURES_DIR / "archive.zip"), *flags]),
+    ]
+    print(f"{'case':>16} {'median ms':>10}")
+    for label, cmd in cases:
+        print(f"{label:>16} {median_ms(cmd, env, args.runs):>10.1f}")
+
+    print(f"\nSlowest imports for: finspect {Path(pdf).name}")
+    print(f"{'cumulative us':>14} {'self us':>8}  module")
+    for cumulative, own, name in slowest_imports([*cli, pdf, *flags], env, args.top):
+        print(f"{cumulative:>14} {own:>8}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Benchmark finspect end to end on a synthetic corpus.
+
+Generates a reproducible corpus (see ``corpus.py``) and measures four
+entry points, each with libmagic on and off:
+
+    detect_buffer  identify in-memory file headers
+    detect_file    detect each file by path
+    inspect_zip    list and sniff the entries of each ZIP/OOXML file
+    directory      scan the whole corpus as ``finspect DIR -r``
+
+Every case runs in a fresh interpreter so that its peak RSS is its own.
+Throughput, p50/p99 latency and peak RSS are printed as a table and written
+as JSON with ``--output``; pass an earlier output file as ``--compare`` to
+report throughput changes and exit 1 on regressions beyond ``--threshold``.
+
+Usage:
+    python benchmarks/bench_suite.py [--files 500] [--seed 0] [--repeat 3]
+                                     [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import build_corpus  # noqa: E402
+from finspect import __version__  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CASES = ("detect_buffer", "detect_file", "inspect_zip", "directory")
+
+HEADER_BYTES = 8192
+
+ZIP_SUFFIXES = (".zip", ".docx")
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    rank = max(int(round(fraction * len(samples) + 0.5)) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident set size of this process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def corpus_files(corpus: Path) -> List[Path]:
+    return sorted(
+        p for p in corpus.rglob("*")
+        if p.is_file() and not p.name.startswith("finspect_report_")
+    )
+
+
+def run_case(case: str, corpus: Path, use_libmagic: bool, repeat: int) -> Dict[str, Any]:
+    """Time one case in this process and return its measurements."""
+    from finspect.detect import detect_buffer, detect_file
+    from finspect.limits import Ceilings
+    from finspect.zipscan import inspect_zip
+
+    paths = corpus_files(corpus)
+    samples = []
+    items = 0
+    total_bytes = 0
+
+    def timed(call) -> None:
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+
+    if case == "detect_buffer":
+        headers = []
+        for path in paths:
+            with open(path, "rb") as f:
+                headers.append(f.read(HEADER_BYTES))
+        for _ in range(repeat):
+            for header in headers:
+                timed(lambda: detect_buffer(header, use_libmagic))
+                total_bytes += len(header)
+        items = len(samples)
+    elif case == "detect_file":
+        for _ in range(repeat):
+            for path in paths:
+                timed(lambda: detect_file(path, use_libmagic=use_libmagic))
+                total_bytes += path.stat().st_size
+        items = len(samples)
+    elif case == "inspect_zip":
+        archives = [p for p in paths if p.suffix in ZIP_SUFFIXES]
+        ceilings = Ceilings()
+        for _ in range(repeat):
+            for path in archives:
+                timed(lambda: inspect_zip(path, use_libmagic=use_libmagic, ceilings=ceilings))
+                total_bytes += path.stat().st_size
+        items = len(samples)
+    elif case == "directory":
+        from finspect import cli
+        warnings.simplefilter("ignore")
+        argv = ["finspect", str(corpus), "-r", "-q", "--report-format", "jsonl"]
+        if not use_libmagic:
+            argv.append("--no-libmagic")
+        for _ in range(repeat):
+            sys.argv = argv
+            timed(cli.main)
+            for report in corpus.glob("finspect_report_*"):
+                report.unlink()
+        items = len(paths) * repeat
+        total_bytes = sum(p.stat().st_size for p in paths) * repeat
+    else:
+        raise ValueError(f"Unknown case: {case}")
+
+    seconds = sum(samples)
+    samples.sort()
+    return {
+        "case": case,
+        "libmagic": use_libmagic,
+        "items": items,
+        "bytes": total_bytes,
+        "seconds": seconds,
+        "items_per_s": items / seconds if seconds else 0.0,
+        "mb_per_s": total_bytes / (1024 * 1024) / seconds if seconds else 0.0,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def spawn_case(case: str, corpus: Path, use_libmagic: bool, repeat: int) -> Dict[str, Any]:
+    """Run one case in a child interpreter."""
+    cmd = [sys.executable, __file__, "--run-case", case, "--corpus", str(corpus),
+           "--repeat", str(repeat)]
+    if not use_libmagic:
+        cmd.append("--no-libmagic")
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{case} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> bool:
+    """Print throughput changes against a baseline; True if none regressed."""
+    baseline = {
+        (r["case"], r["libmagic"]): r
+        for r in json.loads(baseline_path.read_text())["results"]
+        if not r.get("skipped")
+    }
+    ok = True
+    print(f"\nAgainst {baseline_path}:")
+    for result in results:
+        before = baseline.get((result["case"], result["libmagic"]))
+        if result.get("skipped") or before is None or not before["items_per_s"]:
+            continue
+        change = result["items_per_s"] / before["items_per_s"] - 1
+        regressed = change < -threshold
+        ok = ok and not regressed
+        mark = "  REGRESSION" if regressed else ""
+        print(f"{result['case']:>14} libmagic={'on' if result['libmagic'] else 'off':<3} "
+              f"{change:>+8.1%}{mark}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=500, help="files in the generated corpus")
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--depth", type=int, default=6, help="corpus directory depth")
+    parser.add_argument("--max-size", type=int, default=1024 * 1024, help="largest corpus file")
+    parser.add_argument("--corpus", type=Path, help="use an existing corpus directory")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the corpus per case")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="earlier --output file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="throughput drop that counts as a regression (default: 0.10)")
+    parser.add_argument("--run-case", choices=CASES, help=argparse.SUPPRESS)
+    parser.add_argument("--no-libmagic", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        result = run_case(args.run_case, args.corpus, not args.no_libmagic, args.repeat)
+        print(json.dumps(result))
+        return 0
+
+    from finspect.detect import HAS_LIBMAGIC
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = Path(tmp)
+            build_corpus(corpus, args.files, args.seed, args.depth, max_size=args.max_size)
+
+        results = []
+        print(f"{'case':>14} {'libmagic':>8} {'items/s':>10} {'MB/s':>8} "
+              f"{'p50 ms':>8} {'p99 ms':>8} {'peak RSS MB':>12}")
+        for case in args.cases:
+            for use_libmagic in (True, False):
+                if use_libmagic and not HAS_LIBMAGIC:
+                    results.append({"case": case, "libmagic": True, "skipped": "python-magic not installed"})
+                    print(f"{case:>14} {'on':>8}   skipped (python-magic not installed)")
+                    continue
+                result = spawn_case(case, corpus, use_libmagic, args.repeat)
+                results.append(result)
+                rss = result["peak_rss_bytes"]
+                print(f"{case:>14} {'on' if use_libmagic else 'off':>8} "
+                      f"{result['items_per_s']:>10.1f} {result['mb_per_s']:>8.1f} "
+                      f"{result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f} "
+                      f"{rss / (1024 * 1024) if rss else float('nan'):>12.1f}")
+
+    report = {
+        "tool": "finspect",
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "libmagic": HAS_LIBMAGIC,
+        "corpus": {
+            "path": str(args.corpus) if args.corpus else None,
+            "files": args.files,
+            "seed": args.seed,
+            "depth": args.depth,
+            "max_size": args.max_size,
+        },
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
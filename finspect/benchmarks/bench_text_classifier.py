@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the text/binary classifier.
+
+Compares the old per-byte Python loop with the table-driven
+``_is_text_content`` at several sample windows.
+
+Usage:
+    python benchmarks/bench_text_classifier.py [--rounds 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finspect.detect import HAS_NUMPY, _is_text_content  # noqa: E402
+
+
+WINDOWS = [1000, 8192, 65536, 1024 * 1024]
+
+
+def per_byte_loop(data: bytes, sample_size: int) -> tuple:
+    """The pre-table classifier, with a configurable window."""
+    printable = non_printable = 0
+    for byte in data[:sample_size]:
+        if 0x20 <= byte <= 0x7E or byte in (0x09, 0x0A, 0x0D):
+            printable += 1
+        elif byte < 0x20 or byte > 0x7F:
+            non_printable += 1
+    total = printable + non_printable
+    return (printable / total > 0.60, 0) if total else (False, 0)
+
+
+def bench(fn, data: bytes, window: int, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(data, window)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000, help="calls per window")
+    args = parser.parse_args()
+
+    text = (b"The quick brown fox jumps over the lazy dog.\n" * 30000)[: WINDOWS[-1]]
+    binary = os.urandom(WINDOWS[-1])
+
+    print(f"numpy: {'yes' if HAS_NUMPY else 'no'}")
+    print(f"{'input':<7} {'window':>8} {'loop MB/s':>10} {'table MB/s':>11} {'speedup':>8}")
+    for label, data in (("text", text), ("binary", binary)):
+        for window in WINDOWS:
+            rounds = max(1, args.rounds * 1000 // window)
+            old = bench(per_byte_loop, data, window, rounds)
+            new = bench(_is_text_content, data, window, rounds)
+            mb = window * rounds / 1e6
+            print(f"{label:<7} {window:>8} {mb / old:>10.1f} {mb / new:>11.1f} {old / new:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark parallel per-entry sniffing in inspect_zip.
+
+Builds an archive of deflated entries and times ``inspect_zip`` with an
+increasing number of worker threads.
+
+Usage:
+    python benchmarks/bench_zip_workers.py [--entries 5000] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from finspect.limits import Ceilings  # noqa: E402
+from finspect.zipscan import inspect_zip  # noqa: E402
+
+
+def build_archive(path: Path, entries: int) -> None:
+    text = b"Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" * 2000
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(entries):
+            body = os.urandom(64 * 1024) if i % 4 == 0 else text
+            zf.writestr(f"batch/doc{i:06d}.bin", body)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000, help="archive entries")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--bytes", type=int, default=65536, help="sniff bytes per entry")
+    args = parser.parse_args()
+
+    ceilings = Ceilings(
+        max_zip_entries=args.entries,
+        max_bytes_per_file=args.bytes,
+        max_total_sniff_bytes=args.entries * args.bytes
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "batch.zip"
+        build_archive(path, args.entries)
+
+        baseline = None
+        print(f"{'workers':>7} {'seconds':>8} {'speedup':>8}")
+        for workers in args.workers:
+            start = time.perf_counter()
+            inspect_zip(path, bytes_hint=args.bytes, use_libmagic=False,
+                        ceilings=ceilings, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>8.3f} {baseline / elapsed:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
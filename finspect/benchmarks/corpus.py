@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Generate a reproducible synthetic corpus for benchmarking finspect.
+
+The corpus mixes PDFs, OOXML documents, ZIPs with nested ZIPs, plain text,
+JSON, PNG images and random binary files, with sizes spread log-uniformly
+between ``--min-size`` and ``--max-size``, spread over a directory tree up
+to ``--depth`` levels deep. The same seed always produces the same bytes,
+so results from different versions are comparable.
+
+Usage:
+    python benchmarks/corpus.py OUTPUT_DIR [--files 500] [--seed 0] [--depth 6]
+"""
+
+import argparse
+import io
+import json
+import math
+import random
+import sys
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua invoice report quarter"
+).split()
+
+PNG_HEADER = (
+    b'\x89PNG\r\n\x1a\n'
+    b'\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde'
+)
+
+# Share of the corpus per kind, by weight
+KIND_WEIGHTS = {
+    "pdf": 20,
+    "docx": 10,
+    "zip": 8,
+    "nested_zip": 4,
+    "text": 25,
+    "json": 10,
+    "png": 10,
+    "binary": 13,
+}
+
+EXTENSIONS = {
+    "pdf": ".pdf",
+    "docx": ".docx",
+    "zip": ".zip",
+    "nested_zip": ".zip",
+    "text": ".txt",
+    "json": ".json",
+    "png": ".png",
+    "binary": ".bin",
+}
+
+
+def _text(rng: random.Random, size: int) -> bytes:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return ("\n".join(lines) + "\n").encode("ascii")[:size]
+
+
+def _pdf(rng: random.Random, size: int) -> bytes:
+    body = _text(rng, max(size - 64, 0))
+    return b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n" + body + b"\n%%EOF\n"
+
+
+def _png(rng: random.Random, size: int) -> bytes:
+    return PNG_HEADER + rng.randbytes(max(size - len(PNG_HEADER), 0))
+
+
+def _binary(rng: random.Random, size: int) -> bytes:
+    return rng.randbytes(size)
+
+
+def _json(rng: random.Random, size: int) -> bytes:
+    items = []
+    length = 0
+    while length < size:
+        item = {"id": len(items), "name": rng.choice(WORDS), "value": rng.random()}
+        items.append(item)
+        length += 48
+    return json.dumps({"items": items}, indent=2).encode("ascii")
+
+
+def _zip(entries: Dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in entries.items():
+            zf.writestr(zipfile.ZipInfo(name, date_time=(2020, 1, 1, 0, 0, 0)), data,
+                        compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+def _docx(rng: random.Random, size: int) -> bytes:
+    return _zip({
+        "[Content_Types].xml": b'<?xml version="1.0"?><Types/>',
+        "_rels/.rels": b'<?xml version="1.0"?><Relationships/>',
+        "word/document.xml": b'<?xml version="1.0"?><w:document>' + _text(rng, size) + b"</w:document>",
+        "word/media/image1.png": _png(rng, min(size, 4096)),
+    })
+
+
+def _archive(rng: random.Random, size: int) -> bytes:
+    count = rng.randint(2, 12)
+    parts = ((_pdf, ".pdf"), (_text, ".txt"), (_png, ".png"), (_binary, ".bin"), (_json, ".json"))
+    entries = {}
+    for i in range(count):
+        maker, ext = rng.choice(parts)
+        entries[f"part{i:02d}{ext}"] = maker(rng, max(size // count, 64))
+    return _zip(entries)
+
+
+def _nested_archive(rng: random.Random, size: int) -> bytes:
+    inner = _archive(rng, size // 2)
+    return _zip({
+        "readme.txt": _text(rng, 256),
+        "inner/archive.zip": inner,
+        "inner/report.pdf": _pdf(rng, size // 4),
+    })
+
+
+MAKERS: Dict[str, Callable[[random.Random, int], bytes]] = {
+    "pdf": _pdf,
+    "docx": _docx,
+    "zip": _archive,
+    "nested_zip": _nested_archive,
+    "text": _text,
+    "json": _json,
+    "png": _png,
+    "binary": _binary,
+}
+
+
+def _directory(rng: random.Random, root: Path, depth: int) -> Path:
+    path = root
+    for level in range(rng.randint(0, depth)):
+        path = path / f"d{level}_{rng.randint(0, 3)}"
+    return path
+
+
+def build_corpus(
+    root: Path,
+    files: int = 500,
+    seed: int = 0,
+    depth: int = 6,
+    min_size: int = 256,
+    max_size: int = 1024 * 1024
+) -> List[Path]:
+    """Write the corpus under root and return its files in creation order."""
+    rng = random.Random(seed)
+    kinds = list(KIND_WEIGHTS)
+    weights = list(KIND_WEIGHTS.values())
+    low, high = math.log(min_size), math.log(max_size)
+
+    paths = []
+    for i in range(files):
+        kind = rng.choices(kinds, weights)[0]
+        size = int(math.exp(rng.uniform(low, high)))
+        directory = _directory(rng, root, depth)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{kind}_{i:06d}{EXTENSIONS[kind]}"
+        path.write_bytes(MAKERS[kind](rng, size))
+        paths.append(path)
+    return paths
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path, help="directory to create the corpus in")
+    parser.add_argument("--files", type=int, default=500, help="files to generate")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--depth", type=int, default=6, help="maximum directory depth")
+    parser.add_argument("--min-size", type=int, default=256, help="smallest file size in bytes")
+    parser.add_argument("--max-size", type=int, default=1024 * 1024, help="largest file size in bytes")
+    args = parser.parse_args()
+
+    paths = build_corpus(args.output, args.files, args.seed, args.depth, args.min_size, args.max_size)
+    total = sum(p.stat().st_size for p in paths)
+    print(f"Wrote {len(paths)} files ({total / (1024 * 1024):.1f} MiB) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
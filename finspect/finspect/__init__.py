@@ -1,8 +1,30 @@
 """File Type Inspector CLI - A secure, fast tool for detecting true file types."""
 
-from .detect import detect_file, detect_bytes
-from .zipscan import inspect_zip
-from .models import DetectionResult, EntryResult, MimeGuess
-
 __version__ = "1.0.0"
-__all__ = ["detect_file", "detect_bytes", "inspect_zip", "DetectionResult", "EntryResult", "MimeGuess"]
\ No newline at end of file
+__all__ = ["detect_file", "detect_bytes", "detect_many", "inspect_zip", "DetectionResult", "EntryResult", "MimeGuess"]
+
+# Public names are imported on first access, so that importing a submodule
+# (the CLI, the thin client) does not load the detectors up front
+_EXPORTS = {
+    "detect_file": "detect",
+    "detect_bytes": "detect",
+    "detect_many": "detect",
+    "inspect_zip": "zipscan",
+    "DetectionResult": "models",
+    "EntryResult": "models",
+    "MimeGuess": "models",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -0,0 +1,201 @@
+"""Asyncio front end for finspect detection."""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Iterable, Optional, Union
+
+from .detect import MAGIC_POOL, _detect_item
+from .models import DetectionResult
+
+
+# Detections allowed in flight at once by default
+DEFAULT_CONCURRENCY = 8
+
+Item = Union[str, Path, bytes, bytearray, memoryview]
+
+# Marks the end of detect_many's input
+_END = object()
+
+
+async def _aiter(items: Union[Iterable[Item], AsyncIterable[Item]]) -> AsyncIterator[Item]:
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class AsyncDetector:
+    """
+    Runs detection on a bounded thread pool without blocking the event loop.
+
+    File reads, libmagic and container decompression all happen on the
+    executor; a semaphore caps how many detections are in flight across
+    every caller sharing the detector. Cancelling an awaiting task releases
+    its slot at once. A detection already running on a worker thread cannot
+    be interrupted, but finishes within its Ceilings deadlines and its
+    result is discarded.
+
+    Keyword options are passed to ``detect.detect_file`` for every call.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        executor: Optional[Executor] = None,
+        **options: Any
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.concurrency = concurrency
+        self.options = options
+        self._own_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='finspect-aio'
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Keep one idle libmagic handle per worker thread until close()
+        MAGIC_POOL.reserve(concurrency)
+        self._reserved = concurrency
+
+    async def __aenter__(self) -> "AsyncDetector":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # Semaphores belong to one event loop; make one per loop on first use
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _run(self, item: Item, options: dict) -> DetectionResult:
+        async with self._limiter():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, _detect_item, item, options)
+
+    async def detect_file(self, path: Union[str, Path], **options: Any) -> DetectionResult:
+        """Detect a path; same result as the synchronous ``detect_file``."""
+        return await self._run(path, {**self.options, **options})
+
+    async def detect_bytes(
+        self, data: Union[bytes, bytearray, memoryview], use_libmagic: bool = True
+    ) -> DetectionResult:
+        """Detect an in-memory buffer; same result as the synchronous ``detect_bytes``."""
+        return await self._run(data, {'use_libmagic': use_libmagic, 'max_bytes': None, 'max_depth': 0})
+
+    async def detect_many(
+        self,
+        paths_or_buffers: Union[Iterable[Item], AsyncIterable[Item]],
+        ordered: bool = True,
+        **options: Any
+    ) -> AsyncIterator[DetectionResult]:
+        """
+        Detect many paths or buffers, yielding results as they complete.
+
+        Accepts a plain or async iterable. Results come in input order when
+        ``ordered`` is true and in completion order otherwise. At most
+        ``concurrency`` items are pulled from the input ahead of the
+        consumer, so a slow consumer throttles the producer; finished
+        results are yielded while a slow producer is still awaited. Closing
+        the generator early cancels everything still pending.
+        """
+        options = {**self.options, **options}
+        items = _aiter(paths_or_buffers)
+        pending: Deque[asyncio.Task] = deque()
+        fetch: Optional[asyncio.Task] = None
+        exhausted = False
+
+        async def next_item() -> Any:
+            try:
+                return await items.__anext__()
+            except StopAsyncIteration:
+                return _END
+
+        try:
+            while True:
+                if fetch is None and not exhausted and len(pending) < self.concurrency:
+                    fetch = asyncio.ensure_future(next_item())
+                # Race the next input against the results that can be
+                # yielded, so an idle producer does not hold results back
+                if ordered:
+                    waiting = {pending[0]} if pending else set()
+                else:
+                    waiting = set(pending)
+                if fetch is not None:
+                    waiting.add(fetch)
+                if not waiting:
+                    break
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+                if fetch in done:
+                    item = fetch.result()
+                    fetch = None
+                    if item is _END:
+                        exhausted = True
+                    else:
+                        pending.append(asyncio.ensure_future(self._run(item, options)))
+
+                if ordered:
+                    while pending and pending[0].done():
+                        yield pending.popleft().result()
+                else:
+                    for task in [task for task in pending if task.done()]:
+                        pending.remove(task)
+                        yield task.result()
+        finally:
+            tasks = list(pending) + ([fetch] if fetch is not None else [])
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            await items.aclose()
+
+    def close(self) -> None:
+        """Shut down the executor if the detector created it, without waiting."""
+        if self._own_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        MAGIC_POOL.unreserve(self._reserved)
+        self._reserved = 0
+
+
+_default_detector: Optional[AsyncDetector] = None
+
+
+def _detector() -> AsyncDetector:
+    global _default_detector
+    if _default_detector is None:
+        _default_detector = AsyncDetector()
+    return _default_detector
+
+
+async def detect_file(path: Union[str, Path], **options: Any) -> DetectionResult:
+    """Detect a path without blocking the event loop (shared default detector)."""
+    return await _detector().detect_file(path, **options)
+
+
+async def detect_many(
+    paths_or_buffers: Union[Iterable[Item], AsyncIterable[Item]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    executor: Optional[Executor] = None,
+    **options: Any
+) -> AsyncIterator[DetectionResult]:
+    """
+    Async counterpart of ``detect.detect_many``.
+
+    Runs on a detector of its own, limited to ``concurrency`` detections in
+    flight, using ``executor`` if given. Remaining keyword arguments are
+    passed to ``detect_file``.
+    """
+    async with AsyncDetector(concurrency, executor, **options) as detector:
+        async for result in detector.detect_many(paths_or_buffers, ordered=ordered):
+            yield result
@@ -0,0 +1,194 @@
+"""Persistent detection cache for finspect.
+
+json, sqlite3 and hashlib are imported where used, so the CLI can import
+this module for its defaults without loading them on runs with no cache.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Union
+
+from .models import DetectionResult, EntryResult
+
+
+# Default cap on cached results before least-recently-used ones are evicted
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+# Pending writes are committed (and eviction checked) this often
+COMMIT_INTERVAL = 1000
+
+_HASH_CHUNK = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def settings_fingerprint(**settings: Any) -> str:
+    """Stable fingerprint of the finspect version and detector settings."""
+    import json
+    from . import __version__
+    
+    return json.dumps({"version": __version__, **settings}, sort_keys=True, default=str)
+
+
+def _timed_out(entries: Iterable[EntryResult]) -> bool:
+    """True if any entry, at any depth, was cut short by a timeout."""
+    for entry in entries:
+        if entry.error and 'timeout' in entry.error.lower():
+            return True
+        if entry.entries and _timed_out(entry.entries):
+            return True
+    return False
+
+
+def _serialize(result: DetectionResult) -> str:
+    import json
+    return json.dumps(result.to_record(), separators=(",", ":"))
+
+
+def _deserialize(text: str) -> DetectionResult:
+    import json
+    return DetectionResult.from_record(json.loads(text))
+
+
+class DetectionCache:
+    """
+    SQLite-backed cache of detect_file results.
+
+    Results are keyed by (device, inode, size, mtime_ns) from a single stat
+    call, or by a SHA-256 of the file contents when ``hash_mode`` is set. The
+    whole cache is dropped when the settings fingerprint (finspect version
+    plus detector options) differs from the one it was built with. Only the
+    process that opened the cache may use it. Raises ValueError if the
+    database cannot be opened or is not an SQLite file.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        fingerprint: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        hash_mode: bool = False,
+        follow_symlinks: bool = False
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hash_mode = hash_mode
+        self.follow_symlinks = follow_symlinks
+        self.hits = 0
+        self.misses = 0
+        self._pending_writes = 0
+
+        import sqlite3
+        try:
+            self._conn = sqlite3.connect(str(self.path))
+        except sqlite3.Error as e:
+            raise ValueError(f"Cannot open cache '{self.path}': {e}") from e
+        try:
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            if row is None or row[0] != fingerprint:
+                self._conn.execute("DELETE FROM results")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('fingerprint', ?)",
+                    (fingerprint,)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            self._conn.close()
+            raise ValueError(f"Cannot open cache '{self.path}': {e}") from e
+
+    def __enter__(self) -> "DetectionCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def key_for(self, path: Union[str, Path]) -> Optional[str]:
+        """Cache key for a path, or None if it cannot be stat'ed or read."""
+        try:
+            st = os.stat(path, follow_symlinks=self.follow_symlinks)
+            if not self.hash_mode:
+                return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+            import hashlib
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                    digest.update(chunk)
+            return f"sha256:{st.st_size}:{digest.hexdigest()}"
+        except OSError:
+            return None
+
+    def get(self, key: Optional[str], path: Union[str, Path]) -> Optional[DetectionResult]:
+        """Return the cached result for key (re-pointed at path), counting hits/misses."""
+        if key is None:
+            self.misses += 1
+            return None
+
+        row = self._conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._conn.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._note_write()
+        result = _deserialize(row[0])
+        result.path = str(Path(path))
+        return result
+
+    def put(self, key: Optional[str], result: DetectionResult) -> None:
+        """Store a result; results with errors or timed-out entries are not cached."""
+        if key is None or result.errors or _timed_out(result.entries):
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (key, result, last_used) VALUES (?, ?, ?)",
+            (key, _serialize(result), time.time())
+        )
+        self._note_write()
+
+    def _note_write(self) -> None:
+        self._pending_writes += 1
+        if self._pending_writes >= COMMIT_INTERVAL:
+            self.flush()
+
+    def evict(self) -> int:
+        """Drop least-recently-used results beyond max_entries; returns count removed."""
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM results WHERE key IN "
+            "(SELECT key FROM results ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        )
+        return excess
+
+    def flush(self) -> None:
+        """Commit pending writes and apply eviction."""
+        self.evict()
+        self._conn.commit()
+        self._pending_writes = 0
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
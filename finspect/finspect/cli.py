@@ -1,17 +1,21 @@
 """Command-line interface for finspect."""
 
 import argparse
+import os
 import sys
 import warnings
-import json
+from collections import deque
+from itertools import takewhile
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Deque, FrozenSet, Iterable, Iterator, Optional
 
 from . import __version__
-from .detect import detect_file, HAS_LIBMAGIC
+from .detect import detect_file, detect_many, _detect_item, _warm_worker, HAS_LIBMAGIC
 from .output import print_human, print_json
-from .limits import Ceilings
+from .limits import Ceilings, Deadline
+from .cache import DetectionCache, DEFAULT_MAX_ENTRIES, settings_fingerprint
+from .mediatypes import MEDIA_TYPES
+from .models import DetectionResult
 
 
 # Exit codes
@@ -35,6 +39,7 @@ Examples:
   finspect archive.zip --json
   finspect mystery.bin --no-libmagic --show-sources
   finspect nested.zip --max-depth 2
+  finspect serve --socket /tmp/finspect.sock
         """
     )
     
@@ -56,6 +61,12 @@ Examples:
         help='Output machine-readable JSON'
     )
     
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='Write JSON output and JSON reports without indentation'
+    )
+    
     parser.add_argument(
         '--show-sources',
         action='store_true',
@@ -71,12 +82,33 @@ Examples:
         help='Number of bytes to sniff (default: 8192)'
     )
     
+    parser.add_argument(
+        '--text-sample',
+        type=int,
+        metavar='N',
+        help='Bytes the text heuristic examines, up to --bytes (default: 1000)'
+    )
+    
     parser.add_argument(
         '--max-depth',
         type=int,
         default=1,
         metavar='D',
-        help='Recursion depth for containers (default: 1, 0=no inspection)'
+        help='Container levels to inspect, including nested archives (default: 1, 0=no inspection)'
+    )
+    
+    parser.add_argument(
+        '--zip-metadata-first',
+        action='store_true',
+        help='Type OOXML/ODF package parts from the ZIP central directory without decompressing them'
+    )
+    
+    parser.add_argument(
+        '--zip-workers',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Threads for sniffing entries inside large ZIP containers (default: 1)'
     )
     
     parser.add_argument(
@@ -96,7 +128,21 @@ Examples:
         '--timeout',
         type=int,
         metavar='MS',
-        help='Soft per-file read timeout in milliseconds'
+        help='Per-file deadline in milliseconds (header read and container inspection)'
+    )
+    
+    parser.add_argument(
+        '--entry-timeout',
+        type=int,
+        metavar='MS',
+        help='Time budget per container entry in milliseconds'
+    )
+    
+    parser.add_argument(
+        '--run-timeout',
+        type=int,
+        metavar='MS',
+        help='Deadline for a whole directory run in milliseconds'
     )
     
     # Behavior options
@@ -119,11 +165,59 @@ Examples:
         help='Include hidden files (starting with .)'
     )
     
+    parser.add_argument(
+        '--since-manifest',
+        metavar='REPORT',
+        help='Re-detect only files added or modified since a previous JSON report'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Parallel detection processes for directory processing (default: 1)'
+    )
+    
     parser.add_argument(
         '--report-format',
-        choices=['json', 'html', 'both'],
+        choices=['json', 'html', 'both', 'jsonl'],
         default='both',
-        help='Report format for directory processing (default: both)'
+        help='Report format for directory processing (default: both; jsonl streams results)'
+    )
+    
+    # Cache options
+    parser.add_argument(
+        '--cache',
+        metavar='PATH',
+        help='Persistent detection cache database (SQLite)'
+    )
+    
+    parser.add_argument(
+        '--cache-hash',
+        action='store_true',
+        help='Key the cache by content hash instead of (device, inode, size, mtime)'
+    )
+    
+    parser.add_argument(
+        '--cache-max-entries',
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        metavar='N',
+        help=f'Evict least-recently-used cache entries beyond N (default: {DEFAULT_MAX_ENTRIES})'
+    )
+    
+    # Profiling options
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print a per-stage timing breakdown (stat, read, libmagic, ZIP, ...) to stderr'
+    )
+    
+    parser.add_argument(
+        '--profile-trace',
+        metavar='PATH',
+        help='Also write the profile as Chrome trace-event JSON (implies --profile)'
     )
     
     parser.add_argument(
@@ -135,121 +229,415 @@ Examples:
     return parser.parse_args()
 
 
+def iter_directory(
+    dir_path: Path,
+    recursive: bool = False,
+    include_hidden: bool = False,
+    exclude: FrozenSet[str] = frozenset()
+) -> Iterator[Path]:
+    """
+    Yield files under dir_path in sorted path order, streaming with os.scandir.
+    
+    Hidden entries (and hidden directories' contents) are skipped during the
+    walk unless include_hidden is set. Symlinked directories are not entered.
+    Paths in exclude (absolute, as os.path.abspath spells them) are skipped.
+    """
+    try:
+        with os.scandir(dir_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return
+    
+    for entry in entries:
+        if not include_hidden and entry.name.startswith('.'):
+            continue
+        if exclude and os.path.abspath(entry.path) in exclude:
+            continue
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from iter_directory(Path(entry.path), recursive, include_hidden, exclude)
+            elif entry.is_file():
+                yield Path(entry.path)
+        except OSError:
+            continue
+
+
+# Looked-up items held back behind in-flight detections before merge_in_order
+# waits for those detections to finish, so memory stays flat
+MERGE_HOLD_MAX = 256
+
+
+def merge_in_order(
+    files: Iterable[Path],
+    detect: Callable[[Iterable[Path]], Iterable[Any]],
+    lookup: Callable[[Path], Any],
+    on_detected: Optional[Callable[[Path, Any], None]] = None
+) -> Iterator[Any]:
+    """
+    Yield lookup(file) where it answers and run detect() on the rest.
+    
+    Output keeps the order of files, and detect() must preserve input order.
+    A looked-up item is yielded at once when no earlier file is still in
+    detect(); otherwise it is held until they come out, and after
+    MERGE_HOLD_MAX held items no more files are read until then. detect()
+    may therefore be called several times, each on a run of the files.
+    on_detected is called for each detected file and its result.
+    """
+    files = iter(files)
+    slots: Deque[Any] = deque()
+    pending: Deque[Path] = deque()
+    exhausted = False
+    
+    def misses() -> Iterator[Path]:
+        nonlocal exhausted
+        for file_path in files:
+            found = lookup(file_path)
+            slots.append(found)
+            if found is None:
+                pending.append(file_path)
+                yield file_path
+            elif not pending or len(slots) - len(pending) >= MERGE_HOLD_MAX:
+                # End this detect() run so the held items can come out
+                return
+        exhausted = True
+    
+    while not exhausted:
+        for result in detect(misses()):
+            while slots[0] is not None:
+                yield slots.popleft()
+            slots.popleft()
+            file_path = pending.popleft()
+            if on_detected:
+                on_detected(file_path, result)
+            yield result
+        
+        while slots:
+            yield slots.popleft()
+
+
+def cached_detections(
+    files: Iterable[Path],
+    detect: Callable[[Iterable[Path]], Iterable[DetectionResult]],
+    cache: DetectionCache
+) -> Iterator[DetectionResult]:
+    """Serve files from the cache and run detect() only on misses."""
+    keys: Dict[Path, Optional[str]] = {}
+    
+    def lookup(file_path: Path) -> Optional[DetectionResult]:
+        key = cache.key_for(file_path)
+        cached = cache.get(key, file_path)
+        if cached is None:
+            keys[file_path] = key
+        return cached
+    
+    def store(file_path: Path, result: DetectionResult) -> None:
+        cache.put(keys.pop(file_path), result)
+    
+    return merge_in_order(files, detect, lookup, store)
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load a previous JSON or JSONL report as {relative_path: result}."""
+    import json
+    
+    with open(manifest_path, encoding='utf-8') as f:
+        if manifest_path.suffix == '.jsonl':
+            results = (json.loads(line) for line in f if line.strip())
+            return {r['relative_path']: r for r in results if 'relative_path' in r}
+        data = json.load(f)
+    return {r['relative_path']: r for r in data['results'] if 'relative_path' in r}
+
+
+class ManifestDiff:
+    """Incrementally compare a re-scan against the manifest it was based on."""
+    
+    def __init__(self, previous: Dict[str, Dict[str, Any]]) -> None:
+        self.previous = previous
+        self.seen = set()
+        self.unchanged = 0
+        self.new: List[str] = []
+        self.changed: List[str] = []
+        self.type_changed: List[Dict[str, Any]] = []
+    
+    def add(self, result: Dict[str, Any]) -> None:
+        """Record one result of the re-scan."""
+        rel_path = result['relative_path']
+        self.seen.add(rel_path)
+        old = self.previous.get(rel_path)
+        if old is None:
+            self.new.append(rel_path)
+        elif old is result or (
+            # Re-detected (modified, or the manifest predates mtime_ns) but
+            # the same as before
+            old.get('size_bytes') == result.get('size_bytes')
+            and old.get('media_type') == result.get('media_type')
+        ):
+            self.unchanged += 1
+        else:
+            self.changed.append(rel_path)
+            if old.get('media_type') != result.get('media_type'):
+                self.type_changed.append({
+                    "path": rel_path,
+                    "old_media_type": old.get('media_type'),
+                    "new_media_type": result.get('media_type')
+                })
+    
+    def track(self, results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Pass results through, recording each one."""
+        for result in results:
+            self.add(result)
+            yield result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Diff as new/changed/removed/type_changed lists."""
+        return {
+            "new": self.new,
+            "changed": self.changed,
+            "removed": sorted(p for p in self.previous if p not in self.seen),
+            "type_changed": self.type_changed,
+            "unchanged": self.unchanged
+        }
+
+
+def diff_manifest(
+    previous: Dict[str, Dict[str, Any]],
+    results: Iterable[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Compare a re-scan against the manifest it was based on."""
+    diff = ManifestDiff(previous)
+    for result in results:
+        diff.add(result)
+    return diff.to_dict()
+
+
 def process_directory(
     dir_path: Path,
     args: argparse.Namespace,
-    ceilings: Ceilings
+    ceilings: Ceilings,
+    cache: Optional[DetectionCache] = None,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None
 ) -> List[Dict[str, Any]]:
     """Process all files in a directory."""
-    results = []
+    return list(iter_directory_results(dir_path, args, ceilings, cache, previous))
+
+
+def iter_directory_results(
+    dir_path: Path,
+    args: argparse.Namespace,
+    ceilings: Ceilings,
+    cache: Optional[DetectionCache] = None,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+    exclude: FrozenSet[str] = frozenset(),
+    deadline: Optional[Deadline] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a report record for each file in a directory as it is detected.
+    
+    With a previous manifest, files whose size and mtime match their entry
+    are carried over unchanged and only new or modified files are detected.
+    Once the deadline passes no further files are started, and files
+    already being read or inspected are cut short.
+    """
+    files = iter_directory(dir_path, args.recursive, args.include_hidden, exclude)
+    if deadline is not None:
+        files = takewhile(lambda _: not deadline.expired(), files)
+    options = {
+        'max_bytes': args.bytes,
+        'max_depth': args.max_depth,
+        'use_libmagic': not args.no_libmagic,
+        'follow_symlinks': args.follow_symlinks,
+        'ceilings': ceilings,
+        'zip_metadata_first': args.zip_metadata_first,
+        'zip_workers': args.zip_workers,
+        'deadline': deadline,
+        'text_sample': args.text_sample,
+    }
     
-    # Determine which files to process
-    if args.recursive:
-        pattern = "**/*"
+    executor = None
+    if args.jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        print(f"Processing files in {dir_path} ({args.jobs} jobs)...", file=sys.stderr)
+        # One pool for the run: cache and manifest lookups may split it
+        # into several detect_many calls
+        executor = ProcessPoolExecutor(
+            max_workers=args.jobs, initializer=_warm_worker, initargs=(options['use_libmagic'],)
+        )
+        detect = lambda paths: detect_many(
+            paths, workers=args.jobs, mode='process', executor=executor, **options
+        )
     else:
-        pattern = "*"
-    
-    files = [f for f in dir_path.glob(pattern) if f.is_file()]
+        print(f"Processing files in {dir_path}...", file=sys.stderr)
+        detect = lambda paths: (_detect_item(file_path, options) for file_path in paths)
     
-    # Sort files for consistent output
-    files.sort()
+    if cache is not None:
+        uncached_detect = detect
+        detect = lambda paths: cached_detections(paths, uncached_detect, cache)
     
-    print(f"Processing {len(files)} files in {dir_path}...", file=sys.stderr)
-    
-    for file_path in files:
-        # Skip hidden files unless requested
-        if not args.include_hidden and file_path.name.startswith('.'):
-            continue
-            
-        try:
-            result = detect_file(
-                file_path,
-                max_bytes=args.bytes,
-                max_depth=args.max_depth,
-                use_libmagic=not args.no_libmagic,
-                follow_symlinks=args.follow_symlinks,
-                ceilings=ceilings
-            )
+    def detect_records(paths: Iterable[Path]) -> Iterator[Dict[str, Any]]:
+        for result in detect(paths):
+            file_path = Path(result.path)
             
             # Convert to dict for report
             result_dict = result.to_dict()
             result_dict['relative_path'] = str(file_path.relative_to(dir_path))
-            results.append(result_dict)
+            if result.mtime_ns is not None:
+                # From the stat taken before detection, so a file modified
+                # meanwhile is detected again next time
+                result_dict['mtime_ns'] = result.mtime_ns
             
             # Show progress if not JSON output
             if not args.json and not args.quiet:
-                print(f"  ✓ {file_path.name}: {result.media_type}", file=sys.stderr)
-                
-        except Exception as e:
-            error_result = {
-                "path": str(file_path),
-                "relative_path": str(file_path.relative_to(dir_path)),
-                "error": str(e),
-                "media_type": "error",
-                "confidence": 0
-            }
-            results.append(error_result)
+                if result.errors:
+                    print(f"  ✗ {file_path.name}: Error - {result.errors[0]}", file=sys.stderr)
+                else:
+                    print(f"  ✓ {file_path.name}: {result.media_type}", file=sys.stderr)
             
-            if not args.json and not args.quiet:
-                print(f"  ✗ {file_path.name}: Error - {e}", file=sys.stderr)
+            yield result_dict
+    
+    def unchanged(file_path: Path) -> Optional[Dict[str, Any]]:
+        old = previous.get(str(file_path.relative_to(dir_path)))
+        if old is None or old.get('mtime_ns') is None:
+            return None
+        try:
+            st = os.stat(file_path, follow_symlinks=args.follow_symlinks)
+        except OSError:
+            return None
+        if st.st_size == old.get('size_bytes') and st.st_mtime_ns == old['mtime_ns']:
+            return old
+        return None
+    
+    # Results arrive in walk order, which is sorted path order
+    try:
+        if previous is not None:
+            yield from merge_in_order(files, detect_records, unchanged)
+        else:
+            yield from detect_records(files)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def write_diff(
+    diff: Dict[str, Any],
+    output_dir: Path,
+    manifest_path: Path,
+    compact: bool = False
+) -> Path:
+    """Write a manifest diff report next to the other reports."""
+    from datetime import datetime
+    from . import serialize
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    diff_path = output_dir / f"finspect_diff_{timestamp}.json"
+    diff_data = {
+        "tool": "finspect",
+        "version": __version__,
+        "timestamp": datetime.now().isoformat(),
+        "directory": str(output_dir),
+        "manifest": str(manifest_path),
+        **diff
+    }
     
-    return results
+    with open(diff_path, 'w', encoding='utf-8') as f:
+        serialize.dump(diff_data, f, compact)
+    return diff_path
 
 
 def generate_report(
     results: List[Dict[str, Any]],
     output_dir: Path,
-    format: str = "both"
+    format: str = "both",
+    compact: bool = False,
+    summary: Optional[Dict[str, Any]] = None
 ) -> List[Path]:
-    """Generate report files in the specified directory."""
+    """
+    Generate report files in the specified directory.
+    
+    A summary already computed for these results is reused; otherwise it
+    is built once and shared by both reports.
+    """
+    from datetime import datetime
+    from .htmlreport import HtmlReportWriter
+    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if summary is None:
+        summary = generate_summary(results)
     
     report_paths = []
     
     # Generate JSON report
     if format in ["json", "both"]:
-        json_path = output_dir / f"finspect_report_{timestamp}.json"
-        report_data = {
-            "tool": "finspect",
-            "version": __version__,
-            "timestamp": datetime.now().isoformat(),
-            "directory": str(output_dir),
-            "total_files": len(results),
-            "results": results,
-            "summary": generate_summary(results)
-        }
-        
-        with open(json_path, 'w') as f:
-            json.dump(report_data, f, indent=2)
-        report_paths.append(json_path)
+        report_paths.append(write_json_report(results, output_dir, summary, timestamp, compact))
     
     # Generate HTML report
     if format in ["html", "both"]:
-        html_path = output_dir / f"finspect_report_{timestamp}.html"
-        html_content = generate_html_report(results, output_dir)
-        
-        with open(html_path, 'w') as f:
-            f.write(html_content)
-        report_paths.append(html_path)
+        with HtmlReportWriter(output_dir, timestamp) as writer:
+            for result in results:
+                writer.write(result)
+            writer.close(summary)
+        report_paths.extend(writer.paths)
     
     return report_paths
 
 
-def generate_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate summary statistics from results."""
-    summary = {
+def write_json_report(
+    results: List[Dict[str, Any]],
+    output_dir: Path,
+    summary: Dict[str, Any],
+    timestamp: Optional[str] = None,
+    compact: bool = False
+) -> Path:
+    """Write the JSON report for results and their summary."""
+    from datetime import datetime
+    from . import serialize
+    
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_path = output_dir / f"finspect_report_{timestamp}.json"
+    report_data = {
+        "tool": "finspect",
+        "version": __version__,
+        "timestamp": datetime.now().isoformat(),
+        "directory": str(output_dir),
         "total_files": len(results),
-        "by_type": {},
-        "errors": 0,
-        "containers": 0,
-        "high_confidence": 0,
-        "low_confidence": 0
+        "results": results,
+        "summary": summary
     }
     
-    for result in results:
+    with open(json_path, 'w', encoding='utf-8') as f:
+        serialize.dump(report_data, f, compact)
+    return json_path
+
+
+class SummaryBuilder:
+    """
+    Summary statistics accumulated one result at a time.
+    
+    Types are counted by MEDIA_TYPES id; the by_type and by_category
+    mappings are only spelled out by to_dict.
+    """
+    
+    def __init__(self) -> None:
+        self.summary: Dict[str, Any] = {
+            "total_files": 0,
+            "by_type": {},
+            "by_category": {},
+            "errors": 0,
+            "containers": 0,
+            "high_confidence": 0,
+            "low_confidence": 0
+        }
+        self._type_counts: Dict[int, int] = {}
+    
+    def add(self, result: Dict[str, Any]) -> None:
+        """Fold one result into the summary."""
+        summary = self.summary
+        summary["total_files"] += 1
+        
         # Count by type
-        media_type = result.get("media_type", "unknown")
-        summary["by_type"][media_type] = summary["by_type"].get(media_type, 0) + 1
+        type_id = MEDIA_TYPES.intern(result.get("media_type", "unknown"))
+        self._type_counts[type_id] = self._type_counts.get(type_id, 0) + 1
         
         # Count errors
         if result.get("error") or result.get("errors"):
@@ -266,150 +654,131 @@ def generate_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
         elif confidence < 70:
             summary["low_confidence"] += 1
     
-    return summary
-
-
-def generate_html_report(results: List[Dict[str, Any]], output_dir: Path) -> str:
-    """Generate HTML report content."""
-    summary = generate_summary(results)
-    
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <title>File Type Inspection Report - {output_dir.name}</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 20px; background: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        h1 {{ color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px; }}
-        h2 {{ color: #667eea; margin-top: 30px; }}
-        .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
-        .summary-card {{ background: #f7fafc; padding: 15px; border-radius: 8px; border-left: 4px solid #667eea; }}
-        .summary-card h3 {{ margin: 0 0 10px 0; color: #4a5568; font-size: 14px; }}
-        .summary-card .number {{ font-size: 28px; font-weight: bold; color: #667eea; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-        th {{ background: #667eea; color: white; padding: 10px; text-align: left; }}
-        td {{ padding: 10px; border-bottom: 1px solid #e2e8f0; }}
-        tr:hover {{ background: #f7fafc; }}
-        .confidence-high {{ color: #48bb78; font-weight: bold; }}
-        .confidence-med {{ color: #ed8936; }}
-        .confidence-low {{ color: #f56565; }}
-        .error {{ color: #f56565; font-weight: bold; }}
-        .container-badge {{ background: #667eea; color: white; padding: 2px 8px; border-radius: 4px; font-size: 12px; }}
-        .timestamp {{ color: #718096; font-size: 14px; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>File Type Inspection Report</h1>
-        <p class="timestamp">Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        <p>Directory: <strong>{output_dir}</strong></p>
-        
-        <h2>Summary</h2>
-        <div class="summary">
-            <div class="summary-card">
-                <h3>Total Files</h3>
-                <div class="number">{summary['total_files']}</div>
-            </div>
-            <div class="summary-card">
-                <h3>High Confidence</h3>
-                <div class="number">{summary['high_confidence']}</div>
-            </div>
-            <div class="summary-card">
-                <h3>Containers</h3>
-                <div class="number">{summary['containers']}</div>
-            </div>
-            <div class="summary-card">
-                <h3>Errors</h3>
-                <div class="number">{summary['errors']}</div>
-            </div>
-        </div>
-        
-        <h2>File Type Distribution</h2>
-        <table>
-            <tr>
-                <th>Media Type</th>
-                <th>Count</th>
-                <th>Percentage</th>
-            </tr>
-"""
-    
-    # Sort by count
-    type_counts = sorted(summary['by_type'].items(), key=lambda x: x[1], reverse=True)
-    total = summary['total_files']
-    
-    for media_type, count in type_counts:
-        percentage = (count / total * 100) if total > 0 else 0
-        html += f"""            <tr>
-                <td>{media_type}</td>
-                <td>{count}</td>
-                <td>{percentage:.1f}%</td>
-            </tr>
-"""
-    
-    html += """        </table>
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary so far."""
+        by_type = self.summary["by_type"] = {}
+        by_category = self.summary["by_category"] = {}
+        for type_id, count in self._type_counts.items():
+            by_type[MEDIA_TYPES.name(type_id)] = count
+            category = MEDIA_TYPES.category(type_id)
+            by_category[category] = by_category.get(category, 0) + count
+        return self.summary
+
+
+def generate_summary(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate summary statistics from results."""
+    builder = SummaryBuilder()
+    for result in results:
+        builder.add(result)
+    return builder.to_dict()
+
+
+class JsonlReportWriter:
+    """
+    Streaming JSON Lines report.
+    
+    The first line is a header record, each result follows on its own line as
+    soon as it is written, and a summary record closes the file. Lines are
+    flushed as they are written, so a crashed run leaves a readable prefix.
+    """
+    
+    def __init__(self, output_dir: Path, timestamp: Optional[str] = None) -> None:
+        from datetime import datetime
+        from . import serialize
         
-        <h2>Detailed Results</h2>
-        <table>
-            <tr>
-                <th>File</th>
-                <th>Type</th>
-                <th>Confidence</th>
-                <th>Size</th>
-                <th>Notes</th>
-            </tr>
-"""
-    
-    # Sort results by path
-    sorted_results = sorted(results, key=lambda x: x.get('relative_path', ''))
+        self._dumps = serialize.dumps
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.path = output_dir / f"finspect_report_{timestamp}.jsonl"
+        self.summary = SummaryBuilder()
+        self._file = open(self.path, 'w', buffering=1, encoding='utf-8')
+        self._write_line({
+            "record": "header",
+            "tool": "finspect",
+            "version": __version__,
+            "timestamp": datetime.now().isoformat(),
+            "directory": str(output_dir)
+        })
     
-    for result in sorted_results:
-        rel_path = result.get('relative_path', result.get('path', 'unknown'))
-        media_type = result.get('media_type', 'unknown')
-        confidence = result.get('confidence', 0)
-        size_bytes = result.get('size_bytes', 0)
-        
-        # Format size
-        if size_bytes > 1024 * 1024:
-            size_str = f"{size_bytes / (1024 * 1024):.1f} MB"
-        elif size_bytes > 1024:
-            size_str = f"{size_bytes / 1024:.1f} KB"
-        else:
-            size_str = f"{size_bytes} B"
-        
-        # Confidence class
-        if confidence >= 90:
-            conf_class = "confidence-high"
-        elif confidence >= 70:
-            conf_class = "confidence-med"
-        else:
-            conf_class = "confidence-low"
-        
-        # Notes
-        notes = []
-        if result.get('is_container'):
-            notes.append('<span class="container-badge">Container</span>')
-        if result.get('error'):
-            notes.append(f'<span class="error">Error: {result["error"]}</span>')
-        elif result.get('errors'):
-            notes.append(f'<span class="error">{len(result["errors"])} errors</span>')
-        
-        notes_str = ' '.join(notes) if notes else '-'
-        
-        html += f"""            <tr>
-                <td>{rel_path}</td>
-                <td>{media_type}</td>
-                <td class="{conf_class}">{confidence}%</td>
-                <td>{size_str}</td>
-                <td>{notes_str}</td>
-            </tr>
-"""
+    def __enter__(self) -> "JsonlReportWriter":
+        return self
     
-    html += """        </table>
-    </div>
-</body>
-</html>"""
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
     
-    return html
+    def _write_line(self, record: Dict[str, Any]) -> None:
+        self._file.write(self._dumps(record, compact=True) + '\n')
+    
+    def write(self, result: Dict[str, Any]) -> None:
+        """Append one result."""
+        self._write_line(result)
+        self.summary.add(result)
+    
+    def close(self) -> None:
+        """Write the summary record and close the file."""
+        if self._file.closed:
+            return
+        self._write_line({"record": "summary", **self.summary.to_dict()})
+        self._file.close()
+
+
+def generate_html_report(
+    results: List[Dict[str, Any]],
+    output_dir: Path,
+    summary: Optional[Dict[str, Any]] = None
+) -> str:
+    """Generate single-page HTML report content."""
+    from .htmlreport import render_html_report
+    
+    if summary is None:
+        summary = generate_summary(results)
+    sorted_results = sorted(results, key=lambda x: x.get('relative_path', ''))
+    return render_html_report(sorted_results, output_dir, summary)
+
+
+# Ceilings fields left out of the cache fingerprint
+CACHE_IGNORED_CEILINGS = ('timeout_ms', 'entry_timeout_ms', 'run_timeout_ms')
+
+
+def open_cache(args: argparse.Namespace, ceilings: Ceilings) -> Optional[DetectionCache]:
+    """
+    Open the --cache database, keyed to the current detector settings.
+    
+    Raises ValueError if the database cannot be opened or is not SQLite.
+    """
+    if not args.cache:
+        return None
+    
+    from dataclasses import asdict
+    # Timeouts do not change results (timed-out results are never cached)
+    limits = {
+        name: value for name, value in asdict(ceilings).items()
+        if name not in CACHE_IGNORED_CEILINGS
+    }
+    fingerprint = settings_fingerprint(
+        use_libmagic=not args.no_libmagic,
+        max_bytes=args.bytes,
+        max_depth=args.max_depth,
+        follow_symlinks=args.follow_symlinks,
+        zip_metadata_first=args.zip_metadata_first,
+        text_sample=args.text_sample,
+        ceilings=limits
+    )
+    return DetectionCache(
+        args.cache,
+        fingerprint,
+        max_entries=args.cache_max_entries,
+        hash_mode=args.cache_hash,
+        follow_symlinks=args.follow_symlinks
+    )
+
+
+def close_cache(cache: Optional[DetectionCache], quiet: bool = False) -> None:
+    """Close the cache and report hit/miss counts."""
+    if cache is None:
+        return
+    cache.close()
+    if not quiet:
+        print(f"Cache: {cache.hits} hits, {cache.misses} misses", file=sys.stderr)
 
 
 def determine_exit_code(result, strict: bool) -> int:
@@ -432,17 +801,47 @@ def determine_exit_code(result, strict: bool) -> int:
     
     # Strict mode checks
     if strict and result.entries:
-        for entry in result.entries:
+        pending = list(result.entries)
+        while pending:
+            entry = pending.pop()
             if entry.confidence == 0 or entry.error:
                 return EXIT_STRICT_VIOLATION
+            pending.extend(entry.entries)
     
     return EXIT_SUCCESS
 
 
 def main() -> int:
     """Main entry point."""
-    args = parse_args()
+    # finspect serve ...: run the detection daemon (use ./serve for a file named serve)
+    if sys.argv[1:2] == ['serve']:
+        from .server import main as serve_main
+        return serve_main(sys.argv[2:])
     
+    args = parse_args()
+    if not (args.profile or args.profile_trace):
+        return run(args)
+    
+    # Worker processes would not report to this process's profiler
+    if args.jobs > 1:
+        warnings.warn("--profile runs directory detection in-process; ignoring --jobs")
+        args.jobs = 1
+    
+    from .trace import Profiler, tracing
+    profiler = Profiler(keep_events=bool(args.profile_trace))
+    with tracing(profiler):
+        exit_code = run(args)
+    
+    print("\nProfile:", file=sys.stderr)
+    profiler.print_summary(sys.stderr)
+    if args.profile_trace:
+        profiler.write_chrome_trace(args.profile_trace)
+        print(f"Trace written to {args.profile_trace}", file=sys.stderr)
+    return exit_code
+
+
+def run(args: argparse.Namespace) -> int:
+    """Inspect args.path and return the exit code."""
     # Check libmagic availability
     if not args.no_libmagic and not HAS_LIBMAGIC:
         warnings.warn(
@@ -454,7 +853,9 @@ def main() -> int:
     ceilings = Ceilings(
         max_bytes_per_file=args.bytes,
         max_recursion_depth=args.max_depth,
-        timeout_ms=args.timeout
+        timeout_ms=args.timeout,
+        entry_timeout_ms=args.entry_timeout,
+        run_timeout_ms=args.run_timeout
     )
     
     path = Path(args.path)
@@ -471,47 +872,145 @@ def main() -> int:
             print("Error: --json flag is not supported for directory processing. Use --report-format instead.", file=sys.stderr)
             return EXIT_CONTAINER_ERROR
         
+        # Load previous manifest for incremental re-scan
+        previous = None
+        if args.since_manifest:
+            try:
+                previous = load_manifest(Path(args.since_manifest))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Error: Cannot load manifest '{args.since_manifest}': {e}", file=sys.stderr)
+                return EXIT_FILE_NOT_FOUND
+        
         # Process directory
-        results = process_directory(path, args, ceilings)
+        diff = ManifestDiff(previous) if previous is not None else None
+        run_deadline = Deadline.after(ceilings.run_timeout_ms)
+        try:
+            cache = open_cache(args, ceilings)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return EXIT_FILE_NOT_FOUND
+        try:
+            if args.report_format == 'jsonl':
+                # Stream results to disk as they are detected
+                with JsonlReportWriter(path) as writer:
+                    records = iter_directory_results(
+                        path, args, ceilings, cache, previous,
+                        exclude=frozenset({os.path.abspath(writer.path)}),
+                        deadline=run_deadline
+                    )
+                    if diff is not None:
+                        records = diff.track(records)
+                    for record in records:
+                        writer.write(record)
+                summary = writer.summary.to_dict()
+                report_paths = [writer.path]
+            else:
+                # HTML rows stream to disk; only the JSON report needs the list
+                from datetime import datetime
+                from .htmlreport import HtmlReportWriter
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                builder = SummaryBuilder()
+                html_writer = None
+                if args.report_format in ('html', 'both'):
+                    html_writer = HtmlReportWriter(path, timestamp, summary=builder)
+                results = [] if args.report_format in ('json', 'both') else None
+                exclude = frozenset({os.path.abspath(html_writer.path)}) if html_writer else frozenset()
+                try:
+                    records = iter_directory_results(
+                        path, args, ceilings, cache, previous,
+                        exclude=exclude,
+                        deadline=run_deadline
+                    )
+                    if diff is not None:
+                        records = diff.track(records)
+                    for record in records:
+                        if html_writer is not None:
+                            html_writer.write(record)
+                        else:
+                            builder.add(record)
+                        if results is not None:
+                            results.append(record)
+                finally:
+                    summary = builder.to_dict()
+                    if html_writer is not None:
+                        html_writer.close(summary)
+                report_paths = []
+                if results is not None:
+                    report_paths.append(
+                        write_json_report(results, path, summary, timestamp, args.compact)
+                    )
+                if html_writer is not None:
+                    report_paths.extend(html_writer.paths)
+        finally:
+            close_cache(cache, args.quiet)
         
-        if not results:
+        if not summary['total_files'] and diff is None and not run_deadline.expired():
+            for report_path in report_paths:
+                report_path.unlink()
             print("No files found to process.", file=sys.stderr)
             return EXIT_SUCCESS
         
-        # Generate reports
-        report_paths = generate_report(results, path, args.report_format)
+        if diff is not None:
+            diff = diff.to_dict()
+            report_paths.append(write_diff(diff, path, Path(args.since_manifest), args.compact))
+            print(
+                f"\nChanges: {len(diff['new'])} new, {len(diff['changed'])} changed, "
+                f"{len(diff['removed'])} removed, {len(diff['type_changed'])} type changed",
+                file=sys.stderr
+            )
         
         # Summary output
-        print(f"\nProcessed {len(results)} files", file=sys.stderr)
+        print(f"\nProcessed {summary['total_files']} files", file=sys.stderr)
         print(f"Reports generated:", file=sys.stderr)
         for report_path in report_paths:
             print(f"  - {report_path}", file=sys.stderr)
         
         # Determine overall exit code
-        has_errors = any(r.get('error') or r.get('errors') for r in results)
-        if has_errors and args.strict:
+        if run_deadline.expired():
+            print(
+                f"Run timeout after {ceilings.run_timeout_ms} ms: results are partial",
+                file=sys.stderr
+            )
+            return EXIT_TIMEOUT
+        
+        if summary['errors'] and args.strict:
             return EXIT_STRICT_VIOLATION
         
         return EXIT_SUCCESS
     
     # Handle single file (existing behavior)
     try:
-        result = detect_file(
-            args.path,
-            max_bytes=args.bytes,
-            max_depth=args.max_depth,
-            use_libmagic=not args.no_libmagic,
-            follow_symlinks=args.follow_symlinks,
-            ceilings=ceilings
-        )
+        cache = open_cache(args, ceilings)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return EXIT_FILE_NOT_FOUND
+    try:
+        key = cache.key_for(path) if cache else None
+        result = cache.get(key, args.path) if cache else None
+        if result is None:
+            result = detect_file(
+                args.path,
+                max_bytes=args.bytes,
+                max_depth=args.max_depth,
+                use_libmagic=not args.no_libmagic,
+                follow_symlinks=args.follow_symlinks,
+                ceilings=ceilings,
+                zip_metadata_first=args.zip_metadata_first,
+                zip_workers=args.zip_workers,
+                text_sample=args.text_sample
+            )
+            if cache:
+                cache.put(key, result)
     except Exception as e:
         # Handle unexpected errors
         print(f"Error: {e}", file=sys.stderr)
         return EXIT_CONTAINER_ERROR
+    finally:
+        close_cache(cache, args.quiet or args.json)
     
     # Output results
     if args.json:
-        print_json(result)
+        print_json(result, compact=args.compact)
     else:
         print_human(result, show_sources=args.show_sources)
     
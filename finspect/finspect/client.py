@@ -0,0 +1,189 @@
+"""Thin client for the finspect detection daemon (finspect serve).
+
+Uses only the standard library, so short-lived processes can query a warm
+daemon without loading detectors of their own.
+
+Protocol: each message is a 4-byte big-endian length followed by that many
+bytes of UTF-8 JSON. A request is one of
+
+    {"path": "/abs/path"}                  detect a file the daemon can open
+    {"fd": true, "name": "upload.bin"}     detect a descriptor passed with
+                                           SCM_RIGHTS on the same message
+    {"size": N, "name": "upload.bin"}      detect N raw bytes that follow
+
+optionally with "options" (max_bytes, max_depth, use_libmagic,
+zip_metadata_first). Each request gets one response, {"ok": true,
+"result": {...}} or {"ok": false, "error": "..."}. A connection may carry
+any number of requests.
+"""
+
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+_LENGTH = struct.Struct('!I')
+
+# Largest request the daemon accepts, and largest response a client accepts
+# (responses list every container entry, so they can be much larger)
+MAX_MESSAGE = 1024 * 1024
+MAX_RESPONSE = 256 * 1024 * 1024
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes, or None if the peer closed first."""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any], fds: Tuple[int, ...] = ()) -> None:
+    """Send one framed JSON message, passing fds along with it."""
+    payload = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    frame = _LENGTH.pack(len(payload)) + payload
+    if fds:
+        sent = socket.send_fds(sock, [frame], list(fds))
+        frame = frame[sent:]
+    sock.sendall(frame)
+
+
+def recv_message(
+    sock: socket.socket,
+    max_fds: int = 0,
+    max_size: int = MAX_MESSAGE
+) -> Tuple[Optional[Dict[str, Any]], List[int]]:
+    """
+    Receive one framed JSON message and any descriptors sent with it.
+
+    Returns (None, []) when the peer closed the connection between messages.
+    Raises ValueError for an oversized or malformed message.
+    """
+    fds: List[int] = []
+    header = b''
+    try:
+        while len(header) < _LENGTH.size:
+            if max_fds:
+                chunk, received, _, _ = socket.recv_fds(sock, _LENGTH.size - len(header), max_fds)
+                fds.extend(received)
+            else:
+                chunk = sock.recv(_LENGTH.size - len(header))
+            if not chunk:
+                if header:
+                    raise ValueError("Connection closed mid-message")
+                for fd in fds:
+                    os.close(fd)
+                return None, []
+            header += chunk
+
+        (length,) = _LENGTH.unpack(header)
+        if length > max_size:
+            raise ValueError(f"Message of {length} bytes exceeds limit of {max_size}")
+        payload = _recv_exact(sock, length)
+        if payload is None:
+            raise ValueError("Connection closed mid-message")
+        message = json.loads(payload)
+        if not isinstance(message, dict):
+            raise ValueError("Message is not a JSON object")
+    except BaseException:
+        # Descriptors that came with a rejected message are never handed out
+        for fd in fds:
+            os.close(fd)
+        raise
+    return message, fds
+
+
+class FinspectClient:
+    """
+    Connection to a running finspect daemon.
+
+    Each detect_* call sends one request and returns the result dict (the
+    same shape as ``finspect FILE --json``). Daemon-side failures raise
+    RuntimeError. A client is not safe to share between threads; open one
+    per thread.
+    """
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None) -> None:
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(socket_path)
+
+    def __enter__(self) -> "FinspectClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def _request(
+        self,
+        request: Dict[str, Any],
+        options: Dict[str, Any],
+        fds: Tuple[int, ...] = (),
+        data: Optional[bytes] = None
+    ) -> Dict[str, Any]:
+        if options:
+            request['options'] = options
+        send_message(self._sock, request, fds)
+        if data is not None:
+            self._sock.sendall(data)
+        response, _ = recv_message(self._sock, max_size=MAX_RESPONSE)
+        if response is None:
+            raise ConnectionError("Daemon closed the connection")
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', 'Unknown daemon error'))
+        return response['result']
+
+    def detect_file(self, path: str, **options: Any) -> Dict[str, Any]:
+        """Detect a file by path; the daemon opens it with its own permissions."""
+        return self._request({'path': os.path.abspath(path)}, options)
+
+    def detect_fd(self, fd: int, name: str = '', **options: Any) -> Dict[str, Any]:
+        """Detect an open descriptor (file, pipe, memfd) by passing it to the daemon."""
+        return self._request({'fd': True, 'name': name}, options, fds=(fd,))
+
+    def detect_bytes(self, data: bytes, name: str = '', **options: Any) -> Dict[str, Any]:
+        """Detect an in-memory buffer, sent inline after the request."""
+        return self._request({'size': len(data), 'name': name}, options, data=bytes(data))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog='finspect-client',
+        description='Query a running finspect daemon (finspect serve) and print JSON lines'
+    )
+    parser.add_argument('paths', nargs='+', help='Files to detect')
+    parser.add_argument('--socket', required=True, metavar='PATH', help='Daemon socket path')
+    parser.add_argument('--pass-fd', action='store_true',
+                        help='Open files here and pass the descriptors instead of paths')
+    args = parser.parse_args()
+
+    exit_code = 0
+    with FinspectClient(args.socket) as client:
+        for path in args.paths:
+            try:
+                if args.pass_fd:
+                    with open(path, 'rb') as f:
+                        result = client.detect_fd(f.fileno(), name=path)
+                else:
+                    result = client.detect_file(path)
+            except (OSError, RuntimeError) as e:
+                print(f"Error: {path}: {e}", file=sys.stderr)
+                exit_code = 1
+                continue
+            print(json.dumps(result, separators=(',', ':')))
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,22 +1,63 @@
 """Core file type detection module with libmagic and fallback."""
 
 import os
+import queue
 import sys
-import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+from importlib.util import find_spec
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Union
+from stat import S_ISDIR, S_ISLNK
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import warnings
 
+from .mediatypes import MEDIA_TYPES
 from .models import DetectionResult, MimeGuess
-from .limits import Ceilings, DEFAULT_CEILINGS
+from .limits import Ceilings, Deadline, DEFAULT_CEILINGS
+from .structured import DEFAULT_SNIFF_LIMIT, sniff_structured
+from . import trace
 
-# Try to import python-magic
-try:
-    import magic
-    HAS_LIBMAGIC = True
-except ImportError:
-    HAS_LIBMAGIC = False
-    magic = None
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# python-magic and NumPy are imported on first use, not at startup: a
+# single-file run should not pay for loading them. HAS_LIBMAGIC and
+# HAS_NUMPY say whether they are installed; a failed import clears them.
+HAS_LIBMAGIC = find_spec('magic') is not None
+magic = None
+
+# NumPy is optional; it only speeds up text classification of large samples
+HAS_NUMPY = find_spec('numpy') is not None
+numpy = None
+
+
+def _import_magic() -> Any:
+    """The python-magic module, imported on first call."""
+    global magic, HAS_LIBMAGIC
+    if magic is None:
+        try:
+            import magic as module
+        except ImportError:
+            HAS_LIBMAGIC = False
+            raise
+        magic = module
+    return magic
+
+
+def _import_numpy() -> Any:
+    """NumPy, imported on first call, or None if it cannot be imported."""
+    global numpy, HAS_NUMPY, _TEXT_CLASS_ARRAY
+    if numpy is None and HAS_NUMPY:
+        try:
+            import numpy as module
+        except ImportError:
+            HAS_NUMPY = False
+            return None
+        _TEXT_CLASS_ARRAY = module.frombuffer(_TEXT_CLASS_TABLE, dtype=module.uint8)
+        numpy = module
+    return numpy
 
 
 # Magic byte signatures for common formats
@@ -58,8 +99,30 @@ MAGIC_SIGNATURES = {
     
     # Office formats (older)
     b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1': ('application/vnd.ms-office', 'MS Office document', 90),
+    
+    # Print formats
+    b'%!PS': ('application/postscript', 'PostScript document', 100),
+    b'\xc5\xd0\xd3\xc6': ('application/postscript', 'EPS document (DOS binary)', 95),
+    b'\x1b%-12345X': ('application/vnd.hp-pcl', 'PJL print job', 95),
+    b'\x1bE': ('application/vnd.hp-pcl', 'HP PCL print job', 80),
+    b'II*\x00': ('image/tiff', 'TIFF image (little-endian)', 100),
+    b'MM\x00*': ('image/tiff', 'TIFF image (big-endian)', 100),
+    b'II+\x00': ('image/tiff', 'BigTIFF image (little-endian)', 100),
+    b'MM\x00+': ('image/tiff', 'BigTIFF image (big-endian)', 100),
 }
 
+# Signatures that need a non-zero offset or more than one pattern.
+# Each rule is ((offset, pattern), ...), (mime, description, confidence), label.
+OFFSET_SIGNATURES = [
+    (((0, b'RIFF'), (8, b'WEBP')), ('image/webp', 'WebP image', 100), 'RIFF...WEBP'),
+    (((0, b'RIFF'), (8, b'WAVE')), ('audio/wav', 'WAV audio', 95), 'RIFF...WAVE'),
+    (((4, b'ftypheic'),), ('image/heic', 'HEIC image', 95), 'ftypheic'),
+    (((4, b'ftypheix'),), ('image/heic', 'HEIC image', 95), 'ftypheix'),
+    (((4, b'ftypmif1'),), ('image/heif', 'HEIF image', 95), 'ftypmif1'),
+    (((4, b'ftyp'),), ('video/mp4', 'MP4 video', 95), 'ftyp'),
+    (((257, b'ustar'),), ('application/x-tar', 'TAR archive', 95), 'ustar@257'),
+]
+
 # UTF BOMs
 BOMS = {
     b'\xef\xbb\xbf': 'utf-8-sig',
@@ -70,76 +133,260 @@ BOMS = {
 }
 
 
-def _check_magic_bytes(data: bytes) -> Optional[MimeGuess]:
-    """Check data against known magic byte signatures."""
-    # Check BOMs first
-    for bom, encoding in BOMS.items():
-        if data.startswith(bom):
-            return MimeGuess(
-                media_type='text/plain',
-                description=f'Plain text ({encoding})',
-                confidence=90,
-                source='bom',
-                magic_bytes=bom.hex()
-            )
+# Text classification: bytes sampled when a call gives no text_sample (this
+# setting also covers container entries), and the sample size above which
+# the NumPy path (when available) beats bytes.translate
+TEXT_SAMPLE_BYTES = 1000
+NUMPY_MIN_SAMPLE = 64 * 1024
+
+# ASCII printable + tab/newline/carriage return
+_PRINTABLE_BYTES = bytes(range(0x20, 0x7F)) + b'\t\n\r'
+
+# Byte class lookup for the NumPy path: 0 = ignored (DEL), 1 = printable, 2 = other
+_TEXT_CLASS_TABLE = bytes(
+    1 if b in _PRINTABLE_BYTES else 0 if b == 0x7F else 2 for b in range(256)
+)
+_TEXT_CLASS_ARRAY: Any = None  # NumPy view of _TEXT_CLASS_TABLE, built on first use
+
+
+class _MagicHandle:
+    """Paired MIME/description libmagic cookies, identified together."""
+
+    def __init__(self) -> None:
+        module = _import_magic()
+        self.mime = module.Magic(mime=True)
+        self.desc = module.Magic()
+
+    def identify(self, buf: Union[bytes, bytearray, memoryview]) -> Tuple[str, str]:
+        """Return (media type, description) for a buffer."""
+        if not isinstance(buf, bytes):
+            buf = bytes(buf)  # python-magic only takes bytes
+        return self.mime.from_buffer(buf), self.desc.from_buffer(buf)
+
+
+class MagicPool:
+    """
+    Long-lived, thread-safe pool of libmagic handles.
     
-    # Check magic signatures
-    for magic, (mime, desc, conf) in MAGIC_SIGNATURES.items():
-        if data.startswith(magic):
-            return MimeGuess(
-                media_type=mime,
-                description=desc,
-                confidence=conf,
-                source='magic_bytes',
-                magic_bytes=magic.hex()
-            )
+    Handles are created lazily on first checkout and reused afterwards, so the
+    magic database is loaded once per handle rather than once per buffer. The
+    pool remembers the pid that created it and drops every handle after a fork,
+    since libmagic cookies must not be shared across processes.
     
-    # Special cases that need offset checks
-    if len(data) > 8 and data[4:8] == b'ftyp':
-        return MimeGuess(
-            media_type='video/mp4',
-            description='MP4 video',
-            confidence=95,
-            source='magic_bytes',
-            magic_bytes='ftyp'
-        )
+    At most max_size handles are kept idle, or more while worker pools hold
+    reservations (see reserve), so every worker thread keeps its own handle.
+    """
+
+    def __init__(self, max_size: int = 8, factory: Optional[Callable[[], Any]] = None) -> None:
+        self.max_size = max_size
+        self._factory = factory or _MagicHandle
+        self._lock = threading.Lock()
+        self._idle: List[Any] = []
+        self._created = 0
+        self._reserved = 0
+        self._pid = os.getpid()
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self.reset()
+
+    def reset(self) -> None:
+        """Drop all pooled handles (e.g. in a forked child)."""
+        self._lock = threading.Lock()
+        self._idle = []
+        self._created = 0
+        self._reserved = 0
+        self._pid = os.getpid()
+
+    @property
+    def size(self) -> int:
+        """Number of handles created by this pool."""
+        return self._created
+
+    @property
+    def idle_limit(self) -> int:
+        """Most handles kept idle: max_size, or the reserved count if larger."""
+        return max(self.max_size, self._reserved)
+
+    def reserve(self, count: int) -> None:
+        """Keep idle handles for count more worker threads, until unreserve(count)."""
+        self._check_pid()
+        with self._lock:
+            self._reserved += count
+
+    def unreserve(self, count: int) -> None:
+        """Drop a reservation, discarding idle handles beyond the new limit."""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            self._reserved = max(0, self._reserved - count)
+            excess = len(self._idle) - self.idle_limit
+            if excess > 0:
+                del self._idle[-excess:]
+                self._created -= excess
+
+    def acquire(self) -> Any:
+        """Check out a handle, creating one if none is idle."""
+        self._check_pid()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            return self._factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def release(self, handle: Any) -> None:
+        """Return a handle to the pool."""
+        if self._pid != os.getpid():
+            return
+        with self._lock:
+            if len(self._idle) < self.idle_limit:
+                self._idle.append(handle)
+            else:
+                self._created -= 1
+
+    @contextmanager
+    def handle(self) -> Iterator[Any]:
+        """Context manager yielding a pooled handle."""
+        h = self.acquire()
+        try:
+            yield h
+        finally:
+            self.release(h)
+
+
+# Shared pool used by detect_buffer
+MAGIC_POOL = MagicPool()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=MAGIC_POOL.reset)
+
+
+class SignatureIndex:
+    """
+    First-byte dispatch table over (offset, pattern) signature rules.
     
-    if len(data) > 12 and data[:4] == b'RIFF' and data[8:12] == b'WAVE':
+    Rules are bucketed by the byte at their first condition's offset, so a
+    lookup only tests the handful of rules that share that byte instead of
+    scanning every signature. Multi-pattern rules outrank single-pattern
+    rules; otherwise the rule added first wins.
+    """
+
+    def __init__(self) -> None:
+        self._tables: Dict[int, Dict[int, List[tuple]]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(
+        self,
+        conditions: Tuple[Tuple[int, bytes], ...],
+        media_type: str,
+        description: str,
+        confidence: int,
+        source: str,
+        label: str
+    ) -> None:
+        """Add a rule; every (offset, pattern) condition must match."""
+        media_type = MEDIA_TYPES.name(MEDIA_TYPES.intern(media_type, description))
+        offset, pattern = conditions[0]
+        rank = (-len(conditions), self._count)
+        rule = (rank, conditions, media_type, description, confidence, source, label)
+        bucket = self._tables.setdefault(offset, {}).setdefault(pattern[0], [])
+        bucket.append(rule)
+        bucket.sort(key=lambda r: r[0])
+        self._count += 1
+
+    def match(self, data: Union[bytes, bytearray, memoryview]) -> Optional[MimeGuess]:
+        """Return the best matching rule for data, if any."""
+        best = None
+        size = len(data)
+        starts = data.startswith if not isinstance(data, memoryview) else partial(_view_startswith, data)
+        for offset, table in self._tables.items():
+            if size <= offset:
+                continue
+            bucket = table.get(data[offset])
+            if not bucket:
+                continue
+            for rule in bucket:
+                if best is not None and rule[0] >= best[0]:
+                    break
+                for o, p in rule[1]:
+                    if not starts(p, o):
+                        break
+                else:
+                    best = rule
+                    break
+        
+        if best is None:
+            return None
+        
+        _, _, media_type, description, confidence, source, label = best
         return MimeGuess(
-            media_type='audio/wav',
-            description='WAV audio',
-            confidence=95,
-            source='magic_bytes',
-            magic_bytes='RIFF...WAVE'
+            media_type=media_type,
+            description=description,
+            confidence=confidence,
+            source=source,
+            magic_bytes=label
         )
+
+
+def _build_signature_index() -> SignatureIndex:
+    """Compile BOMS, MAGIC_SIGNATURES and OFFSET_SIGNATURES into an index."""
+    index = SignatureIndex()
     
-    # TAR at offset 257
-    if len(data) > 262 and data[257:262] == b'ustar':
-        return MimeGuess(
-            media_type='application/x-tar',
-            description='TAR archive',
-            confidence=95,
-            source='magic_bytes',
-            magic_bytes='ustar@257'
-        )
+    # BOMs take precedence over magic signatures
+    for bom, encoding in BOMS.items():
+        index.add(((0, bom),), 'text/plain', f'Plain text ({encoding})', 90, 'bom', bom.hex())
     
-    return None
+    for sig, (mime, desc, conf) in MAGIC_SIGNATURES.items():
+        index.add(((0, sig),), mime, desc, conf, 'magic_bytes', sig.hex())
+    
+    for conditions, (mime, desc, conf), label in OFFSET_SIGNATURES:
+        index.add(conditions, mime, desc, conf, 'magic_bytes', label)
+    
+    return index
+
+
+SIGNATURE_INDEX = _build_signature_index()
+
+
+def _view_startswith(view: memoryview, prefix: bytes, offset: int = 0) -> bool:
+    """bytes.startswith for memoryviews, without copying the view."""
+    return view[offset:offset + len(prefix)] == prefix
 
 
-def _is_text_content(data: bytes) -> Tuple[bool, int]:
-    """Heuristic to determine if content is text."""
+def _check_magic_bytes(data: Union[bytes, bytearray, memoryview]) -> Optional[MimeGuess]:
+    """Check data against known magic byte signatures."""
+    return SIGNATURE_INDEX.match(data)
+
+
+def _is_text_content(
+    data: Union[bytes, bytearray, memoryview],
+    sample_size: Optional[int] = None
+) -> Tuple[bool, int]:
+    """Heuristic to determine if content is text, from its first sample_size bytes."""
     if not data:
         return False, 0
     
-    # Count printable vs non-printable
-    printable = 0
-    non_printable = 0
+    sample = data[:TEXT_SAMPLE_BYTES if sample_size is None else sample_size]
+    if not isinstance(sample, bytes):
+        sample = bytes(sample)
     
-    for byte in data[:1000]:  # Sample first 1KB
-        if 0x20 <= byte <= 0x7E or byte in (0x09, 0x0A, 0x0D):  # ASCII printable + tab/newline
-            printable += 1
-        elif byte < 0x20 or byte > 0x7F:
-            non_printable += 1
+    # Count printable vs non-printable; DEL (0x7F) counts as neither
+    if HAS_NUMPY and len(sample) >= NUMPY_MIN_SAMPLE and _import_numpy() is not None:
+        counts = numpy.bincount(
+            _TEXT_CLASS_ARRAY[numpy.frombuffer(sample, dtype=numpy.uint8)], minlength=3
+        )
+        printable, non_printable = int(counts[1]), int(counts[2])
+    else:
+        printable = len(sample) - len(sample.translate(None, _PRINTABLE_BYTES))
+        non_printable = len(sample) - printable - sample.count(0x7F)
     
     total = printable + non_printable
     if total == 0:
@@ -156,54 +403,45 @@ def _is_text_content(data: bytes) -> Tuple[bool, int]:
     return False, 0
 
 
-def _detect_structured_text(data: bytes) -> Optional[MimeGuess]:
+def _detect_structured_text(data: Union[bytes, bytearray, memoryview]) -> Optional[MimeGuess]:
     """Detect JSON, XML, and other structured text formats."""
+    if isinstance(data, memoryview):
+        data = bytes(data[:DEFAULT_SNIFF_LIMIT])
     try:
-        text = data.decode('utf-8', errors='ignore').strip()
-        if not text:
-            return None
-        
-        # JSON detection
-        if text[0] in '{[' and text[-1] in '}]':
-            try:
-                json.loads(text[:1000])  # Try parsing first 1KB
-                return MimeGuess(
-                    media_type='application/json',
-                    description='JSON document',
-                    confidence=85,
-                    source='structure'
-                )
-            except:
-                pass
-        
-        # XML detection
-        if text.startswith('<?xml') or (text[0] == '<' and '>' in text[:100]):
-            return MimeGuess(
-                media_type='application/xml',
-                description='XML document',
-                confidence=80,
-                source='structure'
-            )
-        
-        # CSV detection (simple heuristic)
-        lines = text[:500].split('\n')
-        if len(lines) > 1:
-            first_commas = lines[0].count(',')
-            if first_commas > 0 and all(line.count(',') == first_commas for line in lines[1:3] if line):
-                return MimeGuess(
-                    media_type='text/csv',
-                    description='CSV document',
-                    confidence=70,
-                    source='structure'
-                )
-    except:
-        pass
-    
-    return None
-
-
-def detect_buffer(buf: bytes, use_libmagic: bool = True) -> MimeGuess:
-    """Detect MIME type from a buffer."""
+        return sniff_structured(data)
+    except Exception:
+        return None
+
+
+def detect_buffer(
+    buf: Union[bytes, bytearray, memoryview],
+    use_libmagic: bool = True,
+    text_sample: Optional[int] = None
+) -> MimeGuess:
+    """
+    Detect MIME type from a buffer.
+    
+    Memoryviews are sniffed in place; only libmagic and the structured text
+    sniffer copy them, up to the bytes they examine. The text heuristic looks
+    at the first text_sample bytes (default TEXT_SAMPLE_BYTES).
+    """
+    tracer = trace.TRACER
+    if tracer is None:
+        return _guess_buffer(buf, use_libmagic, text_sample, None)
+    
+    start = trace.now()
+    guess = _guess_buffer(buf, use_libmagic, text_sample, tracer)
+    tracer.stage('detect_buffer', start, trace.now(), {'bytes': len(buf), 'source': guess.source})
+    return guess
+
+
+def _guess_buffer(
+    buf: Union[bytes, bytearray, memoryview],
+    use_libmagic: bool,
+    text_sample: Optional[int],
+    tracer: Optional[trace.Tracer]
+) -> MimeGuess:
+    """detect_buffer's detector chain, timing each stage when traced."""
     if not buf:
         return MimeGuess(
             media_type='application/octet-stream',
@@ -214,12 +452,10 @@ def detect_buffer(buf: bytes, use_libmagic: bool = True) -> MimeGuess:
     
     # Try libmagic first if available and requested
     if use_libmagic and HAS_LIBMAGIC:
+        start = trace.now() if tracer is not None else 0
         try:
-            mime_magic = magic.Magic(mime=True)
-            desc_magic = magic.Magic()
-            
-            mime_type = mime_magic.from_buffer(buf)
-            description = desc_magic.from_buffer(buf)
+            with MAGIC_POOL.handle() as handle:
+                mime_type, description = handle.identify(buf)
             
             return MimeGuess(
                 media_type=mime_type,
@@ -229,18 +465,32 @@ def detect_buffer(buf: bytes, use_libmagic: bool = True) -> MimeGuess:
             )
         except Exception as e:
             warnings.warn(f"libmagic failed: {e}")
+        finally:
+            if tracer is not None:
+                tracer.stage('libmagic', start, trace.now())
     
     # Fallback detection
     # 1. Check magic bytes
+    start = trace.now() if tracer is not None else 0
     magic_guess = _check_magic_bytes(buf)
+    if tracer is not None:
+        tracer.stage('signatures', start, trace.now())
     if magic_guess:
         return magic_guess
     
     # 2. Check if text
-    is_text, text_conf = _is_text_content(buf)
+    if tracer is not None:
+        start = trace.now()
+    is_text, text_conf = _is_text_content(buf, text_sample)
+    if tracer is not None:
+        tracer.stage('text_heuristic', start, trace.now())
     if is_text:
         # Try to detect structured text
+        if tracer is not None:
+            start = trace.now()
         struct_guess = _detect_structured_text(buf)
+        if tracer is not None:
+            tracer.stage('structured', start, trace.now())
         if struct_guess:
             return struct_guess
         
@@ -261,54 +511,264 @@ def detect_buffer(buf: bytes, use_libmagic: bool = True) -> MimeGuess:
     )
 
 
+# Header reads up to this size go through the calling thread's reusable
+# buffer; larger reads get a buffer of their own, so no thread keeps one
+READ_BUFFER_MAX = 1024 * 1024
+
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+_read_buffers = threading.local()
+
+
+def _thread_buffer(size: int) -> bytearray:
+    """The calling thread's read buffer, replaced by a larger one when needed."""
+    buf = getattr(_read_buffers, 'data', None)
+    if buf is None or len(buf) < size:
+        # Replace rather than resize: views of the old buffer may still exist
+        buf = _read_buffers.data = bytearray(max(size, 8192))
+    return buf
+
+
+def _pread(fd: int, size: int, offset: int, reuse: bool) -> Union[bytes, memoryview]:
+    """
+    Read up to size bytes at offset, stopping early only at end of file.
+    
+    With reuse, the bytes land in the calling thread's buffer and the
+    returned memoryview is only valid until that thread's next read.
+    """
+    if not hasattr(os, 'preadv'):
+        return _pread_bytes(fd, size, offset)
+    buf = _thread_buffer(size) if reuse and size <= READ_BUFFER_MAX else bytearray(size)
+    view = memoryview(buf)
+    filled = 0
+    while filled < size:
+        count = os.preadv(fd, [view[filled:size]], offset + filled)
+        if not count:
+            break
+        filled += count
+    return view[:filled]
+
+
+def _pread_bytes(fd: int, size: int, offset: int) -> bytes:
+    """_pread for platforms without os.preadv (Windows, older macOS)."""
+    chunks = []
+    while size:
+        if hasattr(os, 'pread'):
+            chunk = os.pread(fd, size, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            chunk = os.read(fd, size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+        offset += len(chunk)
+    return b''.join(chunks)
+
+
+def _read_header(path: Path, size: int, follow_symlinks: bool, reuse: bool) -> Union[bytes, memoryview]:
+    """Open path and read its first size bytes: one open, pread and close."""
+    flags = _OPEN_FLAGS if follow_symlinks else _OPEN_FLAGS | getattr(os, 'O_NOFOLLOW', 0)
+    fd = os.open(path, flags)
+    try:
+        return _pread(fd, size, 0, reuse)
+    finally:
+        os.close(fd)
+
+
+class _PendingRead:
+    """One header read handed to a _ReaderPool thread."""
+
+    __slots__ = ('args', 'done', 'data', 'error', 'abandoned')
+
+    def __init__(self, args: Tuple[Any, ...]) -> None:
+        self.args = args
+        self.done = threading.Event()
+        self.data: Union[bytes, memoryview] = b''
+        self.error: Optional[BaseException] = None
+        self.abandoned = False
+
+
+class _ReaderPool:
+    """
+    Long-lived daemon threads that run header reads with a deadline.
+    
+    A thread is added only when none is idle, so a read stuck on a dead
+    mount holds one thread without delaying later reads, and daemon threads
+    never hold up interpreter exit. Reset in a forked child, whose copy of
+    the pool has no threads.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._tasks: "queue.SimpleQueue[_PendingRead]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._idle = 0
+
+    def submit(self, path: Path, size: int, follow_symlinks: bool) -> _PendingRead:
+        """Start reading a header on a pool thread."""
+        task = _PendingRead((path, size, follow_symlinks))
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            else:
+                threading.Thread(target=self._work, args=(self._tasks,), name='finspect-read', daemon=True).start()
+        self._tasks.put(task)
+        return task
+
+    def _work(self, tasks: "queue.SimpleQueue[_PendingRead]") -> None:
+        while True:
+            task = tasks.get()
+            if not task.abandoned:
+                try:
+                    # Not the thread's reusable buffer: an abandoned read may still finish
+                    task.data = _read_header(*task.args, reuse=False)
+                except BaseException as e:
+                    task.error = e
+                task.done.set()
+            with self._lock:
+                self._idle += 1
+
+
+_READER_POOL = _ReaderPool()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_READER_POOL.reset)
+
+
+def _read_with_deadline(
+    path: Path,
+    size: int,
+    deadline: Deadline,
+    follow_symlinks: bool
+) -> Union[bytes, memoryview]:
+    """
+    Read a file header, giving up once the deadline passes.
+    
+    Without a deadline the header is read into the calling thread's reusable
+    buffer. With a bounded deadline the read runs on a _READER_POOL thread,
+    so a read stuck on a slow network or FUSE mount is abandoned instead of
+    stalling the caller; that read gets a buffer of its own. Raises
+    TimeoutError when the deadline passes first.
+    """
+    if deadline.expires is None:
+        return _read_header(path, size, follow_symlinks, reuse=True)
+    task = _READER_POOL.submit(path, size, follow_symlinks)
+    if not task.done.wait(deadline.remaining()):
+        task.abandoned = True
+        raise TimeoutError(f"Read timeout after {deadline.timeout_ms} ms")
+    if task.error is not None:
+        raise task.error
+    return task.data
+
+
 def detect_file(
     path: Union[str, Path],
     max_bytes: int = 8192,
     max_depth: int = 1,
     use_libmagic: bool = True,
     follow_symlinks: bool = False,
-    ceilings: Optional[Ceilings] = None
+    ceilings: Optional[Ceilings] = None,
+    zip_metadata_first: bool = False,
+    zip_workers: int = 1,
+    deadline: Optional[Deadline] = None,
+    text_sample: Optional[int] = None
 ) -> DetectionResult:
-    """Detect file type for a given path."""
+    """
+    Detect file type for a given path.
+    
+    The file gets ceilings.timeout_ms, cut short by deadline (such as the
+    deadline of a whole directory run) if that passes first. text_sample is
+    passed to detect_buffer; it can cover no more than the max_bytes read.
+    """
+    tracer = trace.TRACER
+    if tracer is None:
+        return _detect_path(
+            path, max_bytes, max_depth, use_libmagic, follow_symlinks,
+            ceilings, zip_metadata_first, zip_workers, deadline, text_sample, None
+        )
+    
+    start = trace.now()
+    result = _detect_path(
+        path, max_bytes, max_depth, use_libmagic, follow_symlinks,
+        ceilings, zip_metadata_first, zip_workers, deadline, text_sample, tracer
+    )
+    tracer.stage('detect_file', start, trace.now(), {'path': result.path})
+    return result
+
+
+def _detect_path(
+    path: Union[str, Path],
+    max_bytes: int,
+    max_depth: int,
+    use_libmagic: bool,
+    follow_symlinks: bool,
+    ceilings: Optional[Ceilings],
+    zip_metadata_first: bool,
+    zip_workers: int,
+    deadline: Optional[Deadline],
+    text_sample: Optional[int],
+    tracer: Optional[trace.Tracer]
+) -> DetectionResult:
+    """detect_file's body, timing each stage when traced."""
     if ceilings is None:
         ceilings = DEFAULT_CEILINGS
+    if deadline is None:
+        deadline = Deadline.after(ceilings.timeout_ms)
+    else:
+        deadline = deadline.within(ceilings.timeout_ms)
     
     path = Path(path)
     result = DetectionResult(path=str(path))
+    start = trace.now() if tracer is not None else 0
     
-    # Check if file exists
-    if not path.exists():
+    # One stat call: lstat unless symlinks are followed
+    try:
+        stat = os.stat(path) if follow_symlinks else os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
         result.errors.append("File not found")
         return result
-    
-    # Handle symlinks
-    if path.is_symlink() and not follow_symlinks:
-        result.errors.append("Symlink not followed (use --follow-symlinks)")
-        return result
-    
-    # Get file stats
-    try:
-        stat = path.stat()
-        result.size_bytes = stat.st_size
     except Exception as e:
         result.errors.append(f"Cannot stat file: {e}")
         return result
     
+    # Handle symlinks
+    if S_ISLNK(stat.st_mode):
+        if os.path.exists(path):
+            result.errors.append("Symlink not followed (use --follow-symlinks)")
+        else:
+            result.errors.append("File not found")
+        return result
+    result.size_bytes = stat.st_size
+    result.mtime_ns = stat.st_mtime_ns
+    if tracer is not None:
+        tracer.stage('stat', start, trace.now())
+    
     # Check size limits
     if stat.st_size > ceilings.max_file_size:
         result.warnings.append(f"File exceeds size limit ({ceilings.max_file_size} bytes)")
     
     # Read file header
+    if tracer is not None:
+        start = trace.now()
     try:
+        if S_ISDIR(stat.st_mode):
+            raise IsADirectoryError("Is a directory")
         bytes_to_read = min(max_bytes, stat.st_size, ceilings.max_bytes_per_file)
-        with open(path, 'rb') as f:
-            header = f.read(bytes_to_read)
+        header = _read_with_deadline(path, bytes_to_read, deadline, follow_symlinks)
+    except TimeoutError as e:
+        result.errors.append(str(e))
+        return result
     except Exception as e:
         result.errors.append(f"Cannot read file: {e}")
         return result
+    if tracer is not None:
+        tracer.stage('read', start, trace.now(), {'bytes': len(header)})
     
     # Detect MIME type
-    mime_guess = detect_buffer(header, use_libmagic)
+    mime_guess = detect_buffer(header, use_libmagic, text_sample)
     result.media_type = mime_guess.media_type
     result.description = mime_guess.description
     result.confidence = mime_guess.confidence
@@ -319,36 +779,94 @@ def detect_file(
         result.sources['magic_bytes'] = mime_guess.magic_bytes
     
     # Check if container
-    if is_container_zip(mime_guess.media_type, header):
+    kind = container_kind(mime_guess.media_type, header)
+    if kind:
         result.is_container = True
         if max_depth > 0:
-            # Import here to avoid circular dependency
-            from .zipscan import inspect_zip
-            try:
-                entries, container_type = inspect_zip(
-                    path,
-                    bytes_hint=max_bytes,
-                    use_libmagic=use_libmagic,
-                    ceilings=ceilings
-                )
-                result.entries = entries
-                if container_type:
-                    result.container_inference = container_type
-            except Exception as e:
-                result.errors.append(f"Error inspecting container: {e}")
+            if tracer is not None:
+                start = trace.now()
+            _inspect_container(
+                result, path, kind, max_bytes, max_depth, use_libmagic,
+                ceilings, deadline, zip_metadata_first, zip_workers
+            )
+            if tracer is not None:
+                tracer.stage('container', start, trace.now(), {'kind': kind})
     
     return result
 
 
+def _inspect_container(
+    result: DetectionResult,
+    source: Union[Path, bytes, bytearray, memoryview],
+    kind: str,
+    max_bytes: int,
+    max_depth: int,
+    use_libmagic: bool,
+    ceilings: Ceilings,
+    deadline: Deadline,
+    zip_metadata_first: bool,
+    zip_workers: int
+) -> None:
+    """List a container's entries into result, recording any failure as an error."""
+    # Import here to avoid circular dependency
+    try:
+        if kind == 'zip':
+            from .zipscan import inspect_zip
+            entries, container_type = inspect_zip(
+                source,
+                bytes_hint=max_bytes,
+                use_libmagic=use_libmagic,
+                ceilings=ceilings,
+                deadline=deadline,
+                metadata_first=zip_metadata_first,
+                workers=zip_workers,
+                max_depth=max_depth
+            )
+        else:
+            from .tarscan import inspect_gzip, inspect_tar
+            inspect = inspect_tar if kind == 'tar' else inspect_gzip
+            entries, container_type = inspect(
+                source,
+                bytes_hint=max_bytes,
+                use_libmagic=use_libmagic,
+                ceilings=ceilings,
+                deadline=deadline
+            )
+        result.entries = entries
+        if container_type:
+            result.container_inference = container_type
+        if deadline.expired():
+            result.errors.append(
+                f"Container inspection timeout after {deadline.timeout_ms} ms"
+            )
+    except Exception as e:
+        result.errors.append(f"Error inspecting container: {e}")
+
+
 def detect_bytes(
-    data: bytes,
-    use_libmagic: bool = True
+    data: Union[bytes, bytearray, memoryview],
+    use_libmagic: bool = True,
+    max_bytes: Optional[int] = None,
+    max_depth: int = 0,
+    ceilings: Optional[Ceilings] = None,
+    zip_metadata_first: bool = False,
+    zip_workers: int = 1,
+    deadline: Optional[Deadline] = None,
+    text_sample: Optional[int] = None
 ) -> DetectionResult:
-    """Detect file type from bytes."""
+    """
+    Detect file type from bytes.
+    
+    The whole buffer is sniffed unless max_bytes is given. With max_depth > 0,
+    ZIP, TAR and GZIP data is inspected as detect_file would, within the same
+    ceilings.timeout_ms and deadline; bytearray and memoryview data (such as
+    a memory-mapped file) is read in place.
+    """
     result = DetectionResult()
     result.size_bytes = len(data)
     
-    mime_guess = detect_buffer(data, use_libmagic)
+    header = data if max_bytes is None else data[:max_bytes]
+    mime_guess = detect_buffer(header, use_libmagic, text_sample)
     result.media_type = mime_guess.media_type
     result.description = mime_guess.description
     result.confidence = mime_guess.confidence
@@ -358,14 +876,155 @@ def detect_bytes(
     if mime_guess.magic_bytes:
         result.sources['magic_bytes'] = mime_guess.magic_bytes
     
+    kind = container_kind(mime_guess.media_type, header)
+    if kind:
+        result.is_container = True
+        if max_depth > 0:
+            if ceilings is None:
+                ceilings = DEFAULT_CEILINGS
+            if deadline is None:
+                deadline = Deadline.after(ceilings.timeout_ms)
+            else:
+                deadline = deadline.within(ceilings.timeout_ms)
+            _inspect_container(
+                result, data, kind, max_bytes or ceilings.max_bytes_per_file, max_depth,
+                use_libmagic, ceilings, deadline, zip_metadata_first, zip_workers
+            )
+    
     return result
 
 
-def is_container_zip(mime_type: str, header: bytes) -> bool:
+# detect_file options that also apply to buffers, with detect_file's defaults
+_BUFFER_OPTIONS = {
+    'max_bytes': 8192, 'max_depth': 1, 'use_libmagic': True, 'ceilings': None,
+    'zip_metadata_first': False, 'zip_workers': 1, 'deadline': None, 'text_sample': None,
+}
+
+
+def _detect_item(item: Union[str, Path, bytes], options: Dict[str, Any]) -> DetectionResult:
+    """Detect a single path or buffer; worker entry point for detect_many."""
+    try:
+        if isinstance(item, (bytes, bytearray, memoryview)):
+            # Buffers are inspected exactly as a file with the same bytes would be
+            return detect_bytes(item, **{
+                name: options.get(name, default) for name, default in _BUFFER_OPTIONS.items()
+            })
+        return detect_file(item, **options)
+    except Exception as e:
+        is_buffer = isinstance(item, (bytes, bytearray, memoryview))
+        result = DetectionResult(path='' if is_buffer else str(item))
+        result.errors.append(f"Detection failed: {e}")
+        return result
+
+
+def _warm_worker(use_libmagic: bool) -> None:
+    """Process pool initializer: load a libmagic handle up front."""
+    if use_libmagic and HAS_LIBMAGIC:
+        try:
+            with MAGIC_POOL.handle():
+                pass
+        except Exception:
+            pass
+
+
+def detect_many(
+    paths_or_buffers: Iterable[Union[str, Path, bytes]],
+    workers: Optional[int] = None,
+    mode: str = 'thread',
+    ordered: bool = True,
+    max_pending: Optional[int] = None,
+    executor: Optional["Executor"] = None,
+    **options: Any
+) -> Iterator[DetectionResult]:
+    """
+    Detect many paths or buffers in parallel.
+    
+    Results are yielded as a stream, in input order when ``ordered`` is true
+    and in completion order otherwise. At most ``max_pending`` items are in
+    flight at once, so a slow consumer throttles submission. Pass an existing
+    ``executor`` to keep workers (and their libmagic handles) warm across
+    calls; otherwise one is created for this call and shut down afterwards.
+    Remaining keyword arguments are passed to ``detect_file``; buffers get
+    those that apply to ``detect_bytes``, with ``detect_file``'s defaults.
+    """
+    if mode not in ('thread', 'process'):
+        raise ValueError(f"Invalid mode: {mode!r} (expected 'thread' or 'process')")
+    
+    from concurrent.futures import (
+        Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+    )
+    
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    
+    own_executor = executor is None
+    if own_executor:
+        if mode == 'process':
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_warm_worker,
+                initargs=(options.get('use_libmagic', True),)
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='finspect')
+    
+    items = iter(paths_or_buffers)
+    pending: deque = deque()
+    not_done: set = set()
+    
+    def submit_next() -> bool:
+        for item in items:
+            if mode == 'process' and isinstance(item, memoryview):
+                item = bytes(item)
+            future = executor.submit(_detect_item, item, options)
+            pending.append(future)
+            not_done.add(future)
+            return True
+        return False
+    
+    # Keep one idle libmagic handle per thread so none are rebuilt between items
+    reserved = workers if mode == 'thread' else 0
+    MAGIC_POOL.reserve(reserved)
+    try:
+        while len(pending) < max_pending and submit_next():
+            pass
+        
+        while pending:
+            if ordered:
+                future: Future = pending.popleft()
+                not_done.discard(future)
+                result = future.result()
+            else:
+                done, _ = wait(not_done, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                not_done.discard(future)
+                pending.remove(future)
+                result = future.result()
+            
+            submit_next()
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
+        MAGIC_POOL.unreserve(reserved)
+
+
+def is_container_zip(mime_type: str, header: Union[bytes, bytearray, memoryview]) -> bool:
     """Check if file is a ZIP container."""
     return (
         mime_type == 'application/zip' or
-        header.startswith(b'PK\x03\x04') or
-        header.startswith(b'PK\x05\x06') or
-        header.startswith(b'PK\x07\x08')
-    )
\ No newline at end of file
+        header[:4] in (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08')
+    )
+
+
+def container_kind(mime_type: str, header: Union[bytes, bytearray, memoryview]) -> Optional[str]:
+    """Which inspector handles a container: 'zip', 'tar', 'gzip', or None."""
+    if is_container_zip(mime_type, header):
+        return 'zip'
+    if mime_type == 'application/x-tar' or header[257:262] == b'ustar':
+        return 'tar'
+    if mime_type == 'application/gzip' or header[:2] == b'\x1f\x8b':
+        return 'gzip'
+    return None
\ No newline at end of file
@@ -0,0 +1,279 @@
+"""Streaming HTML report writer for finspect."""
+
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from .mediatypes import MEDIA_TYPES
+
+
+# Result rows per HTML page; larger reports continue in _pageN files
+HTML_PAGE_ROWS = 50_000
+
+_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>File Type Inspection Report - {title}</title>
+    <style>
+        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 20px; background: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+        h1 {{ color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px; }}
+        h2 {{ color: #667eea; margin-top: 30px; }}
+        .summary {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin: 20px 0; }}
+        .summary-card {{ background: #f7fafc; padding: 15px; border-radius: 8px; border-left: 4px solid #667eea; }}
+        .summary-card h3 {{ margin: 0 0 10px 0; color: #4a5568; font-size: 14px; }}
+        .summary-card .number {{ font-size: 28px; font-weight: bold; color: #667eea; }}
+        table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+        th {{ background: #667eea; color: white; padding: 10px; text-align: left; }}
+        td {{ padding: 10px; border-bottom: 1px solid #e2e8f0; }}
+        tr:hover {{ background: #f7fafc; }}
+        .confidence-high {{ color: #48bb78; font-weight: bold; }}
+        .confidence-med {{ color: #ed8936; }}
+        .confidence-low {{ color: #f56565; }}
+        .error {{ color: #f56565; font-weight: bold; }}
+        .container-badge {{ background: #667eea; color: white; padding: 2px 8px; border-radius: 4px; font-size: 12px; }}
+        .timestamp {{ color: #718096; font-size: 14px; }}
+        .pager {{ margin: 10px 0; }}
+        .pager a {{ color: #667eea; margin-right: 15px; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>File Type Inspection Report</h1>
+        <p class="timestamp">Generated: {generated}</p>
+        <p>Directory: <strong>{directory}</strong></p>
+        <p class="pager">{pager}</p>
+"""
+
+_RESULTS_START = """        <h2>Detailed Results{page}</h2>
+        <table>
+            <tr>
+                <th>File</th>
+                <th>Type</th>
+                <th>Confidence</th>
+                <th>Size</th>
+                <th>Notes</th>
+            </tr>
+"""
+
+_ROW = """            <tr>
+                <td>{path}</td>
+                <td>{media_type}</td>
+                <td class="{conf_class}">{confidence}%</td>
+                <td>{size}</td>
+                <td>{notes}</td>
+            </tr>
+"""
+
+_RESULTS_END = """        </table>
+"""
+
+_SUMMARY = """        <h2 id="summary">Summary</h2>
+        <div class="summary">
+            <div class="summary-card">
+                <h3>Total Files</h3>
+                <div class="number">{total_files}</div>
+            </div>
+            <div class="summary-card">
+                <h3>High Confidence</h3>
+                <div class="number">{high_confidence}</div>
+            </div>
+            <div class="summary-card">
+                <h3>Containers</h3>
+                <div class="number">{containers}</div>
+            </div>
+            <div class="summary-card">
+                <h3>Errors</h3>
+                <div class="number">{errors}</div>
+            </div>
+        </div>
+
+        <h2>File Type Distribution</h2>
+        <table>
+            <tr>
+                <th>Media Type</th>
+                <th>Category</th>
+                <th>Count</th>
+                <th>Percentage</th>
+            </tr>
+"""
+
+_TYPE_ROW = """            <tr>
+                <td>{media_type}</td>
+                <td>{category}</td>
+                <td>{count}</td>
+                <td>{percentage:.1f}%</td>
+            </tr>
+"""
+
+_FOOT = """    </div>
+</body>
+</html>"""
+
+
+def _format_size(size_bytes: int) -> str:
+    if size_bytes > 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+    if size_bytes > 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    return f"{size_bytes} B"
+
+
+def render_row(result: Dict[str, Any]) -> str:
+    """One Detailed Results table row for a report record."""
+    confidence = result.get('confidence', 0)
+    if confidence >= 90:
+        conf_class = "confidence-high"
+    elif confidence >= 70:
+        conf_class = "confidence-med"
+    else:
+        conf_class = "confidence-low"
+
+    notes = []
+    if result.get('is_container'):
+        notes.append('<span class="container-badge">Container</span>')
+    if result.get('error'):
+        notes.append(f'<span class="error">Error: {escape(result["error"])}</span>')
+    elif result.get('errors'):
+        notes.append(f'<span class="error">{len(result["errors"])} errors</span>')
+
+    return _ROW.format(
+        path=escape(result.get('relative_path', result.get('path', 'unknown'))),
+        media_type=escape(result.get('media_type', 'unknown')),
+        conf_class=conf_class,
+        confidence=confidence,
+        size=_format_size(result.get('size_bytes', 0)),
+        notes=' '.join(notes) if notes else '-'
+    )
+
+
+def render_summary(summary: Dict[str, Any]) -> str:
+    """Summary cards and the type distribution table."""
+    parts = [_SUMMARY.format(**summary)]
+    total = summary['total_files']
+    for media_type, count in sorted(summary['by_type'].items(), key=lambda x: x[1], reverse=True):
+        parts.append(_TYPE_ROW.format(
+            media_type=escape(media_type),
+            category=MEDIA_TYPES.category(MEDIA_TYPES.intern(media_type)),
+            count=count,
+            percentage=(count / total * 100) if total > 0 else 0
+        ))
+    parts.append(_RESULTS_END)
+    return ''.join(parts)
+
+
+def _head(directory: Path, pager: str) -> str:
+    return _HEAD.format(
+        title=escape(directory.name),
+        generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        directory=escape(str(directory)),
+        pager=pager
+    )
+
+
+def render_html_report(
+    results: Iterable[Dict[str, Any]],
+    directory: Path,
+    summary: Dict[str, Any]
+) -> str:
+    """A complete single-page report as one string (no pagination)."""
+    parts = [_head(directory, '<a href="#summary">Summary</a>'), _RESULTS_START.format(page='')]
+    parts.extend(render_row(result) for result in results)
+    parts.extend((_RESULTS_END, render_summary(summary), _FOOT))
+    return ''.join(parts)
+
+
+class HtmlReportWriter:
+    """
+    Streaming HTML report.
+
+    The page header is written when the writer opens, each result row as
+    soon as it arrives, and the summary when it closes, so memory use does
+    not grow with the run. Past ``page_rows`` rows the table continues in
+    finspect_report_<ts>_page2.html and so on, each page linked to its
+    neighbours; the summary is appended to the first page, which stays
+    open until close. Pass a summary builder (with add and to_dict) to
+    have rows folded into it as they are written.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        timestamp: Optional[str] = None,
+        page_rows: int = HTML_PAGE_ROWS,
+        summary: Optional[Any] = None
+    ) -> None:
+        self.timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_dir = output_dir
+        self.path = self._page_path(1)
+        self.paths: List[Path] = [self.path]
+        self.page_rows = page_rows
+        self.summary = summary
+        self._page = 1
+        self._rows_on_page = 0
+        self._main = open(self.path, 'w', encoding='utf-8')
+        self._file: TextIO = self._main
+        self._main.write(_head(output_dir, '<a href="#summary">Summary</a>'))
+        self._main.write(_RESULTS_START.format(page=''))
+
+    def __enter__(self) -> "HtmlReportWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _page_path(self, page: int) -> Path:
+        suffix = '' if page == 1 else f'_page{page}'
+        return self.output_dir / f"finspect_report_{self.timestamp}{suffix}.html"
+
+    def _next_page(self) -> None:
+        next_path = self._page_path(self._page + 1)
+        self._file.write(_RESULTS_END)
+        self._file.write(f'        <p class="pager"><a href="{next_path.name}">Next page</a></p>\n')
+        if self._file is not self._main:
+            self._file.write(_FOOT)
+            self._file.close()
+
+        previous_path = self._page_path(self._page)
+        self._page += 1
+        self._rows_on_page = 0
+        self.paths.append(next_path)
+        self._file = open(next_path, 'w', encoding='utf-8')
+        self._file.write(_head(
+            self.output_dir,
+            f'<a href="{previous_path.name}">Previous page</a>'
+            f'<a href="{self.path.name}#summary">Summary</a>'
+        ))
+        self._file.write(_RESULTS_START.format(page=f' (page {self._page})'))
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Append one result row."""
+        if self._rows_on_page >= self.page_rows:
+            self._next_page()
+        self._file.write(render_row(result))
+        self._rows_on_page += 1
+        if self.summary is not None:
+            self.summary.add(result)
+
+    def close(self, summary: Optional[Dict[str, Any]] = None) -> None:
+        """Finish the table, append the summary to the first page and close."""
+        if self._main.closed:
+            return
+        self._file.write(_RESULTS_END)
+        if self._file is not self._main:
+            self._file.write(_FOOT)
+            self._file.close()
+
+        if summary is None and self.summary is not None:
+            summary = self.summary.to_dict()
+        if summary is not None:
+            if self._page > 1:
+                self._main.write(
+                    f'        <p class="pager">Results continue on {self._page - 1} more '
+                    f'page(s), up to <a href="{self.paths[-1].name}">page {self._page}</a></p>\n'
+                )
+            self._main.write(render_summary(summary))
+        self._main.write(_FOOT)
+        self._main.close()
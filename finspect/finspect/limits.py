@@ -1,5 +1,7 @@
 """Resource limits and security guardrails for finspect."""
 
+import threading
+import time
 from dataclasses import dataclass
 from typing import Optional
 
@@ -12,7 +14,10 @@ class Ceilings:
     max_zip_entries: int = 10000
     max_total_sniff_bytes: int = 100 * 1024 * 1024  # 100MB total
     max_recursion_depth: int = 1
-    timeout_ms: Optional[int] = None
+    timeout_ms: Optional[int] = None  # per file: read + container inspection
+    entry_timeout_ms: Optional[int] = None  # per container entry
+    run_timeout_ms: Optional[int] = None  # whole directory run
+    max_compression_ratio: int = 100  # nested archives beyond this are treated as zip bombs
     
     def get_entry_budget(self, num_entries: int) -> int:
         """Calculate byte budget for ZIP entries."""
@@ -20,6 +25,72 @@ class Ceilings:
         return min(total, self.max_total_sniff_bytes)
 
 
+class ScanBudget:
+    """
+    Byte and entry allowance shared by every level of a container scan.
+    
+    Nested archives draw from the same budget as their parent, and the
+    budget may be consumed from several worker threads at once.
+    """
+    
+    def __init__(self, max_bytes: int, max_entries: int) -> None:
+        self.bytes_left = max_bytes
+        self.entries_left = max_entries
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_ceilings(cls, ceilings: "Ceilings") -> "ScanBudget":
+        """Fresh budget sized by max_total_sniff_bytes and max_zip_entries."""
+        return cls(ceilings.max_total_sniff_bytes, ceilings.max_zip_entries)
+    
+    def take_bytes(self, count: int) -> bool:
+        """Charge count bytes; False (and nothing charged) once the budget is spent."""
+        with self._lock:
+            if self.bytes_left <= 0:
+                return False
+            self.bytes_left -= count
+            return True
+    
+    def take_entries(self, count: int) -> int:
+        """Charge up to count entries; returns how many were granted."""
+        with self._lock:
+            granted = max(0, min(count, self.entries_left))
+            self.entries_left -= granted
+            return granted
+
+
+class Deadline:
+    """A point in monotonic time after which work should be cut short."""
+    
+    def __init__(self, expires: Optional[float] = None, timeout_ms: Optional[int] = None) -> None:
+        self.expires = expires
+        self.timeout_ms = timeout_ms
+    
+    @classmethod
+    def after(cls, timeout_ms: Optional[int]) -> "Deadline":
+        """Deadline timeout_ms from now; never expires if timeout_ms is None."""
+        if timeout_ms is None:
+            return cls()
+        return cls(time.monotonic() + timeout_ms / 1000, timeout_ms)
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None if unbounded."""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+    
+    def expired(self) -> bool:
+        """True once the deadline has passed."""
+        return self.expires is not None and time.monotonic() >= self.expires
+    
+    def within(self, timeout_ms: Optional[int]) -> "Deadline":
+        """The earlier of this deadline and timeout_ms from now."""
+        inner = Deadline.after(timeout_ms)
+        if inner.expires is None or (self.expires is not None and self.expires <= inner.expires):
+            return self
+        return inner
+
+
 # Default ceilings
 DEFAULT_CEILINGS = Ceilings()
 
@@ -0,0 +1,121 @@
+"""Interned media-type registry: one small integer ID per media type."""
+
+import threading
+from typing import Dict, List, Optional
+
+
+# Category for exact media types; anything else falls back to _CATEGORY_PREFIXES
+_CATEGORY_TYPES = {
+    '': 'unknown',
+    'application/octet-stream': 'unknown',
+    'application/pdf': 'document',
+    'application/postscript': 'document',
+    'application/rtf': 'document',
+    'text/rtf': 'document',
+    'application/msword': 'document',
+    'application/vnd.hp-pcl': 'document',
+    'application/zip': 'archive',
+    'application/gzip': 'archive',
+    'application/x-tar': 'archive',
+    'application/x-rar-compressed': 'archive',
+    'application/x-7z-compressed': 'archive',
+    'application/x-bzip2': 'archive',
+    'application/x-xz': 'archive',
+    'application/json': 'data',
+    'application/x-ndjson': 'data',
+    'application/xml': 'data',
+    'application/yaml': 'data',
+    'application/ogg': 'audio',
+    'application/x-msdownload': 'executable',
+    'application/x-dosexec': 'executable',
+    'application/x-executable': 'executable',
+    'application/x-sharedlib': 'executable',
+    'application/x-mach-binary': 'executable',
+}
+
+_CATEGORY_PREFIXES = (
+    ('application/vnd.openxmlformats-officedocument.', 'document'),
+    ('application/vnd.oasis.opendocument.', 'document'),
+    ('application/vnd.ms-', 'document'),
+    ('image/', 'image'),
+    ('audio/', 'audio'),
+    ('video/', 'video'),
+    ('font/', 'font'),
+    ('text/', 'text'),
+)
+
+
+def category_for(media_type: str) -> str:
+    """Broad category of a media type (document, image, archive, ...)."""
+    category = _CATEGORY_TYPES.get(media_type)
+    if category:
+        return category
+    for prefix, category in _CATEGORY_PREFIXES:
+        if media_type.startswith(prefix):
+            return category
+    return 'other'
+
+
+class MediaTypeRegistry:
+    """
+    Interns media types as small integer IDs.
+
+    Each distinct media type string is stored once, with a description and
+    a category; results and summaries keep the ID and turn it back into the
+    shared string only when they are written out. IDs are dense and never
+    reused, so they can index lists. Lookups take no lock; new types are
+    added under one.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._descriptions: List[Optional[str]] = []
+        self._categories: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, media_type: object) -> bool:
+        return media_type in self._ids
+
+    def intern(self, media_type: str, description: Optional[str] = None) -> int:
+        """ID for a media type, registering it (and its description) if new."""
+        type_id = self._ids.get(media_type)
+        if type_id is not None:
+            if description and self._descriptions[type_id] is None:
+                self._descriptions[type_id] = description
+            return type_id
+
+        with self._lock:
+            type_id = self._ids.get(media_type)
+            if type_id is None:
+                type_id = len(self._names)
+                self._names.append(media_type)
+                self._descriptions.append(description or None)
+                self._categories.append(category_for(media_type))
+                self._ids[media_type] = type_id
+        return type_id
+
+    def canonical(self, media_type: str) -> str:
+        """The registry's shared copy of a media type string."""
+        return self._names[self.intern(media_type)]
+
+    def name(self, type_id: int) -> str:
+        """Media type string for an ID."""
+        return self._names[type_id]
+
+    def description(self, type_id: int) -> Optional[str]:
+        """First description registered for an ID, if any."""
+        return self._descriptions[type_id]
+
+    def category(self, type_id: int) -> str:
+        """Category for an ID."""
+        return self._categories[type_id]
+
+
+MEDIA_TYPES = MediaTypeRegistry()
+
+# The default result type is ID 0
+OCTET_STREAM = MEDIA_TYPES.intern('application/octet-stream', 'Unknown')
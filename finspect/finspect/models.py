@@ -1,7 +1,11 @@
 """Data models for finspect."""
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union, overload
+
+from .mediatypes import MEDIA_TYPES
 
 
 @dataclass
@@ -14,60 +18,366 @@ class MimeGuess:
     magic_bytes: Optional[str] = None
 
 
-@dataclass
-class EntryResult:
+class _Record:
+    """
+    Base for the slotted result records.
+
+    Subclasses list their constructor arguments in _fields; repr, equality
+    and to_record/from_record are derived from it, as a dataclass would.
+    Container fields are stored as None until first touched, and the media
+    type is held as its MEDIA_TYPES id.
+    """
+    __slots__ = ('type_id',)
+    _fields: Tuple[str, ...] = ()
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES.name(self.type_id)
+
+    @media_type.setter
+    def media_type(self, value: str) -> None:
+        self.type_id = MEDIA_TYPES.intern(value)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # MEDIA_TYPES ids differ between processes, so pickle (as process
+        # pools do) through to_record, which spells media types out
+        return type(self).from_record, (self.to_record(),)
+
+
+class EntryResult(_Record):
     """Result for a single entry in a container."""
-    name: str
-    media_type: str
-    confidence: int
-    size_bytes: Optional[int] = None
-    is_directory: bool = False
-    error: Optional[str] = None
+    __slots__ = (
+        'name', 'confidence', 'size_bytes', 'is_directory', 'error',
+        'source', 'container_inference', '_entries'
+    )
+    _fields = (
+        'name', 'media_type', 'confidence', 'size_bytes', 'is_directory', 'error',
+        'source', 'container_inference', 'entries'
+    )
 
+    def __init__(
+        self,
+        name: str,
+        media_type: str,
+        confidence: int,
+        size_bytes: Optional[int] = None,
+        is_directory: bool = False,
+        error: Optional[str] = None,
+        source: Optional[str] = None,
+        container_inference: Optional[str] = None,
+        entries: Optional[List["EntryResult"]] = None
+    ) -> None:
+        self.name = name
+        self.media_type = media_type
+        self.confidence = confidence
+        self.size_bytes = size_bytes
+        self.is_directory = is_directory
+        self.error = error
+        self.source = source
+        self.container_inference = container_inference
+        self._entries = entries or None
+
+    @property
+    def entries(self) -> List["EntryResult"]:
+        """Entries of a nested container (created on first use)."""
+        if self._entries is None:
+            self._entries = []
+        return self._entries
+
+    @entries.setter
+    def entries(self, value: List["EntryResult"]) -> None:
+        self._entries = value
+
+    def iter_fields(self) -> Iterator[Tuple[str, Any]]:
+        """(key, value) pairs of to_dict, with nested entries left as EntryResults."""
+        yield "name", self.name
+        yield "media_type", self.media_type
+        yield "confidence", self.confidence
+
+        if self.container_inference:
+            yield "container_inference", self.container_inference
+
+        if self._entries:
+            yield "entries", [e for e in self._entries if not e.is_directory]
 
-@dataclass
-class DetectionResult:
-    """Complete detection result for a file."""
-    tool: str = "finspect"
-    version: str = "1.0.0"
-    path: str = ""
-    size_bytes: int = 0
-    is_container: bool = False
-    media_type: str = "application/octet-stream"
-    description: str = "Unknown"
-    confidence: int = 0
-    container_inference: Optional[str] = None
-    sources: Dict[str, str] = field(default_factory=dict)
-    entries: List[EntryResult] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
-    errors: List[str] = field(default_factory=list)
-    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        result = {
-            "tool": self.tool,
-            "version": self.version,
-            "path": self.path,
-            "size_bytes": self.size_bytes,
-            "is_container": self.is_container,
-            "media_type": self.media_type,
-            "description": self.description,
-            "confidence": self.confidence,
-            "sources": self.sources,
-            "warnings": self.warnings,
-            "errors": self.errors
-        }
-        
+        result = dict(self.iter_fields())
+        if "entries" in result:
+            result["entries"] = [e.to_dict() for e in result["entries"]]
+        return result
+
+    def to_record(self) -> Dict[str, Any]:
+        """Every field, nested entries included, for lossless round-tripping."""
+        record = {name: getattr(self, name) for name in self._fields[:-1]}
+        record["entries"] = [e.to_record() for e in self._entries or ()]
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "EntryResult":
+        """Rebuild an entry from to_record output."""
+        record = dict(record)
+        record["entries"] = [cls.from_record(e) for e in record.get("entries") or ()]
+        return cls(**record)
+
+
+# Archives with at least this many entries keep them in an EntryTable
+ENTRY_TABLE_MIN = 1000
+
+
+class EntryTable(Sequence):
+    """
+    Columnar storage for the entries of a large archive.
+
+    Names, MEDIA_TYPES ids, source ids, confidences and sizes are kept in
+    parallel arrays, with sources interned once per table (source id 0
+    means none). Errors and directory flags are stored
+    sparsely, and the rare entry carrying nested results is kept whole.
+    Indexing and iteration hand out
+    EntryResult objects built on demand, so the table can stand in for a
+    list of entries anywhere they are only read.
+    """
+
+    def __init__(self, entries: Optional[List[EntryResult]] = None) -> None:
+        self.names: List[str] = []
+        self.type_ids = array('I')
+        self.source_ids = array('B')
+        self.confidences = array('B')
+        self.sizes = array('q')  # -1 when unknown
+        self.sources: List[Optional[str]] = [None]
+        self._errors: Dict[int, str] = {}
+        self._directories: set = set()
+        self._nested: Dict[int, EntryResult] = {}
+        for entry in entries or ():
+            self.append(entry)
+
+    def _source_id(self, source: Optional[str]) -> int:
+        try:
+            return self.sources.index(source)
+        except ValueError:
+            self.sources.append(source)
+            return len(self.sources) - 1
+
+    def append(self, entry: EntryResult) -> None:
+        """Add an entry at the end of the table."""
+        index = len(self.names)
+        self.names.append(entry.name)
+        self.type_ids.append(entry.type_id)
+        self.source_ids.append(self._source_id(entry.source))
+        self.confidences.append(entry.confidence)
+        self.sizes.append(-1 if entry.size_bytes is None else entry.size_bytes)
+        if entry.error:
+            self._errors[index] = entry.error
+        if entry.is_directory:
+            self._directories.add(index)
+        if entry._entries or entry.container_inference:
+            self._nested[index] = entry
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _entry(self, index: int) -> EntryResult:
+        nested = self._nested.get(index)
+        if nested is not None:
+            return nested
+        size = self.sizes[index]
+        entry = EntryResult(
+            name=self.names[index],
+            media_type='',
+            confidence=self.confidences[index],
+            size_bytes=None if size < 0 else size,
+            is_directory=index in self._directories,
+            error=self._errors.get(index),
+            source=self.sources[self.source_ids[index]]
+        )
+        entry.type_id = self.type_ids[index]
+        return entry
+
+    @overload
+    def __getitem__(self, index: int) -> EntryResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[EntryResult]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[EntryResult, List[EntryResult]]:
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EntryTable index out of range")
+        return self._entry(index)
+
+    def __iter__(self) -> Iterator[EntryResult]:
+        for index in range(len(self)):
+            yield self._entry(index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (EntryTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"EntryTable({len(self)} entries)"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickle the entries, not the per-process type ids
+        return EntryTable, (list(self),)
+
+
+def compact_entries(entries: List[EntryResult]) -> Union[List[EntryResult], EntryTable]:
+    """Move a long entry list into an EntryTable; short lists are returned as is."""
+    if len(entries) < ENTRY_TABLE_MIN:
+        return entries
+    return EntryTable(entries)
+
+
+class DetectionResult(_Record):
+    """
+    Complete detection result for a file.
+
+    mtime_ns is the file's modification time from the stat taken before
+    detection; it is kept in records but not in to_dict output.
+    """
+    __slots__ = (
+        'tool', 'version', 'path', 'size_bytes', 'is_container',
+        'description', 'confidence', 'container_inference',
+        '_sources', '_entries', '_warnings', '_errors', 'mtime_ns'
+    )
+    _fields = (
+        'tool', 'version', 'path', 'size_bytes', 'is_container', 'media_type',
+        'description', 'confidence', 'container_inference',
+        'sources', 'entries', 'warnings', 'errors', 'mtime_ns'
+    )
+
+    def __init__(
+        self,
+        tool: str = "finspect",
+        version: str = "1.0.0",
+        path: str = "",
+        size_bytes: int = 0,
+        is_container: bool = False,
+        media_type: str = "application/octet-stream",
+        description: str = "Unknown",
+        confidence: int = 0,
+        container_inference: Optional[str] = None,
+        sources: Optional[Dict[str, str]] = None,
+        entries: Optional[Sequence] = None,
+        warnings: Optional[List[str]] = None,
+        errors: Optional[List[str]] = None,
+        mtime_ns: Optional[int] = None
+    ) -> None:
+        self.tool = tool
+        self.version = version
+        self.path = path
+        self.size_bytes = size_bytes
+        self.is_container = is_container
+        self.media_type = media_type
+        self.description = description
+        self.confidence = confidence
+        self.container_inference = container_inference
+        self._sources = sources or None
+        self._entries = entries or None
+        self._warnings = warnings or None
+        self._errors = errors or None
+        self.mtime_ns = mtime_ns
+
+    @property
+    def sources(self) -> Dict[str, str]:
+        """Detection sources that agreed on the type (created on first use)."""
+        if self._sources is None:
+            self._sources = {}
+        return self._sources
+
+    @sources.setter
+    def sources(self, value: Dict[str, str]) -> None:
+        self._sources = value
+
+    @property
+    def entries(self) -> Sequence:
+        """Container entries: a list, or an EntryTable for large archives."""
+        if self._entries is None:
+            self._entries = []
+        return self._entries
+
+    @entries.setter
+    def entries(self, value: Sequence) -> None:
+        self._entries = value
+
+    @property
+    def warnings(self) -> List[str]:
+        if self._warnings is None:
+            self._warnings = []
+        return self._warnings
+
+    @warnings.setter
+    def warnings(self, value: List[str]) -> None:
+        self._warnings = value
+
+    @property
+    def errors(self) -> List[str]:
+        if self._errors is None:
+            self._errors = []
+        return self._errors
+
+    @errors.setter
+    def errors(self, value: List[str]) -> None:
+        self._errors = value
+
+    def iter_fields(self) -> Iterator[Tuple[str, Any]]:
+        """(key, value) pairs of to_dict, with entries left as EntryResults."""
+        yield "tool", self.tool
+        yield "version", self.version
+        yield "path", self.path
+        yield "size_bytes", self.size_bytes
+        yield "is_container", self.is_container
+        yield "media_type", self.media_type
+        yield "description", self.description
+        yield "confidence", self.confidence
+        yield "sources", self._sources if self._sources is not None else {}
+        yield "warnings", self._warnings if self._warnings is not None else []
+        yield "errors", self._errors if self._errors is not None else []
+
         if self.container_inference:
-            result["container_inference"] = self.container_inference
-            
-        if self.entries:
-            result["entries"] = [
-                {
-                    "name": e.name,
-                    "media_type": e.media_type,
-                    "confidence": e.confidence
-                } for e in self.entries if not e.is_directory
-            ]
-            
-        return result
\ No newline at end of file
+            yield "container_inference", self.container_inference
+
+        if self._entries:
+            yield "entries", [e for e in self._entries if not e.is_directory]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        result = dict(self.iter_fields())
+        if "entries" in result:
+            result["entries"] = [e.to_dict() for e in result["entries"]]
+        return result
+
+    def to_record(self) -> Dict[str, Any]:
+        """Every field, entries included, for lossless round-tripping."""
+        record = {name: getattr(self, name) for name in self._fields[:9]}
+        record["sources"] = dict(self._sources or {})
+        record["entries"] = [e.to_record() for e in self._entries or ()]
+        record["warnings"] = list(self._warnings or ())
+        record["errors"] = list(self._errors or ())
+        record["mtime_ns"] = self.mtime_ns
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "DetectionResult":
+        """Rebuild a result from to_record output."""
+        record = dict(record)
+        entries = [EntryResult.from_record(e) for e in record.get("entries") or ()]
+        record["entries"] = compact_entries(entries)
+        return cls(**record)
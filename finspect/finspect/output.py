@@ -1,10 +1,31 @@
 """Output formatters for finspect."""
 
-import json
 import sys
-from typing import TextIO
+from typing import List, TextIO
 
-from .models import DetectionResult
+from .models import DetectionResult, EntryResult
+
+
+def _print_entries(entries: List[EntryResult], file: TextIO, depth: int = 0) -> None:
+    """Print container entries, indenting the contents of nested archives."""
+    for entry in entries:
+        if entry.is_directory:
+            continue
+        
+        prefix = "  " * (depth + 1) + "- "
+        name = entry.name
+        if len(name) > 40:
+            name = name[:37] + "..."
+        
+        line = f"{prefix}{name:<40} -> {entry.media_type} (confidence {entry.confidence})"
+        
+        if entry.error:
+            line += f" [ERROR: {entry.error}]"
+        
+        print(line, file=file)
+        
+        if entry.entries:
+            _print_entries(entry.entries, file, depth + 1)
 
 
 def print_human(result: DetectionResult, show_sources: bool = False, file: TextIO = sys.stdout) -> None:
@@ -38,21 +59,7 @@ def print_human(result: DetectionResult, show_sources: bool = False, file: TextI
         
         if result.entries:
             print("\nEntries:", file=file)
-            for entry in result.entries:
-                if entry.is_directory:
-                    continue
-                
-                prefix = "  - "
-                name = entry.name
-                if len(name) > 40:
-                    name = name[:37] + "..."
-                
-                line = f"{prefix}{name:<40} -> {entry.media_type} (confidence {entry.confidence})"
-                
-                if entry.error:
-                    line += f" [ERROR: {entry.error}]"
-                
-                print(line, file=file)
+            _print_entries(result.entries, file)
     
     # Warnings and errors
     if result.warnings:
@@ -66,8 +73,8 @@ def print_human(result: DetectionResult, show_sources: bool = False, file: TextI
             print(f"  ✗ {error}", file=file)
 
 
-def print_json(result: DetectionResult, file: TextIO = sys.stdout) -> None:
-    """Print JSON output."""
-    output = result.to_dict()
-    json.dump(output, file, indent=2)
+def print_json(result: DetectionResult, file: TextIO = sys.stdout, compact: bool = False) -> None:
+    """Print JSON output (indented, or on one line when compact)."""
+    from . import serialize
+    serialize.dump(result, file, compact)
     print(file=file)  # Add newline
\ No newline at end of file
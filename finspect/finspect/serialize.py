@@ -0,0 +1,146 @@
+"""Pluggable JSON serialization for finspect output and reports."""
+
+import json
+from json.encoder import encode_basestring_ascii
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from .models import DetectionResult, EntryResult, EntryTable
+
+# orjson and msgspec are optional; the fastest one installed is used
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    HAS_MSGSPEC = False
+    msgspec = None
+
+
+BACKENDS = ('orjson', 'msgspec', 'json')
+
+# Backend used when none is requested
+DEFAULT_BACKEND = 'orjson' if HAS_ORJSON else 'msgspec' if HAS_MSGSPEC else 'json'
+
+INDENT = 2
+
+_MODELS = (DetectionResult, EntryResult)
+
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback for types the C encoders do not know.
+
+    A model becomes a one-level dict of its iter_fields; its entries stay
+    EntryResults, which the encoder hands back here one at a time.
+    """
+    if isinstance(obj, _MODELS):
+        return dict(obj.iter_fields())
+    if isinstance(obj, EntryTable):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _floatstr(value: float) -> str:
+    if value != value:
+        return 'NaN'
+    if value == float('inf'):
+        return 'Infinity'
+    if value == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+def _iterencode(obj: Any, level: int) -> Iterator[str]:
+    """
+    Indented encoder, output-compatible with json.dumps(indent=2).
+
+    Result models are walked through iter_fields, so no intermediate dicts
+    are built; strings go through the C-accelerated escaper.
+    """
+    if isinstance(obj, str):
+        yield encode_basestring_ascii(obj)
+    elif obj is None:
+        yield 'null'
+    elif obj is True:
+        yield 'true'
+    elif obj is False:
+        yield 'false'
+    elif isinstance(obj, int):
+        yield int.__repr__(obj)
+    elif isinstance(obj, float):
+        yield _floatstr(obj)
+    elif isinstance(obj, (dict, DetectionResult, EntryResult)):
+        items = obj.items() if isinstance(obj, dict) else obj.iter_fields()
+        inner = '\n' + ' ' * (INDENT * (level + 1))
+        separator = '{' + inner
+        for key, value in items:
+            if not isinstance(key, str):
+                # Scalar keys are spelled as their JSON value, like json does
+                key = next(_iterencode(key, 0))
+            yield separator + encode_basestring_ascii(key) + ': '
+            yield from _iterencode(value, level + 1)
+            separator = ',' + inner
+        yield '{}' if separator[0] == '{' else '\n' + ' ' * (INDENT * level) + '}'
+    elif isinstance(obj, (list, tuple, EntryTable)):
+        inner = '\n' + ' ' * (INDENT * (level + 1))
+        separator = '[' + inner
+        for value in obj:
+            yield separator
+            yield from _iterencode(value, level + 1)
+            separator = ',' + inner
+        yield '[]' if separator[0] == '[' else '\n' + ' ' * (INDENT * level) + ']'
+    else:
+        yield from _iterencode(_default(obj), level)
+
+
+_compact_encoder = json.JSONEncoder(separators=(',', ':'), default=_default)
+
+
+def dumps(obj: Any, compact: bool = False, backend: Optional[str] = None) -> str:
+    """
+    Serialize dicts, lists and result models to JSON text.
+
+    Indented output uses two spaces, as json.dumps(indent=2) does; compact
+    output has no whitespace at all. The backend defaults to orjson, then
+    msgspec, then the standard library, whichever is installed. orjson and
+    msgspec write non-ASCII characters as UTF-8 rather than escaping them;
+    output they cannot encode falls back to the standard library.
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
+    if (backend == 'orjson' and not HAS_ORJSON) or (backend == 'msgspec' and not HAS_MSGSPEC):
+        raise ValueError(f"JSON backend {backend!r} is not installed")
+
+    try:
+        if backend == 'orjson':
+            option = 0 if compact else orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+        if backend == 'msgspec':
+            data = msgspec.json.encode(obj, enc_hook=_default)
+            if not compact:
+                data = msgspec.json.format(data, indent=INDENT)
+            return data.decode('utf-8')
+    except (TypeError, ValueError):
+        # orjson and msgspec reject strings that are not valid UTF-8, such
+        # as undecodable filenames (surrogate escapes); json escapes them
+        pass
+    if compact:
+        return _compact_encoder.encode(obj)
+    return ''.join(_iterencode(obj, 0))
+
+
+def dump(obj: Any, file: TextIO, compact: bool = False, backend: Optional[str] = None) -> None:
+    """Serialize obj as JSON to a text file."""
+    if (backend or DEFAULT_BACKEND) == 'json' and not compact:
+        write: Callable[[str], Any] = file.write
+        for chunk in _iterencode(obj, 0):
+            write(chunk)
+        return
+    file.write(dumps(obj, compact, backend))
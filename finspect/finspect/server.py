@@ -0,0 +1,252 @@
+"""Long-running detection daemon on a Unix socket (finspect serve)."""
+
+import argparse
+import mmap
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+from typing import Any, Dict, List, Optional
+
+from . import __version__, serialize
+from .client import recv_message
+from .detect import _warm_worker, detect_bytes, detect_file
+from .limits import Ceilings
+from .models import DetectionResult
+
+# Largest inline or non-seekable request body read into memory
+DEFAULT_MAX_REQUEST_BYTES = 256 * 1024 * 1024
+
+# Per-request options a client may override
+REQUEST_OPTIONS = ('max_bytes', 'max_depth', 'use_libmagic', 'zip_metadata_first')
+
+_LENGTH_SIZE = 4
+
+
+def _read_all(fd: int, limit: int) -> bytes:
+    """Read a descriptor to EOF, refusing more than limit bytes."""
+    chunks = []
+    total = 0
+    while True:
+        chunk = os.read(fd, 1024 * 1024)
+        if not chunk:
+            return b''.join(chunks)
+        total += len(chunk)
+        if total > limit:
+            raise ValueError(f"Request body exceeds limit of {limit} bytes")
+        chunks.append(chunk)
+
+
+class _UnreadBody(ValueError):
+    """An announced inline body was not read, so the stream is out of frame."""
+
+
+def _recv_body(sock: socket.socket, size: int) -> bytearray:
+    body = bytearray(size)
+    view = memoryview(body)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            raise _UnreadBody("Connection closed mid-request")
+        view = view[received:]
+    return body
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    """Serves the requests of one client connection, in order."""
+
+    server: "DetectionServer"
+
+    def handle(self) -> None:
+        sock = self.request
+        while True:
+            try:
+                request, fds = recv_message(sock, max_fds=1)
+            except (OSError, ValueError) as e:
+                self._respond({'ok': False, 'error': f"Bad request: {e}"})
+                return
+            if request is None:
+                return
+            in_frame = True
+            try:
+                result = self.server.detect(sock, request, fds)
+                response: Dict[str, Any] = {'ok': True, 'result': result}
+            except _UnreadBody as e:
+                # Body bytes left on the socket must not be parsed as requests
+                response = {'ok': False, 'error': str(e)}
+                in_frame = False
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            finally:
+                for fd in fds:
+                    os.close(fd)
+            if not self._respond(response) or not in_frame:
+                return
+
+    def _respond(self, response: Dict[str, Any]) -> bool:
+        payload = serialize.dumps(response, compact=True).encode('utf-8')
+        try:
+            self.request.sendall(len(payload).to_bytes(_LENGTH_SIZE, 'big') + payload)
+        except OSError:
+            return False
+        return True
+
+
+class DetectionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Detection daemon: one thread per client connection, detectors kept warm.
+
+    libmagic handles come from the shared MAGIC_POOL, so each serving thread
+    keeps its own handle across requests. The socket is created owner-only
+    (mode 0600): clients can ask the daemon to open any path it can read.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str,
+        options: Dict[str, Any],
+        max_request_bytes: int = DEFAULT_MAX_REQUEST_BYTES
+    ) -> None:
+        self.options = options
+        self.max_request_bytes = max_request_bytes
+        # Replace a socket left behind by a daemon that did not shut down cleanly
+        try:
+            if stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+        _warm_worker(options.get('use_libmagic', True))
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+    def _options(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        overrides = request.get('options') or {}
+        unknown = set(overrides) - set(REQUEST_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown options: {', '.join(sorted(unknown))}")
+        return {**self.options, **overrides}
+
+    def _detect_data(self, data: Any, name: str, options: Dict[str, Any]) -> DetectionResult:
+        result = detect_bytes(
+            data,
+            use_libmagic=options['use_libmagic'],
+            max_bytes=options['max_bytes'],
+            max_depth=options['max_depth'],
+            ceilings=options['ceilings'],
+            zip_metadata_first=options['zip_metadata_first']
+        )
+        result.path = name
+        return result
+
+    def _detect_fd(self, fd: int, name: str, options: Dict[str, Any]) -> DetectionResult:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or not st.st_size:
+            return self._detect_data(_read_all(fd, self.max_request_bytes), name, options)
+        # Map regular files so containers are inspected in place
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return self._detect_data(view, name, options)
+
+    def _recv_inline(self, sock: socket.socket, request: Dict[str, Any]) -> bytearray:
+        try:
+            size = int(request['size'])
+        except (TypeError, ValueError):
+            raise _UnreadBody(f"Bad body size: {request['size']!r}") from None
+        if not 0 <= size <= self.max_request_bytes:
+            raise _UnreadBody(f"Request body exceeds limit of {self.max_request_bytes} bytes")
+        try:
+            return _recv_body(sock, size)
+        except OSError as e:
+            raise _UnreadBody(f"Request body not received: {e}") from None
+
+    def detect(self, sock: socket.socket, request: Dict[str, Any], fds: List[int]) -> Dict[str, Any]:
+        """Handle one request and return its result as a dict."""
+        body = None
+        if 'path' not in request and not request.get('fd') and 'size' in request:
+            # Read an inline body before anything else can fail, so the
+            # connection stays in frame whatever the request's outcome
+            body = self._recv_inline(sock, request)
+        options = self._options(request)
+        name = str(request.get('name', ''))
+        if 'path' in request:
+            result = detect_file(str(request['path']), **options)
+        elif request.get('fd'):
+            if len(fds) != 1:
+                raise ValueError("fd request without a passed descriptor")
+            result = self._detect_fd(fds[0], name, options)
+        elif body is not None:
+            result = self._detect_data(body, name, options)
+        else:
+            raise ValueError("Request needs one of path, fd or size")
+        return result.to_dict()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse ``finspect serve`` arguments."""
+    parser = argparse.ArgumentParser(
+        prog='finspect serve',
+        description='Serve detection requests on a Unix socket, keeping detectors warm'
+    )
+    parser.add_argument('--socket', required=True, metavar='PATH', help='Unix socket path to listen on')
+    parser.add_argument('--bytes', type=int, default=8192, metavar='N',
+                        help='Number of bytes to sniff (default: 8192)')
+    parser.add_argument('--max-depth', type=int, default=1, metavar='D',
+                        help='Container levels to inspect (default: 1, 0=no inspection)')
+    parser.add_argument('--zip-metadata-first', action='store_true',
+                        help='Type OOXML/ODF package parts from the ZIP central directory')
+    parser.add_argument('--no-libmagic', action='store_true', help='Force fallback detector (skip libmagic)')
+    parser.add_argument('--follow-symlinks', action='store_true',
+                        help='Follow symbolic links in path requests')
+    parser.add_argument('--timeout', type=int, metavar='MS', help='Per-request deadline in milliseconds')
+    parser.add_argument('--max-request-bytes', type=int, default=DEFAULT_MAX_REQUEST_BYTES, metavar='N',
+                        help=f'Largest inline or piped request body (default: {DEFAULT_MAX_REQUEST_BYTES})')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``finspect serve``."""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: finspect serve needs Unix domain sockets", file=sys.stderr)
+        return 1
+    args = parse_args(argv)
+    options = {
+        'max_bytes': args.bytes,
+        'max_depth': args.max_depth,
+        'use_libmagic': not args.no_libmagic,
+        'follow_symlinks': args.follow_symlinks,
+        'ceilings': Ceilings(
+            max_bytes_per_file=args.bytes,
+            max_recursion_depth=args.max_depth,
+            timeout_ms=args.timeout
+        ),
+        'zip_metadata_first': args.zip_metadata_first,
+    }
+
+    server = DetectionServer(args.socket, options, args.max_request_bytes)
+
+    def stop(signum: int, frame: Any) -> None:
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"finspect {__version__} serving on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,242 @@
+"""Incremental sniffing of structured text formats (JSON, NDJSON, XML, YAML, CSV/TSV)."""
+
+from typing import List, Optional, Tuple
+
+from .models import MimeGuess
+
+
+# Bytes scanned by default; a valid but unfinished JSON prefix still counts
+DEFAULT_SNIFF_LIMIT = 8192
+
+# CSV/TSV heuristics only look at the first few hundred bytes
+DELIMITED_WINDOW = 500
+
+_WHITESPACE = frozenset(b' \t\r\n')
+_NUMBER_CHARS = frozenset(b'0123456789+-.eE')
+_TAG_START = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_!?')
+_LITERALS = {ord('t'): b'true', ord('f'): b'false', ord('n'): b'null'}
+
+# JSON scan results
+JSON_INVALID = 0
+JSON_TRUNCATED = 1
+JSON_COMPLETE = 2
+
+# JSON parser states
+_VALUE = 0
+_ARRAY_FIRST = 1
+_OBJECT_FIRST = 2
+_OBJECT_KEY = 3
+_COLON = 4
+_AFTER_VALUE = 5
+
+
+def _skip_whitespace(data: bytes, pos: int, end: int) -> int:
+    while pos < end and data[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _skip_string(data: bytes, pos: int, end: int) -> int:
+    """Skip a JSON string starting at its opening quote; -1 if unterminated."""
+    pos += 1
+    while True:
+        quote = data.find(b'"', pos, end)
+        if quote < 0:
+            return -1
+        backslashes = 0
+        i = quote - 1
+        while i >= pos and data[i] == 0x5C:
+            backslashes += 1
+            i -= 1
+        if backslashes % 2 == 0:
+            return quote + 1
+        pos = quote + 1
+
+
+def scan_json(data: bytes, pos: int = 0, end: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Validate one JSON container starting at pos without decoding it.
+
+    Returns:
+        Tuple of (JSON_COMPLETE | JSON_TRUNCATED | JSON_INVALID, end position).
+        JSON_TRUNCATED means everything up to ``end`` is a valid JSON prefix.
+    """
+    if end is None:
+        end = len(data)
+
+    stack: List[int] = []
+    state = _VALUE
+
+    while pos < end:
+        c = data[pos]
+        if c in _WHITESPACE:
+            pos += 1
+            continue
+
+        if state == _AFTER_VALUE:
+            if c == 0x2C:  # ,
+                state = _OBJECT_KEY if stack[-1] == 0x7B else _VALUE
+                pos += 1
+            elif (c == 0x7D and stack[-1] == 0x7B) or (c == 0x5D and stack[-1] == 0x5B):
+                stack.pop()
+                pos += 1
+            else:
+                return JSON_INVALID, pos
+
+        elif state == _COLON:
+            if c != 0x3A:  # :
+                return JSON_INVALID, pos
+            state = _VALUE
+            pos += 1
+
+        elif state in (_OBJECT_FIRST, _OBJECT_KEY):
+            if c == 0x7D and state == _OBJECT_FIRST:  # }
+                stack.pop()
+                state = _AFTER_VALUE
+                pos += 1
+            elif c == 0x22:  # "
+                pos = _skip_string(data, pos, end)
+                if pos < 0:
+                    return JSON_TRUNCATED, end
+                state = _COLON
+            else:
+                return JSON_INVALID, pos
+
+        else:  # _VALUE or _ARRAY_FIRST
+            if c == 0x5D and state == _ARRAY_FIRST:  # ]
+                stack.pop()
+                state = _AFTER_VALUE
+                pos += 1
+            elif c == 0x7B or c == 0x5B:  # { [
+                stack.append(c)
+                state = _OBJECT_FIRST if c == 0x7B else _ARRAY_FIRST
+                pos += 1
+            elif c == 0x22:
+                pos = _skip_string(data, pos, end)
+                if pos < 0:
+                    return JSON_TRUNCATED, end
+                state = _AFTER_VALUE
+            elif c in _NUMBER_CHARS:
+                while pos < end and data[pos] in _NUMBER_CHARS:
+                    pos += 1
+                state = _AFTER_VALUE
+            elif c in _LITERALS:
+                literal = _LITERALS[c]
+                chunk = data[pos:pos + len(literal)]
+                if not literal.startswith(chunk):
+                    return JSON_INVALID, pos
+                if len(chunk) < len(literal):
+                    return JSON_TRUNCATED, end
+                pos += len(literal)
+                state = _AFTER_VALUE
+            else:
+                return JSON_INVALID, pos
+
+        if state == _AFTER_VALUE and not stack:
+            return JSON_COMPLETE, pos
+
+    return JSON_TRUNCATED, end
+
+
+def _sniff_json(data: bytes, start: int, end: int) -> Optional[MimeGuess]:
+    """Recognize JSON and NDJSON from a container at start."""
+    status, pos = scan_json(data, start, end)
+    if status == JSON_INVALID:
+        return None
+    if status == JSON_TRUNCATED:
+        return MimeGuess('application/json', 'JSON document', 85, source='structure')
+
+    # Complete value: whitespace only -> JSON, newline + another value -> NDJSON
+    saw_newline = False
+    while pos < end and data[pos] in _WHITESPACE:
+        saw_newline = saw_newline or data[pos] == 0x0A
+        pos += 1
+    if pos >= end:
+        return MimeGuess('application/json', 'JSON document', 90, source='structure')
+
+    if saw_newline and data[pos] in (0x7B, 0x5B):
+        status, _ = scan_json(data, pos, end)
+        if status != JSON_INVALID:
+            return MimeGuess(
+                'application/x-ndjson', 'Newline-delimited JSON', 85, source='structure'
+            )
+
+    return None
+
+
+def _sniff_xml(data: bytes, start: int, end: int) -> Optional[MimeGuess]:
+    """Recognize XML from its declaration or a leading tag."""
+    if data.startswith(b'<?xml', start):
+        return MimeGuess('application/xml', 'XML document', 85, source='structure')
+    if start + 1 < end and data[start + 1] in _TAG_START and data.find(b'>', start, start + 100) > 0:
+        return MimeGuess('application/xml', 'XML document', 80, source='structure')
+    return None
+
+
+def _sniff_yaml(data: bytes, start: int, end: int) -> Optional[MimeGuess]:
+    """Recognize YAML from a %YAML directive or --- document marker."""
+    if data.startswith(b'%YAML', start):
+        return MimeGuess('application/yaml', 'YAML document', 90, source='structure')
+    if data.startswith(b'---', start) and start + 3 < end and data[start + 3] in _WHITESPACE:
+        return MimeGuess('application/yaml', 'YAML document', 75, source='structure')
+    return None
+
+
+def _sniff_delimited(data: bytes, start: int, end: int) -> Optional[MimeGuess]:
+    """Recognize CSV/TSV by a consistent delimiter count on the first lines."""
+    window_end = min(end, start + DELIMITED_WINDOW)
+    first_nl = data.find(b'\n', start, window_end)
+    if first_nl < 0:
+        return None
+
+    # The header line and up to two following lines
+    lines = [(start, first_nl)]
+    pos = first_nl + 1
+    while len(lines) < 3 and pos <= window_end:
+        nl = data.find(b'\n', pos, window_end)
+        line_end = window_end if nl < 0 else nl
+        lines.append((pos, line_end))
+        if nl < 0:
+            break
+        pos = nl + 1
+
+    for delimiter, mime, desc in (
+        (b',', 'text/csv', 'CSV document'),
+        (b'\t', 'text/tab-separated-values', 'TSV document'),
+    ):
+        expected = data.count(delimiter, *lines[0])
+        if expected == 0:
+            continue
+        rows = [(s, e) for s, e in lines[1:] if e > s]
+        if all(data.count(delimiter, s, e) == expected for s, e in rows):
+            confidence = 70 if rows else 60
+            return MimeGuess(mime, desc, confidence, source='structure')
+
+    return None
+
+
+def sniff_structured(data: bytes, limit: int = DEFAULT_SNIFF_LIMIT) -> Optional[MimeGuess]:
+    """
+    Detect JSON, NDJSON, XML, YAML and CSV/TSV without decoding the buffer.
+
+    Only the first ``limit`` bytes are examined, and each recognizer stops as
+    soon as it has enough evidence.
+    """
+    end = min(len(data), limit)
+    start = _skip_whitespace(data, 0, end)
+    if start >= end:
+        return None
+
+    first = data[start]
+    if first in (0x7B, 0x5B):  # { [
+        guess = _sniff_json(data, start, end)
+        if guess:
+            return guess
+    elif first == 0x3C:  # <
+        return _sniff_xml(data, start, end)
+    elif first in (0x25, 0x2D):  # % -
+        guess = _sniff_yaml(data, start, end)
+        if guess:
+            return guess
+
+    return _sniff_delimited(data, start, end)
@@ -0,0 +1,296 @@
+"""Streaming TAR and GZIP container inspection."""
+
+import gzip
+import io
+import tarfile
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+
+from .models import EntryResult, compact_entries
+from .detect import detect_buffer
+from .limits import Ceilings, Deadline, ScanBudget, DEFAULT_CEILINGS
+from .zipscan import ZipSource, _ViewReader, _timeout_marker
+
+
+# Decompressed bytes needed to recognize a tar inside a gzip stream
+TAR_HEADER_SIZE = 512
+
+# Member data is skipped in chunks of this size, checking limits in between
+SKIP_CHUNK = 1024 * 1024
+
+# gzip header flag bits
+_FEXTRA = 0x04
+_FNAME = 0x08
+
+
+def _open_source(source: ZipSource, stack: ExitStack) -> BinaryIO:
+    """Sequential file object over bytes, a memoryview, or a path."""
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if isinstance(source, (bytearray, memoryview)):
+        view = stack.enter_context(memoryview(source))
+        return stack.enter_context(_ViewReader(view))
+    return stack.enter_context(open(source, 'rb'))
+
+
+def _gzip_member_name(header: bytes) -> Optional[str]:
+    """Original file name stored in a gzip header (FNAME), if any."""
+    if len(header) < 10 or not header[3] & _FNAME:
+        return None
+    pos = 10
+    if header[3] & _FEXTRA:
+        if len(header) < 12:
+            return None
+        pos += 2 + int.from_bytes(header[10:12], 'little')
+    end = header.find(b'\x00', pos)
+    if end < 0:
+        return None
+    return header[pos:end].decode('latin-1') or None
+
+
+def _skip_member(
+    member_file: BinaryIO,
+    source: BinaryIO,
+    inflated: int,
+    buffer: bytearray,
+    ceilings: Ceilings,
+    deadline: Deadline
+) -> Tuple[int, Optional[EntryResult]]:
+    """
+    Read past the rest of a member's data, one chunk at a time.
+
+    Returns the running count of decompressed bytes, and a marker entry if
+    the deadline passed or the stream expanded beyond max_compression_ratio
+    times the compressed bytes consumed so far (or beyond max_file_size).
+    """
+    while True:
+        count = member_file.readinto(buffer)
+        if not count:
+            return inflated, None
+        inflated += count
+        if deadline.expired():
+            return inflated, _timeout_marker(deadline)
+        compressed = max(source.tell(), 1)
+        if inflated > compressed * ceilings.max_compression_ratio or inflated > ceilings.max_file_size:
+            return inflated, EntryResult(
+                name="[TRUNCATED: decompression limit exceeded]",
+                media_type="",
+                confidence=0,
+                error=(
+                    f"Possible decompression bomb: expands beyond "
+                    f"{ceilings.max_compression_ratio}x its compressed size"
+                )
+            )
+
+
+def inspect_tar(
+    path_or_bytes: ZipSource,
+    bytes_hint: int = 8192,
+    use_libmagic: bool = True,
+    ceilings: Optional[Ceilings] = None,
+    deadline: Optional[Deadline] = None,
+    budget: Optional[ScanBudget] = None
+) -> Tuple[Sequence[EntryResult], Optional[str]]:
+    """
+    Inspect TAR archive contents (plain or gzip/bzip2/xz compressed).
+
+    The archive is read once, front to back, through tarfile stream mode:
+    each member's header is sniffed as it goes by and the rest of its data
+    skipped, so compressed archives are never seeked or extracted to disk.
+
+    Sniff reads are charged to max_total_sniff_bytes and members to
+    max_zip_entries, exactly as for ZIP containers. Inspection stops with a
+    "[TRUNCATED: ...]" marker once the deadline passes, or once the skipped
+    data expands beyond max_compression_ratio times the compressed input.
+
+    Returns:
+        Tuple of (entries list, container type inference)
+    """
+    if ceilings is None:
+        ceilings = DEFAULT_CEILINGS
+    if deadline is None:
+        deadline = Deadline.after(ceilings.timeout_ms)
+    if budget is None:
+        budget = ScanBudget.from_ceilings(ceilings)
+
+    entry_budget = (
+        ceilings.entry_timeout_ms / 1000 if ceilings.entry_timeout_ms is not None else None
+    )
+    entries: List[EntryResult] = []
+    skip_buffer = bytearray(SKIP_CHUNK)
+    inflated = 0
+
+    try:
+        with ExitStack() as stack:
+            fileobj = _open_source(path_or_bytes, stack)
+            tar = stack.enter_context(tarfile.open(fileobj=fileobj, mode='r|*'))
+
+            for member in tar:
+                # Check deadline
+                if deadline.expired():
+                    entries.append(_timeout_marker(deadline))
+                    break
+
+                # Enforce entry count ceiling
+                if not budget.take_entries(1):
+                    entries.append(
+                        EntryResult(
+                            name=f"[WARNING: entries exceed limit of {ceilings.max_zip_entries}]",
+                            media_type="",
+                            confidence=0,
+                            error="Too many entries"
+                        )
+                    )
+                    break
+
+                if member.isdir():
+                    entries.append(
+                        EntryResult(
+                            name=member.name + '/',
+                            media_type="",
+                            confidence=0,
+                            is_directory=True
+                        )
+                    )
+                    continue
+
+                if not member.isfile():
+                    entries.append(
+                        EntryResult(
+                            name=member.name,
+                            media_type="application/octet-stream",
+                            confidence=0,
+                            error="Not a regular file"
+                        )
+                    )
+                    continue
+
+                # Check budget
+                read_bytes = min(bytes_hint, member.size, ceilings.max_bytes_per_file)
+                if not budget.take_bytes(read_bytes):
+                    entries.append(
+                        EntryResult(
+                            name="[TRUNCATED: byte budget exceeded]",
+                            media_type="",
+                            confidence=0,
+                            error="Budget exceeded"
+                        )
+                    )
+                    break
+
+                entry_start = time.monotonic()
+                member_file = tar.extractfile(member)
+                entry_data = member_file.read(read_bytes) if member_file else b''
+                inflated += len(entry_data)
+
+                mime_guess = detect_buffer(entry_data, use_libmagic)
+
+                entry_error = None
+                if entry_budget is not None and time.monotonic() - entry_start > entry_budget:
+                    entry_error = f"Entry timeout after {ceilings.entry_timeout_ms} ms"
+
+                entries.append(
+                    EntryResult(
+                        name=member.name,
+                        media_type=mime_guess.media_type,
+                        confidence=mime_guess.confidence,
+                        size_bytes=member.size,
+                        error=entry_error,
+                        source=mime_guess.source
+                    )
+                )
+
+                # Skip the rest here rather than in the iterator, which would
+                # decompress it with no deadline or expansion checks
+                if member_file is not None:
+                    inflated, marker = _skip_member(
+                        member_file, fileobj, inflated, skip_buffer, ceilings, deadline
+                    )
+                    if marker is not None:
+                        entries.append(marker)
+                        break
+
+    except (tarfile.ReadError, EOFError, gzip.BadGzipFile) as e:
+        raise ValueError(f"Invalid TAR file: {e}")
+    except Exception as e:
+        raise RuntimeError(f"Error reading TAR: {e}")
+
+    return compact_entries(entries), None
+
+
+def inspect_gzip(
+    path_or_bytes: ZipSource,
+    bytes_hint: int = 8192,
+    use_libmagic: bool = True,
+    ceilings: Optional[Ceilings] = None,
+    deadline: Optional[Deadline] = None,
+    budget: Optional[ScanBudget] = None
+) -> Tuple[Sequence[EntryResult], Optional[str]]:
+    """
+    Inspect a gzip stream: a compressed tar, or a single compressed file.
+
+    A .tar.gz is listed member by member with inspect_tar and reported with
+    container type application/x-tar. Otherwise the decompressed prefix is
+    sniffed and returned as one entry, named from the gzip header when the
+    compressor recorded the original file name.
+
+    Returns:
+        Tuple of (entries list, container type inference)
+    """
+    if ceilings is None:
+        ceilings = DEFAULT_CEILINGS
+    if budget is None:
+        budget = ScanBudget.from_ceilings(ceilings)
+
+    read_bytes = min(bytes_hint, ceilings.max_bytes_per_file)
+
+    try:
+        with ExitStack() as stack:
+            fileobj = _open_source(path_or_bytes, stack)
+            header = fileobj.read(TAR_HEADER_SIZE)
+            fileobj.seek(0)
+            with gzip.GzipFile(fileobj=fileobj, mode='rb') as gz:
+                data = gz.read(max(read_bytes, TAR_HEADER_SIZE))
+    except (OSError, EOFError) as e:
+        raise ValueError(f"Invalid GZIP file: {e}")
+
+    if data.startswith(b'ustar', 257):
+        entries, _ = inspect_tar(
+            path_or_bytes,
+            bytes_hint=bytes_hint,
+            use_libmagic=use_libmagic,
+            ceilings=ceilings,
+            deadline=deadline,
+            budget=budget
+        )
+        return entries, 'application/x-tar'
+
+    name = _gzip_member_name(header)
+    if name is None:
+        if isinstance(path_or_bytes, (str, Path)):
+            name = Path(path_or_bytes).name
+            name = name[:-3] if name.endswith('.gz') else name
+        else:
+            name = "[gzip data]"
+
+    if not budget.take_bytes(len(data)):
+        return [
+            EntryResult(
+                name="[TRUNCATED: byte budget exceeded]",
+                media_type="",
+                confidence=0,
+                error="Budget exceeded"
+            )
+        ], None
+
+    mime_guess = detect_buffer(data[:read_bytes], use_libmagic)
+    return [
+        EntryResult(
+            name=name,
+            media_type=mime_guess.media_type,
+            confidence=mime_guess.confidence,
+            source=mime_guess.source
+        )
+    ], None
@@ -0,0 +1,139 @@
+"""Opt-in instrumentation of the detection hot path."""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+
+class Tracer:
+    """
+    Receiver for detection stage timings.
+
+    Instrumented code reports each completed stage (stat, read, libmagic,
+    signatures, zip_read, ...) with its start and end from
+    time.perf_counter_ns and a few details: ``bytes`` for stages that read
+    data, ``source`` for the detector that produced a guess. Stages nest,
+    so a detect_file span contains its read and detect_buffer spans.
+    Calls may arrive from several threads at once.
+    """
+
+    def stage(self, name: str, start_ns: int, end_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+        """Record one completed stage."""
+
+
+# The installed tracer, or None. Instrumented code reads this once per call
+# and skips all timing when it is None, so tracing costs nothing when off.
+TRACER: Optional[Tracer] = None
+
+now = time.perf_counter_ns
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Install a tracer for all threads (None disables); returns the previous one."""
+    global TRACER
+    previous, TRACER = TRACER, tracer
+    return previous
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+    """Install tracer for the duration of a with block."""
+    previous = set_tracer(tracer)
+    try:
+        yield tracer
+    finally:
+        set_tracer(previous)
+
+
+class Profiler(Tracer):
+    """
+    Tracer that aggregates per-stage timings.
+
+    Keeps a count, total and maximum duration and the bytes read for each
+    stage, and how often each detector source won. With keep_events, every
+    stage is also kept as a Chrome trace event for write_chrome_trace.
+    """
+
+    def __init__(self, keep_events: bool = False) -> None:
+        self.keep_events = keep_events
+        self.stages: Dict[str, List[int]] = {}  # name -> [count, total_ns, max_ns, bytes]
+        self.sources: Dict[str, int] = {}
+        self.events: List[Dict[str, Any]] = []
+        self._origin = now()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, start_ns: int, end_ns: int, args: Optional[Dict[str, Any]] = None) -> None:
+        duration = end_ns - start_ns
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = [0, 0, 0, 0]
+            stats[0] += 1
+            stats[1] += duration
+            if duration > stats[2]:
+                stats[2] = duration
+            if args:
+                stats[3] += args.get('bytes', 0)
+                source = args.get('source')
+                if source:
+                    self.sources[source] = self.sources.get(source, 0) + 1
+            if self.keep_events:
+                event = {
+                    "name": name,
+                    "cat": "finspect",
+                    "ph": "X",
+                    "ts": (start_ns - self._origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": self._pid,
+                    "tid": threading.get_ident(),
+                }
+                if args:
+                    event["args"] = args
+                self.events.append(event)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage totals, bytes read and winning sources so far."""
+        with self._lock:
+            return {
+                "stages": {
+                    name: {
+                        "count": count,
+                        "total_ms": total / 1e6,
+                        "mean_us": total / count / 1e3,
+                        "max_us": peak / 1e3,
+                        "bytes": nbytes,
+                    }
+                    for name, (count, total, peak, nbytes) in self.stages.items()
+                },
+                "sources": dict(self.sources),
+            }
+
+    def print_summary(self, file: TextIO) -> None:
+        """Print the stage breakdown, slowest stage first."""
+        summary = self.summary()
+        stages = sorted(summary["stages"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        print(f"{'stage':<16} {'count':>8} {'total ms':>10} {'mean us':>10} {'max us':>10} {'bytes':>12}",
+              file=file)
+        for name, stats in stages:
+            print(
+                f"{name:<16} {stats['count']:>8} {stats['total_ms']:>10.2f} "
+                f"{stats['mean_us']:>10.1f} {stats['max_us']:>10.1f} {stats['bytes']:>12}",
+                file=file
+            )
+        if summary["sources"]:
+            sources = ', '.join(
+                f"{source} {count}"
+                for source, count in sorted(summary["sources"].items(), key=lambda x: x[1], reverse=True)
+            )
+            print(f"Winning sources: {sources}", file=file)
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write the kept events as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        import json
+        with self._lock:
+            events = list(self.events)
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -1,15 +1,28 @@
 """ZIP container inspection and OOXML/ODF detection."""
 
 import zipfile
+from contextlib import ExitStack
 from pathlib import Path
-from typing import List, Tuple, Optional, Union
+from typing import Callable, List, Sequence, Tuple, Optional, Union
 import io
+import mmap
+import os
 
-from .models import EntryResult
-from .detect import detect_buffer
-from .limits import Ceilings, DEFAULT_CEILINGS
+from .mediatypes import MEDIA_TYPES
+from .models import EntryResult, compact_entries
+from .detect import detect_buffer, is_container_zip
+from .limits import Ceilings, Deadline, ScanBudget, DEFAULT_CEILINGS
+from . import trace
 
 
+# Path inputs at least this large are memory-mapped when use_mmap is None
+MMAP_MIN_SIZE = 16 * 1024 * 1024
+
+# Nested archives are inflated into memory in chunks of this size
+NESTED_CHUNK = 64 * 1024
+
+ZipSource = Union[str, Path, bytes, bytearray, memoryview]
+
 # OOXML content types
 OOXML_TYPES = {
     'word/': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
@@ -17,6 +30,12 @@ OOXML_TYPES = {
     'ppt/': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
 }
 
+OOXML_DESCRIPTIONS = {
+    'word/': 'Word document',
+    'xl/': 'Excel spreadsheet',
+    'ppt/': 'PowerPoint presentation',
+}
+
 # ODF MIME types (found in mimetype file)
 ODF_TYPES = {
     'application/vnd.oasis.opendocument.text': 'ODT document',
@@ -25,6 +44,19 @@ ODF_TYPES = {
     'application/vnd.oasis.opendocument.graphics': 'ODG graphics',
 }
 
+# Register container types with their descriptions
+for _prefix, _media_type in OOXML_TYPES.items():
+    MEDIA_TYPES.intern(_media_type, OOXML_DESCRIPTIONS[_prefix])
+for _media_type, _description in ODF_TYPES.items():
+    MEDIA_TYPES.intern(_media_type, _description)
+
+
+# Package parts of a recognized OOXML/ODF container whose type follows from the name
+PACKAGE_PART_TYPES = {
+    '.xml': 'application/xml',
+    '.rels': 'application/xml',
+}
+
 
 def _infer_ooxml_type(entries: List[str]) -> Optional[str]:
     """Infer OOXML document type from entry names."""
@@ -40,74 +72,328 @@ def _infer_ooxml_type(entries: List[str]) -> Optional[str]:
     return None
 
 
+def _infer_entry_from_name(name: str, container_type: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Type a package part from its name alone, or None if it must be sniffed."""
+    if not container_type:
+        return None
+    if container_type in ODF_TYPES and name == 'mimetype':
+        return 'text/plain', 90
+    for suffix, media_type in PACKAGE_PART_TYPES.items():
+        if name.endswith(suffix):
+            return media_type, 80
+    return None
+
+
 def _check_odf_type(zip_file: zipfile.ZipFile) -> Optional[str]:
     """Check for ODF mimetype file."""
     try:
         # ODF stores mimetype as first file, uncompressed
-        if 'mimetype' in zip_file.namelist():
-            info = zip_file.getinfo('mimetype')
-            if info.compress_type == zipfile.ZIP_STORED:  # Uncompressed
-                mimetype = zip_file.read('mimetype').decode('ascii').strip()
-                if mimetype in ODF_TYPES:
-                    return mimetype
+        info = zip_file.getinfo('mimetype')
+        if info.compress_type == zipfile.ZIP_STORED:  # Uncompressed
+            mimetype = zip_file.read('mimetype').decode('ascii').strip()
+            if mimetype in ODF_TYPES:
+                return mimetype
     except:
         pass
     
     return None
 
 
+class _ViewReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a memoryview.
+    
+    zipfile reads the central directory, local headers and entry data
+    straight out of the view: no syscalls, and each read copies only the
+    bytes requested.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view.cast('B') if view.format != 'B' or view.ndim != 1 else view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise OSError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        start = min(self._pos, len(self._view))
+        end = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._pos = end
+        return bytes(self._view[start:end])
+
+    def readinto(self, buffer: memoryview) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        self._view = memoryview(b'')
+        super().close()
+
+
+def _open_zip(source: ZipSource, use_mmap: Optional[bool], stack: ExitStack) -> zipfile.ZipFile:
+    """Open a ZipFile over bytes, a memoryview, or a (optionally mapped) path."""
+    if isinstance(source, bytes):
+        fileobj = io.BytesIO(source)
+    elif isinstance(source, (bytearray, memoryview)):
+        view = stack.enter_context(memoryview(source))
+        fileobj = stack.enter_context(_ViewReader(view))
+    else:
+        if use_mmap is None:
+            use_mmap = os.path.getsize(source) >= MMAP_MIN_SIZE
+        if not use_mmap:
+            return stack.enter_context(zipfile.ZipFile(source, 'r'))
+        
+        f = stack.enter_context(open(source, 'rb'))
+        mapped = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        view = stack.enter_context(memoryview(mapped))
+        fileobj = stack.enter_context(_ViewReader(view))
+    
+    return stack.enter_context(zipfile.ZipFile(fileobj, 'r'))
+
+
+# Placeholder for an entry whose sniff was skipped because the deadline passed
+_TIMED_OUT = EntryResult(name="", media_type="", confidence=0)
+
+
+def _timeout_marker(deadline: Deadline) -> EntryResult:
+    return EntryResult(
+        name="[TRUNCATED: timeout]",
+        media_type="",
+        confidence=0,
+        error=f"Timeout after {deadline.timeout_ms} ms"
+    )
+
+
+def _read_nested(
+    zip_file: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    ceilings: Ceilings,
+    budget: ScanBudget,
+    deadline: Deadline
+) -> bytearray:
+    """
+    Inflate a nested archive into memory, charging the shared byte budget.
+    
+    Both the declared sizes and the bytes actually inflated are held to
+    ceilings.max_compression_ratio, so a zip bomb is abandoned after at most
+    that many times its compressed size rather than fully expanded. Raises
+    TimeoutError once the deadline passes.
+    """
+    max_inflated = max(info.compress_size, 1) * ceilings.max_compression_ratio
+    bomb_error = (
+        f"Possible zip bomb: expands beyond {ceilings.max_compression_ratio}x "
+        f"its compressed size"
+    )
+    if info.file_size > max_inflated:
+        raise ValueError(bomb_error)
+    
+    tracer = trace.TRACER
+    start = trace.now() if tracer is not None else 0
+    data = bytearray()
+    with zip_file.open(info) as entry_file:
+        while True:
+            chunk = entry_file.read(NESTED_CHUNK)
+            if not chunk:
+                break
+            if deadline.expired():
+                raise TimeoutError(f"Timeout after {deadline.timeout_ms} ms")
+            if len(data) + len(chunk) > max_inflated:
+                raise ValueError(bomb_error)
+            if not budget.take_bytes(len(chunk)):
+                raise ValueError("Byte budget exceeded")
+            data += chunk
+    
+    if tracer is not None:
+        tracer.stage('zip_nested', start, trace.now(), {'bytes': len(data)})
+    return data
+
+
+# Inspects a nested archive entry by a deadline, returning (entries, container type)
+_Descend = Callable[
+    [zipfile.ZipFile, zipfile.ZipInfo, Deadline], Tuple[Sequence[EntryResult], Optional[str]]
+]
+
+
+def _sniff_entries(
+    zip_file: zipfile.ZipFile,
+    jobs: List[Tuple[int, zipfile.ZipInfo, int]],
+    entries: List[Optional[EntryResult]],
+    use_libmagic: bool,
+    ceilings: Ceilings,
+    deadline: Deadline,
+    descend: Optional[_Descend] = None
+) -> None:
+    """
+    Read and detect each planned entry, storing results in entries[slot].
+    
+    Entries that are themselves ZIP archives are handed to descend, when
+    given, and its results attached as the entry's children. Each entry,
+    nested archive included, must finish within ceilings.entry_timeout_ms.
+    """
+    entry_timeout = f"Entry timeout after {ceilings.entry_timeout_ms} ms"
+    tracer = trace.TRACER
+    
+    for slot, info, read_bytes in jobs:
+        if deadline.expired():
+            entries[slot] = _TIMED_OUT
+            continue
+        
+        try:
+            entry_deadline = deadline.within(ceilings.entry_timeout_ms)
+            
+            start = trace.now() if tracer is not None else 0
+            with zip_file.open(info) as entry_file:
+                entry_data = entry_file.read(read_bytes)
+            if tracer is not None:
+                tracer.stage('zip_read', start, trace.now(), {'bytes': len(entry_data)})
+            
+            # Detect entry type
+            mime_guess = detect_buffer(entry_data, use_libmagic)
+            
+            entry = EntryResult(
+                name=info.filename,
+                media_type=mime_guess.media_type,
+                confidence=mime_guess.confidence,
+                size_bytes=info.file_size,
+                source=mime_guess.source
+            )
+            
+            # Only the entry's own timeout is its error; the archive's
+            # deadline truncates the listing instead
+            own_timeout = entry_deadline is not deadline
+            if entry_deadline.expired():
+                if own_timeout:
+                    entry.error = entry_timeout
+            elif descend is not None and is_container_zip(mime_guess.media_type, entry_data):
+                try:
+                    entry.entries, entry.container_inference = descend(zip_file, info, entry_deadline)
+                except Exception as e:
+                    entry.error = str(e)
+                if own_timeout and entry_deadline.expired():
+                    entry.error = entry_timeout
+            
+            entries[slot] = entry
+        except Exception as e:
+            entries[slot] = EntryResult(
+                name=info.filename,
+                media_type="application/octet-stream",
+                confidence=0,
+                error=str(e)
+            )
+
+
 def inspect_zip(
-    path_or_bytes: Union[str, Path, bytes],
+    path_or_bytes: ZipSource,
     bytes_hint: int = 8192,
     use_libmagic: bool = True,
-    ceilings: Optional[Ceilings] = None
-) -> Tuple[List[EntryResult], Optional[str]]:
+    ceilings: Optional[Ceilings] = None,
+    deadline: Optional[Deadline] = None,
+    metadata_first: bool = False,
+    use_mmap: Optional[bool] = None,
+    workers: int = 1,
+    max_depth: Optional[int] = None,
+    budget: Optional[ScanBudget] = None
+) -> Tuple[Sequence[EntryResult], Optional[str]]:
     """
     Inspect ZIP archive contents.
     
+    Accepts a path, bytes or a buffer (read in place); nested ZIPs are
+    inspected up to max_depth levels, all sharing one budget.
+    
     Returns:
         Tuple of (entries list, container type inference)
     """
     if ceilings is None:
         ceilings = DEFAULT_CEILINGS
+    if deadline is None:
+        deadline = Deadline.after(ceilings.timeout_ms)
+    if max_depth is None:
+        max_depth = ceilings.max_recursion_depth
+    if budget is None:
+        budget = ScanBudget.from_ceilings(ceilings)
+    
+    descend: Optional[_Descend] = None
+    if max_depth > 1:
+        def descend(
+            parent: zipfile.ZipFile, info: zipfile.ZipInfo, entry_deadline: Deadline
+        ) -> Tuple[Sequence[EntryResult], Optional[str]]:
+            return inspect_zip(
+                _read_nested(parent, info, ceilings, budget, entry_deadline),
+                bytes_hint=bytes_hint,
+                use_libmagic=use_libmagic,
+                ceilings=ceilings,
+                deadline=entry_deadline,
+                metadata_first=metadata_first,
+                max_depth=max_depth - 1,
+                budget=budget
+            )
     
-    entries = []
+    entries: List[Optional[EntryResult]] = []
     container_type = None
-    bytes_scanned = 0
     
+    tracer = trace.TRACER
+    stack = ExitStack()
     try:
         # Open ZIP file
-        if isinstance(path_or_bytes, bytes):
-            zip_buffer = io.BytesIO(path_or_bytes)
-            zip_file = zipfile.ZipFile(zip_buffer, 'r')
-        else:
-            zip_file = zipfile.ZipFile(path_or_bytes, 'r')
+        start = trace.now() if tracer is not None else 0
+        zip_file = _open_zip(path_or_bytes, use_mmap, stack)
         
-        # Get entry list
-        entry_names = zip_file.namelist()
+        # Read the central directory once
+        infos = zip_file.infolist()
+        if tracer is not None:
+            tracer.stage('zip_open', start, trace.now(), {'entries': len(infos)})
+        entry_names = [info.filename for info in infos]
         
         # Check for ODF first (has specific mimetype file)
         odf_type = _check_odf_type(zip_file)
         if odf_type:
             container_type = odf_type
+        elif metadata_first:
+            container_type = _infer_ooxml_type(entry_names)
         
-        # Enforce entry count ceiling
-        if len(entry_names) > ceilings.max_zip_entries:
+        # Enforce entry count ceiling, shared with any enclosing archive
+        granted = budget.take_entries(len(infos))
+        if granted < len(infos):
             entries.append(
                 EntryResult(
-                    name=f"[WARNING: {len(entry_names)} entries exceed limit of {ceilings.max_zip_entries}]",
+                    name=f"[WARNING: {len(infos)} entries exceed limit of {ceilings.max_zip_entries}]",
                     media_type="",
                     confidence=0,
                     error="Too many entries"
                 )
             )
-            entry_names = entry_names[:ceilings.max_zip_entries]
+            infos = infos[:granted]
+            entry_names = entry_names[:granted]
         
-        # Process each entry
-        for entry_name in entry_names:
+        # Plan entries in central-directory order. Sniff reads are reserved
+        # against the byte budget up front, so it holds exactly however many
+        # workers later perform the reads.
+        jobs: List[Tuple[int, zipfile.ZipInfo, int]] = []
+        for info in infos:
+            entry_name = info.filename
             try:
-                info = zip_file.getinfo(entry_name)
-                
                 # Skip directories
                 if entry_name.endswith('/'):
                     entries.append(
@@ -120,16 +406,9 @@ def inspect_zip(
                     )
                     continue
                 
-                # Check budget
-                if bytes_scanned >= ceilings.max_total_sniff_bytes:
-                    entries.append(
-                        EntryResult(
-                            name="[TRUNCATED: byte budget exceeded]",
-                            media_type="",
-                            confidence=0,
-                            error="Budget exceeded"
-                        )
-                    )
+                # Check deadline
+                if deadline.expired():
+                    entries.append(_timeout_marker(deadline))
                     break
                 
                 # Check if encrypted
@@ -144,25 +423,36 @@ def inspect_zip(
                     )
                     continue
                 
-                # Read entry header
-                read_bytes = min(bytes_hint, info.file_size, ceilings.max_bytes_per_file)
-                
-                with zip_file.open(info) as entry_file:
-                    entry_data = entry_file.read(read_bytes)
-                
-                bytes_scanned += len(entry_data)
-                
-                # Detect entry type
-                mime_guess = detect_buffer(entry_data, use_libmagic)
+                # Type package parts by name when the container is known
+                if metadata_first:
+                    inferred = _infer_entry_from_name(entry_name, container_type)
+                    if inferred:
+                        entries.append(
+                            EntryResult(
+                                name=entry_name,
+                                media_type=inferred[0],
+                                confidence=inferred[1],
+                                size_bytes=info.file_size,
+                                source='name'
+                            )
+                        )
+                        continue
                 
-                entries.append(
-                    EntryResult(
-                        name=entry_name,
-                        media_type=mime_guess.media_type,
-                        confidence=mime_guess.confidence,
-                        size_bytes=info.file_size
+                # Reserve the entry header read against the budget
+                read_bytes = min(bytes_hint, info.file_size, ceilings.max_bytes_per_file)
+                if not budget.take_bytes(read_bytes):
+                    entries.append(
+                        EntryResult(
+                            name="[TRUNCATED: byte budget exceeded]",
+                            media_type="",
+                            confidence=0,
+                            error="Budget exceeded"
+                        )
                     )
-                )
+                    break
+                
+                jobs.append((len(entries), info, read_bytes))
+                entries.append(None)
                 
             except Exception as e:
                 entries.append(
@@ -174,15 +464,37 @@ def inspect_zip(
                     )
                 )
         
+        # Sniff entry headers, serially or with one ZipFile handle per worker
+        if workers > 1 and len(jobs) > 1:
+            workers = min(workers, len(jobs))
+            
+            def run_chunk(chunk: List[Tuple[int, zipfile.ZipInfo, int]]) -> None:
+                with ExitStack() as worker_stack:
+                    worker_zip = _open_zip(path_or_bytes, use_mmap, worker_stack)
+                    _sniff_entries(
+                        worker_zip, chunk, entries, use_libmagic, ceilings, deadline, descend
+                    )
+            
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='finspect-zip') as pool:
+                list(pool.map(run_chunk, [jobs[i::workers] for i in range(workers)]))
+        else:
+            _sniff_entries(zip_file, jobs, entries, use_libmagic, ceilings, deadline, descend)
+        
+        # Cut the listing at the first entry that ran out of time
+        cut = next((i for i, entry in enumerate(entries) if entry is _TIMED_OUT), None)
+        if cut is not None:
+            entries[cut:] = [_timeout_marker(deadline)]
+        
         # Try to infer OOXML type if not ODF
         if not container_type:
             container_type = _infer_ooxml_type(entry_names)
         
-        zip_file.close()
-        
     except zipfile.BadZipFile as e:
         raise ValueError(f"Invalid ZIP file: {e}")
     except Exception as e:
         raise RuntimeError(f"Error reading ZIP: {e}")
+    finally:
+        stack.close()
     
-    return entries, container_type
\ No newline at end of file
+    return compact_entries(entries), container_type
\ No newline at end of file
@@ -1,15 +1,28 @@
 """Tests for CLI module."""
 
 import json
+import os
+import socket
 import subprocess
 import sys
+import threading
 from pathlib import Path
 from io import StringIO
 
 import pytest
 
-from finspect.cli import parse_args, determine_exit_code, main
-from finspect.models import DetectionResult
+from finspect.cache import DetectionCache
+from finspect.client import FinspectClient, MAX_MESSAGE, recv_message
+from finspect.cli import (
+    parse_args, determine_exit_code, main, iter_directory, process_directory, cached_detections,
+    merge_in_order, open_cache, MERGE_HOLD_MAX,
+    diff_manifest, generate_summary, load_manifest, JsonlReportWriter, SummaryBuilder
+)
+from finspect.detect import detect_file
+from finspect.htmlreport import HtmlReportWriter
+from finspect.limits import Ceilings
+from finspect import serialize
+from finspect.models import DetectionResult, EntryResult
 
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -41,6 +54,55 @@ class TestArgParsing:
         sys.argv = ['finspect', 'test.zip', '--max-depth', '2']
         args = parse_args()
         assert args.max_depth == 2
+    
+    def test_timeout_options(self):
+        sys.argv = ['finspect', 'dir', '--timeout', '100', '--entry-timeout', '10',
+                    '--run-timeout', '5000']
+        args = parse_args()
+        assert (args.timeout, args.entry_timeout, args.run_timeout) == (100, 10, 5000)
+    
+    def test_jobs_option(self):
+        sys.argv = ['finspect', 'dir', '--jobs', '4']
+        args = parse_args()
+        assert args.jobs == 4
+    
+    def test_text_sample_option(self):
+        sys.argv = ['finspect', 'test.txt', '--text-sample', '4096']
+        args = parse_args()
+        assert args.text_sample == 4096
+
+
+def _make_tree(root: Path) -> None:
+    (root / "sub").mkdir()
+    (root / ".hidden_dir").mkdir()
+    (root / "b.txt").write_text("plain text\n")
+    (root / "a.pdf").write_bytes(b"%PDF-1.5\n")
+    (root / ".hidden.txt").write_text("hidden\n")
+    (root / "sub" / "c.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+    (root / ".hidden_dir" / "d.txt").write_text("hidden\n")
+
+
+class TestDirectoryProcessing:
+    """Test directory walking and processing."""
+    
+    def test_walk_is_sorted_and_skips_hidden(self, tmp_path):
+        _make_tree(tmp_path)
+        files = [p.relative_to(tmp_path).as_posix() for p in iter_directory(tmp_path, recursive=True)]
+        assert files == ["a.pdf", "b.txt", "sub/c.png"]
+    
+    def test_walk_non_recursive_include_hidden(self, tmp_path):
+        _make_tree(tmp_path)
+        files = [p.name for p in iter_directory(tmp_path, include_hidden=True)]
+        assert files == [".hidden.txt", "a.pdf", "b.txt"]
+    
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_process_directory_jobs(self, tmp_path, jobs):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q', '--jobs', jobs]
+        args = parse_args()
+        results = process_directory(tmp_path, args, Ceilings())
+        assert [r['relative_path'] for r in results] == ["a.pdf", "b.txt", str(Path("sub/c.png"))]
+        assert [r['media_type'] for r in results] == ['application/pdf', 'text/plain', 'image/png']
 
 
 class TestExitCodes:
@@ -78,6 +140,462 @@ class TestExitCodes:
         assert determine_exit_code(result, strict=True) == 6
 
 
+class TestIncrementalScan:
+    """Test --since-manifest re-scans."""
+    
+    def test_rescan_diff(self, tmp_path):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q']
+        args = parse_args()
+        first = process_directory(tmp_path, args, Ceilings())
+        previous = {r['relative_path']: r for r in json.loads(json.dumps(first))}
+        
+        (tmp_path / "b.txt").write_bytes(b"%PDF-1.5\n")
+        os.utime(tmp_path / "b.txt", ns=(1, 1))
+        (tmp_path / "a.pdf").unlink()
+        (tmp_path / "e.txt").write_text("new file\n")
+        
+        results = process_directory(tmp_path, args, Ceilings(), previous=previous)
+        assert [r['relative_path'] for r in results] == ["b.txt", "e.txt", str(Path("sub/c.png"))]
+        
+        diff = diff_manifest(previous, results)
+        assert diff["new"] == ["e.txt"]
+        assert diff["changed"] == ["b.txt"]
+        assert diff["removed"] == ["a.pdf"]
+        assert diff["type_changed"] == [{
+            "path": "b.txt", "old_media_type": "text/plain", "new_media_type": "application/pdf"
+        }]
+        assert diff["unchanged"] == 1
+    
+    def test_manifest_without_mtimes(self, tmp_path):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q']
+        args = parse_args()
+        first = process_directory(tmp_path, args, Ceilings())
+        for record in first:
+            del record['mtime_ns']
+        previous = {r['relative_path']: r for r in json.loads(json.dumps(first))}
+        
+        diff = diff_manifest(previous, process_directory(tmp_path, args, Ceilings(), previous=previous))
+        assert (diff["new"], diff["changed"], diff["unchanged"]) == ([], [], len(first))
+    
+    def test_cli_writes_diff_report(self, tmp_path):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q']
+        first = process_directory(tmp_path, parse_args(), Ceilings())
+        manifest = tmp_path.parent / f"{tmp_path.name}_manifest.json"
+        manifest.write_text(json.dumps({"results": first}))
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q',
+                    '--report-format', 'json', '--since-manifest', str(manifest)]
+        assert main() == 0
+        diffs = list(tmp_path.glob("finspect_diff_*.json"))
+        assert len(diffs) == 1
+        assert json.loads(diffs[0].read_text())["removed"] == []
+
+
+class TestRunTimeout:
+    """Test the whole-run deadline."""
+    
+    def test_expired_run_deadline_exits_with_timeout(self, tmp_path):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q',
+                    '--report-format', 'json', '--run-timeout', '0']
+        assert main() == 5
+
+
+class TestJsonlReport:
+    """Test streaming JSON Lines reports."""
+    
+    def test_cli_jsonl_report(self, tmp_path):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q', '--report-format', 'jsonl']
+        assert main() == 0
+        reports = list(tmp_path.glob("finspect_report_*.jsonl"))
+        assert len(reports) == 1
+        
+        records = [json.loads(line) for line in reports[0].read_text().splitlines()]
+        assert records[0]["record"] == "header"
+        assert records[-1]["record"] == "summary"
+        results = records[1:-1]
+        assert [r["relative_path"] for r in results] == ["a.pdf", "b.txt", str(Path("sub/c.png"))]
+        summary = {k: v for k, v in records[-1].items() if k != "record"}
+        assert summary == generate_summary(results)
+    
+    def test_relative_directory_skips_own_report(self, tmp_path, monkeypatch):
+        _make_tree(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        for report_format, pattern in (('jsonl', '*.jsonl'), ('html', '*.html')):
+            sys.argv = ['finspect', '.', '-r', '--no-libmagic', '-q', '--report-format', report_format]
+            assert main() == 0
+            report = next(tmp_path.glob(f"finspect_report_{pattern}"))
+            text = report.read_text(encoding='utf-8')
+            assert report.name not in text
+            report.unlink()
+    
+    def test_summary_by_type_and_category(self):
+        summary = generate_summary([
+            {"media_type": "application/pdf", "confidence": 100},
+            {"media_type": "image/png", "confidence": 100},
+            {"media_type": "application/pdf", "confidence": 60, "errors": ["x"]},
+        ])
+        assert summary["by_type"] == {"application/pdf": 2, "image/png": 1}
+        assert summary["by_category"] == {"document": 2, "image": 1}
+        assert (summary["total_files"], summary["errors"], summary["low_confidence"]) == (3, 1, 1)
+    
+    def test_lines_written_before_close(self, tmp_path):
+        writer = JsonlReportWriter(tmp_path, timestamp="test")
+        writer.write({"relative_path": "a.txt", "media_type": "text/plain", "confidence": 90})
+        assert len(writer.path.read_text().splitlines()) == 2
+        writer.close()
+        assert len(writer.path.read_text().splitlines()) == 3
+    
+    def test_jsonl_report_as_manifest(self, tmp_path):
+        with JsonlReportWriter(tmp_path, timestamp="test") as writer:
+            writer.write({"relative_path": "a.txt", "media_type": "text/plain"})
+        assert list(load_manifest(writer.path)) == ["a.txt"]
+
+
+class TestHtmlReport:
+    """Test streaming, paginated HTML reports."""
+    
+    def test_cli_html_report(self, tmp_path):
+        _make_tree(tmp_path)
+        sys.argv = ['finspect', str(tmp_path), '-r', '--no-libmagic', '-q', '--report-format', 'both']
+        assert main() == 0
+        html_reports = list(tmp_path.glob("finspect_report_*.html"))
+        json_reports = list(tmp_path.glob("finspect_report_*.json"))
+        assert len(html_reports) == len(json_reports) == 1
+        
+        report = json.loads(json_reports[0].read_text())
+        assert [r["relative_path"] for r in report["results"]] == ["a.pdf", "b.txt", str(Path("sub/c.png"))]
+        assert report["summary"] == generate_summary(report["results"])
+        html = html_reports[0].read_text()
+        assert html.index("a.pdf") < html.index("b.txt") < html.index('id="summary"')
+        assert html.rstrip().endswith("</html>")
+    
+    def test_rows_written_before_close(self, tmp_path):
+        writer = HtmlReportWriter(tmp_path, timestamp="test")
+        writer.write({"relative_path": "a.txt", "media_type": "text/plain", "confidence": 90})
+        writer._file.flush()
+        assert "a.txt" in writer.path.read_text()
+        writer.close({"total_files": 1, "by_type": {"text/plain": 1}, "errors": 0,
+                      "containers": 0, "high_confidence": 1})
+        assert "Total Files" in writer.path.read_text()
+    
+    def test_pagination_and_summary(self, tmp_path):
+        results = [{"relative_path": f"{i:02d}.txt", "media_type": "text/plain", "confidence": 90}
+                   for i in range(5)]
+        with HtmlReportWriter(tmp_path, timestamp="test", page_rows=2,
+                              summary=SummaryBuilder()) as writer:
+            for result in results:
+                writer.write(result)
+        
+        assert [p.name for p in writer.paths] == [
+            "finspect_report_test.html", "finspect_report_test_page2.html", "finspect_report_test_page3.html"
+        ]
+        pages = [p.read_text() for p in writer.paths]
+        assert [page.count(".txt</td>") for page in pages] == [2, 2, 1]
+        assert 'href="finspect_report_test_page2.html"' in pages[0]
+        assert 'href="finspect_report_test.html"' in pages[1]
+        assert '<div class="number">5</div>' in pages[0]
+        assert pages[0].count('id="summary"') == 1 and 'id="summary"' not in pages[2]
+        assert all(page.rstrip().endswith("</html>") for page in pages)
+    
+    def test_escapes_paths_and_errors(self, tmp_path):
+        with HtmlReportWriter(tmp_path, timestamp="test") as writer:
+            writer.write({"relative_path": "<script>.txt", "media_type": "text/plain",
+                          "error": "bad & <worse>"})
+        html = writer.path.read_text()
+        assert "<script>" not in html
+        assert "&lt;script&gt;.txt" in html and "bad &amp; &lt;worse&gt;" in html
+
+
+class TestDetectionCache:
+    """Test the persistent detection cache."""
+    
+    def test_hit_after_put(self, tmp_path):
+        target = tmp_path / "a.pdf"
+        target.write_bytes(b"%PDF-1.5\n")
+        with DetectionCache(tmp_path / "cache.db", "fp") as cache:
+            key = cache.key_for(target)
+            assert cache.get(key, target) is None
+            cache.put(key, detect_file(target, use_libmagic=False))
+            cached = cache.get(key, target)
+            assert cached.media_type == 'application/pdf'
+            assert cache.stats() == {"hits": 1, "misses": 1}
+    
+    def test_modified_file_misses(self, tmp_path):
+        target = tmp_path / "a.txt"
+        target.write_text("one\n")
+        with DetectionCache(tmp_path / "cache.db", "fp") as cache:
+            cache.put(cache.key_for(target), detect_file(target, use_libmagic=False))
+            target.write_text("one two three\n")
+            assert cache.get(cache.key_for(target), target) is None
+    
+    def test_hash_mode_is_content_addressed(self, tmp_path):
+        first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+        first.write_bytes(b"%PDF-1.5\n")
+        second.write_bytes(b"%PDF-1.5\n")
+        with DetectionCache(tmp_path / "cache.db", "fp", hash_mode=True) as cache:
+            cache.put(cache.key_for(first), detect_file(first, use_libmagic=False))
+            cached = cache.get(cache.key_for(second), second)
+            assert cached is not None
+            assert cached.path == str(second)
+    
+    def test_fingerprint_change_invalidates(self, tmp_path):
+        target = tmp_path / "a.pdf"
+        target.write_bytes(b"%PDF-1.5\n")
+        with DetectionCache(tmp_path / "cache.db", "v1") as cache:
+            cache.put(cache.key_for(target), detect_file(target, use_libmagic=False))
+        with DetectionCache(tmp_path / "cache.db", "v1") as cache:
+            assert len(cache) == 1
+        with DetectionCache(tmp_path / "cache.db", "v2") as cache:
+            assert len(cache) == 0
+    
+    def test_entry_timeouts_are_not_cached(self, tmp_path):
+        target = tmp_path / "a.zip"
+        target.write_bytes(b"PK\x03\x04")
+        result = DetectionResult(path=str(target), media_type="application/zip", entries=[
+            EntryResult(name="inner.zip", media_type="application/zip", confidence=100, entries=[
+                EntryResult(name="slow.bin", media_type="", confidence=0, error="Entry timeout after 5 ms")
+            ])
+        ])
+        with DetectionCache(tmp_path / "cache.db", "fp") as cache:
+            cache.put(cache.key_for(target), result)
+            assert len(cache) == 0
+    
+    def test_timeouts_keep_cache(self, tmp_path):
+        target = tmp_path / "a.pdf"
+        target.write_bytes(b"%PDF-1.5\n")
+        
+        def open_with_timeouts(ms):
+            sys.argv = ['finspect', str(target), '--cache', str(tmp_path / "cache.db")]
+            return open_cache(parse_args(), Ceilings(timeout_ms=ms, entry_timeout_ms=ms, run_timeout_ms=ms))
+        
+        with open_with_timeouts(100) as cache:
+            cache.put(cache.key_for(target), detect_file(target, use_libmagic=False))
+        with open_with_timeouts(200) as cache:
+            assert len(cache) == 1
+    
+    def test_cli_unusable_cache(self, tmp_path, capsys):
+        target = tmp_path / "a.pdf"
+        target.write_bytes(b"%PDF-1.5\n")
+        not_sqlite = tmp_path / "notes.txt"
+        not_sqlite.write_text("not a database\n" * 100)
+        for cache_path in (tmp_path / "missing" / "cache.db", not_sqlite):
+            for path in (target, tmp_path):
+                sys.argv = ['finspect', str(path), '--no-libmagic', '-q', '--cache', str(cache_path)]
+                assert main() == 2
+                assert capsys.readouterr().err.startswith(f"Error: Cannot open cache '{cache_path}'")
+    
+    def test_lru_eviction(self, tmp_path):
+        with DetectionCache(tmp_path / "cache.db", "fp", max_entries=2) as cache:
+            for i in range(3):
+                path = tmp_path / f"f{i}.txt"
+                path.write_text(f"file {i}\n")
+                cache.put(cache.key_for(path), detect_file(path, use_libmagic=False))
+            cache.get(cache.key_for(tmp_path / "f0.txt"), tmp_path / "f0.txt")
+            assert cache.evict() == 1
+            assert cache.get(cache.key_for(tmp_path / "f0.txt"), tmp_path / "f0.txt") is not None
+            assert cache.get(cache.key_for(tmp_path / "f1.txt"), tmp_path / "f1.txt") is None
+    
+    def test_cached_detections_keep_order(self, tmp_path):
+        _make_tree(tmp_path)
+        files = list(iter_directory(tmp_path, recursive=True))
+        detect = lambda paths: (detect_file(p, use_libmagic=False) for p in paths)
+        with DetectionCache(tmp_path / ".cache.db", "fp") as cache:
+            cache.put(cache.key_for(files[1]), detect_file(files[1], use_libmagic=False))
+            results = list(cached_detections(files, detect, cache))
+            assert [r.path for r in results] == [str(p) for p in files]
+            assert cache.stats() == {"hits": 1, "misses": 2}
+    
+    def test_merge_in_order_streams_hits(self):
+        looked_up = []
+        
+        def lookup(item):
+            looked_up.append(item)
+            return None if item % 500 == 0 else f"hit {item}"
+        
+        # An eager detect() reads all of its input before yielding anything
+        eager = lambda items: [f"miss {item}" for item in items]
+        merged = merge_in_order(range(1, 2001), eager, lookup)
+        assert next(merged) == "hit 1" and len(looked_up) == 1
+        
+        looked_up.clear()
+        merged = merge_in_order(range(2001), eager, lookup)
+        assert next(merged) == "miss 0"
+        assert len(looked_up) <= MERGE_HOLD_MAX + 1
+        rest = list(merged)
+        assert rest == [f"miss {i}" if i % 500 == 0 else f"hit {i}" for i in range(1, 2001)]
+
+
+class TestSerialize:
+    """Test the pluggable JSON serializer."""
+    
+    DATA = {
+        "path": "caf\u00e9/\"quoted\".txt",
+        "sizes": [0, -1, 2.5, float("inf")],
+        "flags": {"ok": True, "missing": None, "empty": {}, "none": []},
+        1: "int key",
+    }
+    
+    def _result(self):
+        entries = [
+            EntryResult(name="docs/", media_type="", confidence=0, is_directory=True),
+            EntryResult(name="docs/a.pdf", media_type="application/pdf", confidence=100),
+        ]
+        result = DetectionResult(path="a.zip", is_container=True, entries=entries,
+                                 media_type="application/zip", confidence=100)
+        result.sources["magic_bytes"] = "504b0304"
+        return result
+    
+    def test_indented_matches_stdlib(self):
+        assert serialize.dumps(self.DATA, backend='json') == json.dumps(self.DATA, indent=2)
+        result = self._result()
+        assert serialize.dumps(result, backend='json') == json.dumps(result.to_dict(), indent=2)
+    
+    def test_compact(self):
+        text = serialize.dumps({"report": [self._result()]}, compact=True, backend='json')
+        assert "\n" not in text and ", " not in text
+        assert json.loads(text) == {"report": [self._result().to_dict()]}
+    
+    def test_default_backend_round_trips(self):
+        result = self._result()
+        assert json.loads(serialize.dumps(result)) == result.to_dict()
+        buf = StringIO()
+        serialize.dump([result], buf)
+        assert json.loads(buf.getvalue()) == [result.to_dict()]
+    
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            serialize.dumps({}, backend='yaml')
+        with pytest.raises(TypeError):
+            serialize.dumps({"x": object()}, backend='json')
+    
+    def test_undecodable_filenames(self, tmp_path):
+        name = os.fsdecode(b'bad\xffname.txt')
+        for backend in serialize.BACKENDS:
+            if backend == 'json' or getattr(serialize, f"HAS_{backend.upper()}"):
+                for compact in (False, True):
+                    text = serialize.dumps({"path": name}, compact=compact, backend=backend)
+                    assert json.loads(text) == {"path": name}
+        
+        if sys.platform == 'win32':
+            return
+        (tmp_path / name).write_bytes(b'plain text\n')
+        for args in ([str(tmp_path / name), '--json'], [str(tmp_path), '--report-format', 'json']):
+            result = subprocess.run([sys.executable, '-m', 'finspect.cli', *args, '--no-libmagic'],
+                                    capture_output=True, text=True)
+            assert result.returncode == 0, result.stderr
+        report = next(tmp_path.glob("finspect_report_*.json"))
+        assert json.loads(report.read_text(encoding='utf-8'))['results'][0]['path'].endswith(name)
+    
+    def test_compact_cli_output(self):
+        cmd = [sys.executable, '-m', 'finspect.cli', str(FIXTURES_DIR / "sample.pdf"),
+               '--json', '--compact', '--no-libmagic']
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        assert result.stdout.count("\n") == 1
+        assert json.loads(result.stdout)["media_type"] == "application/pdf"
+
+
+@pytest.fixture
+def detection_server(tmp_path):
+    from finspect.server import DetectionServer
+    options = {
+        'max_bytes': 8192, 'max_depth': 1, 'use_libmagic': False, 'follow_symlinks': False,
+        'ceilings': Ceilings(), 'zip_metadata_first': False,
+    }
+    server = DetectionServer(str(tmp_path / "finspect.sock"), options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Requires Unix sockets")
+class TestServer:
+    """Test the detection daemon and its client."""
+    
+    def test_path_fd_and_bytes_requests(self, detection_server):
+        zip_path = FIXTURES_DIR / "archive.zip"
+        with FinspectClient(detection_server.server_address) as client:
+            by_path = client.detect_file(str(zip_path))
+            with open(zip_path, 'rb') as f:
+                by_fd = client.detect_fd(f.fileno(), name="upload.zip")
+            by_bytes = client.detect_bytes(zip_path.read_bytes())
+            
+            read_end, write_end = os.pipe()
+            os.write(write_end, b"plain text\n")
+            os.close(write_end)
+            try:
+                by_pipe = client.detect_fd(read_end)
+            finally:
+                os.close(read_end)
+        
+        assert by_path == json.loads(serialize.dumps(detect_file(zip_path, use_libmagic=False)))
+        assert by_fd["path"] == "upload.zip"
+        for result in (by_fd, by_bytes):
+            assert result["media_type"] == "application/zip"
+            assert [e["name"] for e in result["entries"]] == [e["name"] for e in by_path["entries"]]
+        assert by_pipe["media_type"] == "text/plain"
+    
+    def test_errors_keep_connection(self, detection_server):
+        with FinspectClient(detection_server.server_address) as client:
+            with pytest.raises(RuntimeError, match="Unknown options"):
+                client.detect_file(str(FIXTURES_DIR / "sample.pdf"), bogus=True)
+            assert client.detect_file("/does/not/exist")["errors"] == ["File not found"]
+            assert client.detect_file(str(FIXTURES_DIR / "sample.pdf"), max_depth=0)["media_type"] == "application/pdf"
+    
+    def test_rejected_inline_body_is_not_parsed_as_requests(self, detection_server):
+        # A body that is itself a well-formed frame must not run as a request
+        smuggled = json.dumps({'path': str(FIXTURES_DIR / "sample.txt")}).encode()
+        body = len(smuggled).to_bytes(4, 'big') + smuggled
+        with FinspectClient(detection_server.server_address) as client:
+            with pytest.raises(RuntimeError, match="Unknown options"):
+                client.detect_bytes(body, bogus=True)
+            result = client.detect_bytes((FIXTURES_DIR / "sample.pdf").read_bytes())
+            assert result["media_type"] == "application/pdf"
+    
+    @pytest.mark.parametrize("frame", [
+        (MAX_MESSAGE + 1).to_bytes(4, 'big'), b"\0\0\0\3[1]", b"\0\0\0\3{x}",
+    ])
+    def test_rejected_message_closes_passed_fds(self, frame):
+        left, right = socket.socketpair()
+        read_end, write_end = os.pipe()
+        try:
+            socket.send_fds(left, [frame], [write_end])
+            os.close(write_end)
+            left.close()
+            with pytest.raises(ValueError):
+                recv_message(right, max_fds=1)
+            # With every write end closed, the pipe reads EOF instead of blocking
+            os.set_blocking(read_end, False)
+            assert os.read(read_end, 1) == b""
+        finally:
+            right.close()
+            os.close(read_end)
+    
+    def test_concurrent_clients(self, detection_server):
+        results = {}
+        
+        def run(name):
+            with FinspectClient(detection_server.server_address) as client:
+                results[name] = [client.detect_file(str(FIXTURES_DIR / name))["media_type"] for _ in range(20)]
+        
+        names = ["sample.pdf", "sample.png", "sample.txt", "archive.zip"]
+        threads = [threading.Thread(target=run, args=(name,)) for name in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert {name: set(types) for name, types in results.items()} == {
+            "sample.pdf": {"application/pdf"}, "sample.png": {"image/png"},
+            "sample.txt": {"text/plain"}, "archive.zip": {"application/zip"},
+        }
+
+
 class TestCLIIntegration:
     """Test CLI integration."""
     
@@ -109,9 +627,42 @@ class TestCLIIntegration:
             except json.JSONDecodeError:
                 pytest.fail("Invalid JSON output")
     
+    def test_cli_text_sample(self, tmp_path):
+        """Test that --text-sample widens the text heuristic's window."""
+        target = tmp_path / "padded.bin"
+        target.write_bytes(b'A' * 1000 + b'\x00' * 1000)
+        for extra, expected in (([], 'text/plain'), (['--text-sample', '2000'], 'application/octet-stream')):
+            cmd = [sys.executable, '-m', 'finspect.cli', str(target), '--json', '--no-libmagic', *extra]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            assert json.loads(result.stdout)['media_type'] == expected
+    
     @pytest.mark.skipif(not FIXTURES_DIR.exists(), reason="Fixtures not created")
     def test_cli_nonexistent_file(self):
         """Test CLI with non-existent file."""
         cmd = [sys.executable, '-m', 'finspect.cli', '/does/not/exist.txt']
         result = subprocess.run(cmd, capture_output=True, text=True)
-        assert result.returncode == 2  # File not found
\ No newline at end of file
+        assert result.returncode == 2  # File not found
+    
+    @pytest.mark.skipif(not FIXTURES_DIR.exists(), reason="Fixtures not created")
+    def test_cli_profile(self, tmp_path):
+        """Test --profile stage breakdown and Chrome trace output."""
+        trace_path = tmp_path / "trace.json"
+        cmd = [sys.executable, '-m', 'finspect.cli', str(FIXTURES_DIR / "archive.zip"), '--json',
+               '--no-libmagic', '--profile', '--profile-trace', str(trace_path)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        assert result.returncode == 0
+        assert json.loads(result.stdout)['media_type'] == 'application/zip'
+        assert 'zip_read' in result.stderr and 'Winning sources' in result.stderr
+        events = json.loads(trace_path.read_text())['traceEvents']
+        assert 'detect_file' in {e['name'] for e in events}
+
+    def test_cli_import_is_lazy(self):
+        """Test that importing the CLI does not load modules only some runs need."""
+        code = (
+            "import sys, finspect.cli; "
+            "print(' '.join(m for m in ('concurrent.futures', 'json', 'sqlite3', 'zipfile', 'magic') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        assert result.returncode == 0
+        assert result.stdout.strip() == ''
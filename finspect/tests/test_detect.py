@@ -1,10 +1,28 @@
 """Tests for detection module."""
 
+import asyncio
+import json
+import os
+import pickle
+import random
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pathlib import Path
 
-from finspect.detect import detect_file, detect_buffer, _check_magic_bytes, _is_text_content
-from finspect.models import MimeGuess
+from finspect import aio, detect, trace
+from finspect.detect import (
+    detect_file, detect_buffer, detect_many, _check_magic_bytes, _is_text_content, MagicPool,
+    SignatureIndex
+)
+from finspect.mediatypes import MEDIA_TYPES, MediaTypeRegistry, category_for
+from finspect.limits import Ceilings, Deadline
+from finspect.models import DetectionResult, EntryResult, EntryTable, MimeGuess, ENTRY_TABLE_MIN
+from finspect.zipscan import inspect_zip
+from finspect.tarscan import inspect_gzip, inspect_tar
+from finspect.structured import sniff_structured
 
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
@@ -40,6 +58,69 @@ class TestMagicBytes:
     def test_unknown_bytes(self):
         result = _check_magic_bytes(b'\x00\x01\x02\x03')
         assert result is None
+    
+    def test_bom_detection(self):
+        result = _check_magic_bytes(b'\xef\xbb\xbfHello')
+        assert result is not None
+        assert result.media_type == 'text/plain'
+        assert result.source == 'bom'
+    
+    def test_wav_detection(self):
+        result = _check_magic_bytes(b'RIFF\x24\x00\x00\x00WAVEfmt ')
+        assert result is not None
+        assert result.media_type == 'audio/wav'
+        assert result.magic_bytes == 'RIFF...WAVE'
+    
+    def test_webp_detection(self):
+        result = _check_magic_bytes(b'RIFF\x24\x00\x00\x00WEBPVP8 ')
+        assert result is not None
+        assert result.media_type == 'image/webp'
+    
+    def test_mp4_detection(self):
+        result = _check_magic_bytes(b'\x00\x00\x00\x18ftypisom\x00\x00')
+        assert result is not None
+        assert result.media_type == 'video/mp4'
+    
+    def test_heic_detection(self):
+        result = _check_magic_bytes(b'\x00\x00\x00\x18ftypheic\x00\x00')
+        assert result is not None
+        assert result.media_type == 'image/heic'
+    
+    def test_tar_detection(self):
+        data = b'file.txt'.ljust(257, b'\x00') + b'ustar\x0000'
+        result = _check_magic_bytes(data)
+        assert result is not None
+        assert result.media_type == 'application/x-tar'
+        assert result.magic_bytes == 'ustar@257'
+    
+    def test_print_formats(self):
+        assert _check_magic_bytes(b'%!PS-Adobe-3.0\n').media_type == 'application/postscript'
+        assert _check_magic_bytes(b'II*\x00\x08\x00').media_type == 'image/tiff'
+        assert _check_magic_bytes(b'MM\x00*\x00\x00').media_type == 'image/tiff'
+        assert _check_magic_bytes(b'\x1b%-12345X@PJL\n').media_type == 'application/vnd.hp-pcl'
+
+
+class TestSignatureIndex:
+    """Test the compiled signature index."""
+    
+    def test_first_added_wins(self):
+        index = SignatureIndex()
+        index.add(((0, b'AB'),), 'x/first', 'First', 90, 'magic_bytes', 'AB')
+        index.add(((0, b'ABC'),), 'x/second', 'Second', 90, 'magic_bytes', 'ABC')
+        assert index.match(b'ABCD').media_type == 'x/first'
+    
+    def test_compound_rule_outranks_prefix(self):
+        index = SignatureIndex()
+        index.add(((0, b'AB'),), 'x/plain', 'Plain', 90, 'magic_bytes', 'AB')
+        index.add(((0, b'AB'), (4, b'CD')), 'x/compound', 'Compound', 95, 'magic_bytes', 'AB..CD')
+        assert index.match(b'AB__CD').media_type == 'x/compound'
+        assert index.match(b'AB__XX').media_type == 'x/plain'
+    
+    def test_offset_beyond_data(self):
+        index = SignatureIndex()
+        index.add(((100, b'X'),), 'x/far', 'Far', 90, 'magic_bytes', 'X@100')
+        assert index.match(b'short') is None
+        assert len(index) == 1
 
 
 class TestTextDetection:
@@ -59,6 +140,103 @@ class TestTextDetection:
         is_text, confidence = _is_text_content(data)
         assert is_text is True
         assert confidence < 90
+    
+    def test_parity_with_per_byte_loop(self):
+        rng = random.Random(42)
+        for _ in range(500):
+            binary_share = rng.random()
+            data = bytes(
+                rng.randrange(256) if rng.random() < binary_share else rng.randrange(0x20, 0x7F)
+                for _ in range(rng.randrange(0, 1500))
+            )
+            assert _is_text_content(data) == _reference_is_text(data)
+    
+    def test_del_bytes_are_ignored(self):
+        assert _is_text_content(b'\x7f' * 10) == (False, 0)
+        assert _is_text_content(b'\x7f' * 10 + b'text') == (True, 90)
+    
+    def test_sample_window(self):
+        data = b'A' * 1000 + b'\x00' * 1000
+        assert _is_text_content(data) == (True, 90)
+        assert _is_text_content(data, sample_size=2000) == (False, 0)
+    
+    def test_text_sample_option(self, tmp_path):
+        data = b'A' * 1000 + b'\x00' * 1000
+        target = tmp_path / "padded.bin"
+        target.write_bytes(data)
+        assert detect_buffer(data, use_libmagic=False).media_type == 'text/plain'
+        assert detect_buffer(data, use_libmagic=False, text_sample=2000).media_type == 'application/octet-stream'
+        assert detect_file(target, use_libmagic=False).media_type == 'text/plain'
+        assert detect_file(target, use_libmagic=False, text_sample=2000).media_type == 'application/octet-stream'
+    
+    def test_numpy_parity(self, monkeypatch):
+        pytest.importorskip('numpy')
+        monkeypatch.setattr(detect, 'NUMPY_MIN_SAMPLE', 0)
+        rng = random.Random(7)
+        for _ in range(100):
+            data = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 1500)))
+            assert _is_text_content(data) == _reference_is_text(data)
+
+
+def _reference_is_text(data: bytes):
+    """Per-byte loop the table-driven classifier must agree with."""
+    if not data:
+        return False, 0
+    printable = non_printable = 0
+    for byte in data[:1000]:
+        if 0x20 <= byte <= 0x7E or byte in (0x09, 0x0A, 0x0D):
+            printable += 1
+        elif byte < 0x20 or byte > 0x7F:
+            non_printable += 1
+    total = printable + non_printable
+    if total == 0:
+        return False, 0
+    ratio = printable / total
+    if ratio > 0.95:
+        return True, 90
+    elif ratio > 0.80:
+        return True, 75
+    elif ratio > 0.60:
+        return True, 60
+    return False, 0
+
+
+class TestStructuredText:
+    """Test structured text sniffing."""
+    
+    def test_large_json_truncated_prefix(self):
+        data = json.dumps({"items": [{"id": i, "name": "x" * 20} for i in range(2000)]}).encode()
+        result = detect_buffer(data[:8192], use_libmagic=False)
+        assert result.media_type == 'application/json'
+    
+    def test_complete_json(self):
+        result = sniff_structured(b'  {"a": [1, 2.5e3, true, null, "q\\"x"]}\n')
+        assert result.media_type == 'application/json'
+        assert result.confidence == 90
+    
+    def test_invalid_json(self):
+        assert sniff_structured(b'{"a" 1}') is None
+        assert sniff_structured(b'[1, 2] trailing') is None
+    
+    def test_ndjson(self):
+        result = sniff_structured(b'{"a": 1}\n{"a": 2}\n{"a": 3}\n')
+        assert result.media_type == 'application/x-ndjson'
+    
+    def test_xml(self):
+        assert sniff_structured(b'<?xml version="1.0"?><r/>').media_type == 'application/xml'
+        assert sniff_structured(b'<root><a/></root>').media_type == 'application/xml'
+    
+    def test_yaml(self):
+        assert sniff_structured(b'%YAML 1.2\n---\na: 1\n').media_type == 'application/yaml'
+        assert sniff_structured(b'---\nname: test\n').media_type == 'application/yaml'
+    
+    def test_csv_and_tsv(self):
+        assert sniff_structured(b'a,b,c\n1,2,3\n4,5,6\n').media_type == 'text/csv'
+        assert sniff_structured(b'a\tb\n1\t2\n').media_type == 'text/tab-separated-values'
+        assert sniff_structured(b'a,b\n1,2,3\n') is None
+    
+    def test_plain_text(self):
+        assert sniff_structured(b'Just some words.\nAnd more words.\n') is None
 
 
 class TestFileDetection:
@@ -112,6 +290,48 @@ class TestFileDetection:
         result = detect_file("/path/that/does/not/exist", use_libmagic=False)
         assert len(result.errors) > 0
         assert "not found" in result.errors[0].lower()
+    
+    def test_mtime_from_detection_stat(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_text("plain text\n")
+        result = detect_file(path, use_libmagic=False)
+        assert result.mtime_ns == os.stat(path).st_mtime_ns
+        assert "mtime_ns" not in result.to_dict()
+        assert DetectionResult.from_record(result.to_record()) == result
+    
+    def test_symlinks(self, tmp_path):
+        (tmp_path / "link.pdf").symlink_to(FIXTURES_DIR / "sample.pdf")
+        (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+        assert detect_file(tmp_path / "link.pdf", use_libmagic=False).errors == [
+            "Symlink not followed (use --follow-symlinks)"
+        ]
+        followed = detect_file(tmp_path / "link.pdf", use_libmagic=False, follow_symlinks=True)
+        assert followed.media_type == 'application/pdf' and not followed.errors
+        assert detect_file(tmp_path / "dangling", use_libmagic=False).errors == ["File not found"]
+    
+    def test_directory(self, tmp_path):
+        result = detect_file(tmp_path, use_libmagic=False)
+        assert result.errors and result.errors[0].startswith("Cannot read file")
+    
+    def test_read_buffer_is_reused(self, tmp_path):
+        (tmp_path / "a.txt").write_bytes(b"plain text\n" * 100)
+        results = [
+            detect_file(path, use_libmagic=False)
+            for path in (tmp_path / "a.txt", FIXTURES_DIR / "sample.pdf", tmp_path / "a.txt")
+        ]
+        assert [r.media_type for r in results] == ['text/plain', 'application/pdf', 'text/plain']
+        if hasattr(os, 'preadv'):
+            buf = detect._read_buffers.data
+            detect_file(FIXTURES_DIR / "sample.png", use_libmagic=False)
+            assert detect._read_buffers.data is buf
+    
+    def test_large_reads_skip_thread_buffer(self, tmp_path):
+        path = tmp_path / "big.bin"
+        path.write_bytes(b"%PDF-1.7\n" + bytes(detect.READ_BUFFER_MAX))
+        result = detect_file(path, use_libmagic=False, max_bytes=detect.READ_BUFFER_MAX + 1024,
+                             ceilings=Ceilings(max_bytes_per_file=detect.READ_BUFFER_MAX + 1024))
+        assert result.media_type == 'application/pdf'
+        assert len(getattr(detect._read_buffers, 'data', b'')) <= detect.READ_BUFFER_MAX
 
 
 class TestBufferDetection:
@@ -134,4 +354,737 @@ class TestBufferDetection:
     def test_detect_empty_buffer(self):
         result = detect_buffer(b'', use_libmagic=False)
         assert result.media_type == 'application/octet-stream'
-        assert result.description == 'Empty file'
\ No newline at end of file
+        assert result.description == 'Empty file'
+    
+    def test_detect_memoryview(self):
+        for data in (b'%PDF-1.5\n', b'\x89PNG\r\n\x1a\n', b'plain text\n', b'{"key": "value"}',
+                     b'\x00' * 257 + b'ustar\x00'):
+            assert detect_buffer(memoryview(data), use_libmagic=False) == detect_buffer(data, use_libmagic=False)
+        assert detect.container_kind('application/octet-stream', memoryview(b'PK\x03\x04')) == 'zip'
+    
+    def test_detect_bytes_inspects_containers(self):
+        data = (FIXTURES_DIR / "archive.zip").read_bytes()
+        shallow = detect.detect_bytes(data, use_libmagic=False)
+        assert shallow.is_container and not shallow.entries
+        for buf in (data, memoryview(data)):
+            result = detect.detect_bytes(buf, use_libmagic=False, max_bytes=512, max_depth=1)
+            assert result.size_bytes == len(data)
+            assert [e.name for e in result.entries] == ["test.txt", "sample.pdf", "sample.png"]
+
+class TestDetectMany:
+    """Test batch detection."""
+    
+    ITEMS = [b'%PDF-1.5\n', b'\x89PNG\r\n\x1a\n', b'plain text\n', b'{"a": 1}'] * 5
+    
+    def test_ordered_threads(self):
+        results = list(detect_many(self.ITEMS, workers=4, use_libmagic=False))
+        expected = [detect_buffer(item, use_libmagic=False).media_type for item in self.ITEMS]
+        assert [r.media_type for r in results] == expected
+    
+    def test_unordered_threads(self):
+        results = list(detect_many(self.ITEMS, workers=4, ordered=False, use_libmagic=False))
+        assert len(results) == len(self.ITEMS)
+        assert sorted(r.media_type for r in results) == sorted(
+            detect_buffer(item, use_libmagic=False).media_type for item in self.ITEMS
+        )
+    
+    def test_process_mode_with_paths(self):
+        paths = [FIXTURES_DIR / "sample.pdf", FIXTURES_DIR / "sample.png"]
+        results = list(detect_many(paths, workers=2, mode='process', use_libmagic=False))
+        assert [r.media_type for r in results] == ['application/pdf', 'image/png']
+        assert results[0].path == str(paths[0])
+    
+    def test_buffers_inspected_like_paths(self):
+        zip_path = FIXTURES_DIR / "archive.zip"
+        data = zip_path.read_bytes()
+        by_path, by_bytes, by_view = detect_many(
+            [zip_path, data, memoryview(bytearray(data))], workers=2, use_libmagic=False
+        )
+        names = [e.name for e in by_path.entries]
+        assert names
+        assert [e.name for e in by_bytes.entries] == names
+        assert [e.name for e in by_view.entries] == names
+        
+        shallow, = detect_many([data], max_depth=0, use_libmagic=False)
+        assert shallow.is_container and not shallow.entries
+    
+    def test_backpressure_limits_submission(self):
+        consumed = []
+        
+        def source():
+            for i, item in enumerate(self.ITEMS):
+                consumed.append(i)
+                yield item
+        
+        stream = detect_many(source(), workers=1, max_pending=2, use_libmagic=False)
+        next(stream)
+        assert len(consumed) <= 3
+        stream.close()
+    
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            list(detect_many([], mode='fiber'))
+
+
+class TestAsyncDetection:
+    """Test the asyncio front end."""
+    
+    ITEMS = TestDetectMany.ITEMS
+    
+    def _collect(self, stream):
+        async def collect():
+            return [result async for result in stream]
+        return asyncio.run(collect())
+    
+    def test_detect_file_matches_sync(self):
+        path = FIXTURES_DIR / "sample.pdf"
+        result = asyncio.run(aio.detect_file(path, use_libmagic=False))
+        assert result.to_dict() == detect_file(path, use_libmagic=False).to_dict()
+    
+    def test_detect_many_ordered(self):
+        results = self._collect(aio.detect_many(self.ITEMS, concurrency=3, use_libmagic=False))
+        expected = [detect_buffer(item, use_libmagic=False).media_type for item in self.ITEMS]
+        assert [r.media_type for r in results] == expected
+    
+    def test_detect_many_async_source_unordered(self):
+        async def uploads():
+            for item in self.ITEMS:
+                await asyncio.sleep(0)
+                yield item
+        
+        results = self._collect(
+            aio.detect_many(uploads(), concurrency=4, ordered=False, use_libmagic=False)
+        )
+        assert sorted(r.media_type for r in results) == sorted(
+            detect_buffer(item, use_libmagic=False).media_type for item in self.ITEMS
+        )
+    
+    def test_results_not_held_by_slow_source(self):
+        async def uploads():
+            for item in self.ITEMS[:3]:
+                yield item
+                await asyncio.sleep(0.2)
+        
+        async def scenario(ordered):
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            stream = aio.detect_many(uploads(), ordered=ordered, use_libmagic=False)
+            return [loop.time() - start async for _ in stream]
+        
+        for ordered in (True, False):
+            arrivals = asyncio.run(scenario(ordered))
+            assert len(arrivals) == 3 and arrivals[0] < 0.15 and arrivals[1] < 0.35
+    
+    def test_semaphore_bounds_in_flight(self):
+        running = []
+        peak = []
+        release = threading.Event()
+        
+        def slow_item(item, options):
+            running.append(item)
+            peak.append(len(running))
+            release.wait(5)
+            running.remove(item)
+            return detect.DetectionResult()
+        
+        async def scenario(detector):
+            tasks = [asyncio.ensure_future(detector.detect_bytes(bytes([i]))) for i in range(6)]
+            await asyncio.sleep(0.1)
+            release.set()
+            await asyncio.gather(*tasks)
+        
+        original = aio._detect_item
+        aio._detect_item = slow_item
+        executor = ThreadPoolExecutor(6)
+        try:
+            asyncio.run(scenario(aio.AsyncDetector(concurrency=2, executor=executor)))
+        finally:
+            aio._detect_item = original
+            executor.shutdown()
+        assert max(peak) == 2
+    
+    def test_cancellation_releases_slot(self):
+        started = threading.Event()
+        release = threading.Event()
+        
+        def blocking_item(item, options):
+            started.set()
+            release.wait(5)
+            return detect.DetectionResult()
+        
+        async def scenario():
+            async with aio.AsyncDetector(concurrency=1) as detector:
+                task = asyncio.ensure_future(detector.detect_bytes(b"x"))
+                queued = asyncio.ensure_future(detector.detect_bytes(b"y"))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                queued.cancel()
+                results = await asyncio.gather(task, queued, return_exceptions=True)
+                release.set()
+                assert all(isinstance(r, asyncio.CancelledError) for r in results)
+                return await detector.detect_bytes(b'%PDF-1.5\n', use_libmagic=False)
+        
+        original = aio._detect_item
+        aio._detect_item = lambda item, options: (
+            blocking_item(item, options) if item in (b"x", b"y") else original(item, options)
+        )
+        try:
+            result = asyncio.run(scenario())
+        finally:
+            aio._detect_item = original
+        assert started.is_set()
+        assert result.media_type == "application/pdf"
+    
+    def test_closing_stream_early(self):
+        async def scenario():
+            stream = aio.detect_many(self.ITEMS, concurrency=2, use_libmagic=False)
+            first = await stream.__anext__()
+            await stream.aclose()
+            return first
+        
+        assert asyncio.run(scenario()).media_type == "application/pdf"
+
+
+def _make_docx(path: Path, parts: int = 3) -> None:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", '<?xml version="1.0"?><Types/>')
+        zf.writestr("word/document.xml", '<?xml version="1.0"?><w:document/>')
+        for i in range(parts):
+            zf.writestr(f"word/part{i}.xml", '<?xml version="1.0"?><part/>')
+        zf.writestr("word/media/image1.png", b'\x89PNG\r\n\x1a\n' + b'\x00' * 32)
+
+
+class TestZipMetadataFirst:
+    """Test the central-directory fast path."""
+    
+    def test_parts_typed_by_name(self, tmp_path):
+        docx = tmp_path / "doc.docx"
+        _make_docx(docx)
+        entries, container_type = inspect_zip(docx, use_libmagic=False, metadata_first=True)
+        assert container_type.endswith('wordprocessingml.document')
+        by_name = {e.name: e for e in entries}
+        assert by_name["word/document.xml"].source == 'name'
+        assert by_name["word/document.xml"].media_type == 'application/xml'
+        assert by_name["word/media/image1.png"].media_type == 'image/png'
+        assert by_name["word/media/image1.png"].source == 'magic_bytes'
+    
+    def test_plain_zip_is_still_sniffed(self):
+        entries, _ = inspect_zip(FIXTURES_DIR / "archive.zip", use_libmagic=False, metadata_first=True)
+        assert all(e.source != 'name' for e in entries)
+    
+    def test_same_container_type_as_default(self, tmp_path):
+        docx = tmp_path / "doc.docx"
+        _make_docx(docx)
+        fast = inspect_zip(docx, use_libmagic=False, metadata_first=True)
+        slow = inspect_zip(docx, use_libmagic=False)
+        assert fast[1] == slow[1]
+        assert [e.name for e in fast[0]] == [e.name for e in slow[0]]
+
+
+class TestZipBackends:
+    """Test in-memory and memory-mapped ZIP inspection."""
+    
+    ZIP_PATH = FIXTURES_DIR / "archive.zip"
+    
+    def _summary(self, entries):
+        return [(e.name, e.media_type, e.size_bytes) for e in entries]
+    
+    def test_mmap_matches_default(self):
+        default, _ = inspect_zip(self.ZIP_PATH, use_libmagic=False, use_mmap=False)
+        mapped, _ = inspect_zip(self.ZIP_PATH, use_libmagic=False, use_mmap=True)
+        assert self._summary(mapped) == self._summary(default)
+    
+    def test_memoryview_input(self):
+        data = self.ZIP_PATH.read_bytes()
+        default, _ = inspect_zip(data, use_libmagic=False)
+        view = memoryview(bytearray(data))
+        from_view, _ = inspect_zip(view, use_libmagic=False)
+        assert self._summary(from_view) == self._summary(default)
+        # The caller's view is still usable afterwards
+        assert bytes(view[:2]) == b'PK'
+    
+    def test_docx_through_mmap(self, tmp_path):
+        docx = tmp_path / "doc.docx"
+        _make_docx(docx)
+        _, container_type = inspect_zip(docx, use_libmagic=False, use_mmap=True)
+        assert container_type.endswith('wordprocessingml.document')
+    
+    def test_invalid_zip_view(self):
+        with pytest.raises(ValueError):
+            inspect_zip(memoryview(b'PK\x03\x04 not really a zip'), use_libmagic=False)
+
+
+class TestZipWorkers:
+    """Test parallel entry sniffing."""
+    
+    def _make_archive(self, path: Path, count: int = 40) -> None:
+        samples = [b'%PDF-1.5\n' * 50, b'\x89PNG\r\n\x1a\n' + b'\x00' * 400, b'plain text\n' * 40]
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("dir/", b"")
+            for i in range(count):
+                zf.writestr(f"dir/entry{i:03d}", samples[i % len(samples)])
+    
+    def _summary(self, entries):
+        return [(e.name, e.media_type, e.error) for e in entries]
+    
+    def test_parallel_matches_serial(self, tmp_path):
+        archive = tmp_path / "many.zip"
+        self._make_archive(archive)
+        serial, _ = inspect_zip(archive, use_libmagic=False)
+        parallel, _ = inspect_zip(archive, use_libmagic=False, workers=4)
+        assert self._summary(parallel) == self._summary(serial)
+    
+    def test_budget_exact_across_workers(self, tmp_path):
+        archive = tmp_path / "many.zip"
+        self._make_archive(archive)
+        ceilings = Ceilings(max_total_sniff_bytes=4000)
+        serial, _ = inspect_zip(archive, use_libmagic=False, ceilings=ceilings)
+        parallel, _ = inspect_zip(archive, use_libmagic=False, ceilings=ceilings, workers=4)
+        assert self._summary(parallel) == self._summary(serial)
+        assert parallel[-1].error == "Budget exceeded"
+    
+    def test_parallel_from_bytes(self, tmp_path):
+        archive = tmp_path / "many.zip"
+        self._make_archive(archive, count=10)
+        serial, _ = inspect_zip(archive.read_bytes(), use_libmagic=False)
+        parallel, _ = inspect_zip(archive.read_bytes(), use_libmagic=False, workers=3)
+        assert self._summary(parallel) == self._summary(serial)
+
+
+def _zip_bytes(members, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    import io
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+class TestNestedContainers:
+    """Test recursive inspection of archives inside archives."""
+    
+    def _nested(self) -> bytes:
+        inner = _zip_bytes({"deep.pdf": b"%PDF-1.4\n" * 20})
+        middle = _zip_bytes({"inner.zip": inner, "note.txt": b"hello\n" * 20})
+        return _zip_bytes({"middle.zip": middle})
+    
+    def test_default_depth_does_not_descend(self):
+        entries, _ = inspect_zip(self._nested(), use_libmagic=False)
+        assert entries[0].media_type == "application/zip"
+        assert entries[0].entries == []
+    
+    def test_tree_follows_depth(self):
+        entries, _ = inspect_zip(self._nested(), use_libmagic=False, max_depth=2)
+        middle = entries[0]
+        assert [e.name for e in middle.entries] == ["inner.zip", "note.txt"]
+        assert middle.entries[0].entries == []
+        
+        entries, _ = inspect_zip(self._nested(), use_libmagic=False, max_depth=3)
+        deep = entries[0].entries[0].entries[0]
+        assert (deep.name, deep.media_type) == ("deep.pdf", "application/pdf")
+        assert entries[0].to_dict()["entries"][0]["entries"][0]["name"] == "deep.pdf"
+    
+    def test_detect_file_uses_max_depth(self, tmp_path):
+        archive = tmp_path / "nested.zip"
+        archive.write_bytes(self._nested())
+        result = detect_file(archive, use_libmagic=False, max_depth=3)
+        assert result.entries[0].entries[0].entries[0].name == "deep.pdf"
+    
+    def test_entry_timeout_bounds_descent(self):
+        entries, _ = inspect_zip(
+            self._nested(), use_libmagic=False, max_depth=3, ceilings=Ceilings(entry_timeout_ms=0)
+        )
+        assert entries[0].error == "Entry timeout after 0 ms"
+        assert entries[0].entries == []
+    
+    def test_entry_budget_is_shared(self):
+        ceilings = Ceilings(max_zip_entries=2)
+        entries, _ = inspect_zip(self._nested(), use_libmagic=False, ceilings=ceilings, max_depth=3)
+        middle = entries[0]
+        assert middle.entries[0].error == "Too many entries"
+        assert [e.name for e in middle.entries[1:]] == ["inner.zip"]
+    
+    def test_byte_budget_is_shared(self):
+        inner = _zip_bytes({f"f{i}.txt": b"text\n" * 200 for i in range(10)})
+        outer = _zip_bytes({"inner.zip": inner})
+        ceilings = Ceilings(max_total_sniff_bytes=len(inner) + 2000)
+        entries, _ = inspect_zip(outer, use_libmagic=False, ceilings=ceilings, max_depth=2)
+        nested = entries[0].entries
+        assert nested[-1].error == "Budget exceeded"
+        assert len(nested) < 10
+    
+    def test_zip_bomb_is_not_expanded(self):
+        # A stored 4 MiB archive deflates to a few KiB inside its parent
+        bomb = _zip_bytes({"zeros.bin": b"\x00" * (4 * 1024 * 1024)}, zipfile.ZIP_STORED)
+        outer = _zip_bytes({"bomb.zip": bomb})
+        entries, _ = inspect_zip(outer, use_libmagic=False, max_depth=2)
+        bomb_entry = entries[0]
+        assert bomb_entry.media_type == "application/zip"
+        assert "zip bomb" in bomb_entry.error
+        assert bomb_entry.entries == []
+    
+    def test_corrupt_nested_archive(self):
+        outer = _zip_bytes({"broken.zip": b"PK\x03\x04" + b"\x00" * 100})
+        entries, _ = inspect_zip(outer, use_libmagic=False, max_depth=2)
+        assert entries[0].media_type == "application/zip"
+        assert "Invalid ZIP" in entries[0].error
+
+
+def _tar_bytes(members, mode="w") -> bytes:
+    import io
+    import tarfile
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tf:
+        info = tarfile.TarInfo("docs")
+        info.type = tarfile.DIRTYPE
+        tf.addfile(info)
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class TestTarContainers:
+    """Test streaming TAR and GZIP inspection."""
+    
+    MEMBERS = {
+        "docs/a.pdf": b"%PDF-1.4\n" * 20,
+        "docs/b.png": b"\x89PNG\r\n\x1a\n" + b"\x00" * 100,
+        "docs/c.txt": b"hello world\n" * 20,
+    }
+    
+    def _summary(self, entries):
+        return [(e.name, e.media_type) for e in entries if not e.is_directory]
+    
+    def test_plain_tar(self):
+        entries, container_type = inspect_tar(_tar_bytes(self.MEMBERS), use_libmagic=False)
+        assert entries[0].is_directory
+        assert self._summary(entries) == [
+            ("docs/a.pdf", "application/pdf"),
+            ("docs/b.png", "image/png"),
+            ("docs/c.txt", "text/plain"),
+        ]
+        assert container_type is None
+    
+    def test_tar_gz(self, tmp_path):
+        archive = tmp_path / "batch.tar.gz"
+        archive.write_bytes(_tar_bytes(self.MEMBERS, mode="w:gz"))
+        result = detect_file(archive, use_libmagic=False)
+        assert result.media_type == "application/gzip"
+        assert result.is_container
+        assert result.container_inference == "application/x-tar"
+        assert self._summary(result.entries)[0] == ("docs/a.pdf", "application/pdf")
+        assert result.entries[1].size_bytes == len(self.MEMBERS["docs/a.pdf"])
+    
+    def test_plain_gzip(self, tmp_path):
+        import gzip
+        archive = tmp_path / "report.pdf.gz"
+        archive.write_bytes(gzip.compress(b"%PDF-1.4\n" * 20))
+        entries, container_type = inspect_gzip(archive, use_libmagic=False)
+        assert self._summary(entries) == [("report.pdf", "application/pdf")]
+        assert container_type is None
+    
+    def test_gzip_header_name(self, tmp_path):
+        import gzip
+        import io
+        buf = io.BytesIO()
+        with gzip.GzipFile(filename="original.txt", mode="wb", fileobj=buf) as gz:
+            gz.write(b"just text\n" * 10)
+        entries, _ = inspect_gzip(buf.getvalue(), use_libmagic=False)
+        assert self._summary(entries) == [("original.txt", "text/plain")]
+    
+    def test_tar_from_file_detection(self, tmp_path):
+        archive = tmp_path / "batch.tar"
+        archive.write_bytes(_tar_bytes(self.MEMBERS))
+        result = detect_file(archive, use_libmagic=False)
+        assert result.media_type == "application/x-tar"
+        assert len(self._summary(result.entries)) == 3
+    
+    def test_budgets(self):
+        data = _tar_bytes(self.MEMBERS, mode="w:gz")
+        entries, _ = inspect_tar(data, use_libmagic=False, ceilings=Ceilings(max_zip_entries=2))
+        assert entries[-1].error == "Too many entries"
+        assert len(entries) == 3
+        
+        entries, _ = inspect_tar(data, use_libmagic=False, ceilings=Ceilings(max_total_sniff_bytes=100))
+        assert entries[-1].error == "Budget exceeded"
+    
+    def test_decompression_limit(self):
+        data = _tar_bytes({"zeros.bin": bytes(32 * 1024 * 1024), "after.txt": b"text\n"}, mode="w:gz")
+        entries, _ = inspect_tar(data, use_libmagic=False)
+        assert [e.name for e in entries[1:]] == ["zeros.bin", "[TRUNCATED: decompression limit exceeded]"]
+        assert entries[-1].error.startswith("Possible decompression bomb")
+        
+        entries, _ = inspect_tar(data, use_libmagic=False, ceilings=Ceilings(max_compression_ratio=10**6))
+        assert [e.name for e in entries[1:]] == ["zeros.bin", "after.txt"]
+    
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            inspect_gzip(b"\x1f\x8b" + b"\x00" * 20, use_libmagic=False)
+        with pytest.raises(ValueError):
+            inspect_tar(b"not a tar" * 100, use_libmagic=False)
+
+
+class TestModels:
+    """Test the slotted result models and EntryTable."""
+    
+    def _entries(self, count):
+        entries = [EntryResult(name="docs/", media_type="", confidence=0, is_directory=True)]
+        for i in range(count):
+            entries.append(EntryResult(
+                name=f"docs/{i}.pdf",
+                media_type="application/pdf" if i % 2 else "text/plain",
+                confidence=100,
+                size_bytes=i * 10,
+                source="magic_bytes" if i % 2 else None,
+                error="Encrypted entry" if i == 3 else None
+            ))
+        return entries
+    
+    def test_containers_created_lazily(self):
+        result = DetectionResult(path="x")
+        assert not hasattr(result, "__dict__")
+        assert result._errors is None and result._entries is None
+        assert result.to_dict()["errors"] == []
+        assert result._errors is None
+        result.errors.append("boom")
+        assert result.to_dict()["errors"] == ["boom"]
+    
+    def test_equality_and_repr(self):
+        a = EntryResult(name="a", media_type="text/plain", confidence=70)
+        b = EntryResult(name="a", media_type="text/plain", confidence=70, entries=[])
+        assert a == b
+        assert "name='a'" in repr(a)
+        assert DetectionResult(sources={"magic": "x"}) != DetectionResult()
+    
+    def test_entry_table_round_trip(self):
+        entries = self._entries(50)
+        nested = EntryResult(name="inner.zip", media_type="application/zip", confidence=100,
+                             entries=[EntryResult(name="a.txt", media_type="text/plain", confidence=70)])
+        entries.append(nested)
+        table = EntryTable(entries)
+        assert len(table) == len(entries)
+        assert table == entries
+        assert list(table) == entries
+        assert table[-1] is nested
+        assert table[1:3] == entries[1:3]
+        assert table.type_ids[1] == MEDIA_TYPES.intern("text/plain")
+        with pytest.raises(IndexError):
+            table[len(entries)]
+    
+    def test_record_round_trip(self):
+        result = DetectionResult(path="a.zip", is_container=True, entries=self._entries(5))
+        result.sources["magic_bytes"] = "PK"
+        assert DetectionResult.from_record(result.to_record()) == result
+    
+    def test_large_archive_uses_table(self, tmp_path):
+        archive = tmp_path / "many.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            for i in range(ENTRY_TABLE_MIN):
+                zf.writestr(f"f{i}.txt", b"plain text\n")
+        entries, _ = inspect_zip(archive, use_libmagic=False)
+        assert isinstance(entries, EntryTable)
+        assert entries[5].name == "f5.txt" and entries[5].media_type == "text/plain"
+        
+        result = DetectionResult(entries=entries)
+        assert len(result.to_dict()["entries"]) == ENTRY_TABLE_MIN
+        assert pickle.loads(pickle.dumps(result)) == result
+    
+    def test_pickle_spells_out_media_types(self):
+        # Process pool workers intern media types in their own registry
+        entries = EntryTable([EntryResult(name="a", media_type="application/x-pickled-entry", confidence=1)])
+        result = DetectionResult(media_type="application/x-pickled", entries=entries)
+        data = pickle.dumps(result)
+        assert b"application/x-pickled" in data and b"application/x-pickled-entry" in data
+        assert pickle.loads(data) == result
+
+
+class TestMediaTypeRegistry:
+    """Test the interned media-type registry."""
+    
+    def test_intern_is_stable(self):
+        registry = MediaTypeRegistry()
+        pdf = registry.intern("application/pdf", "PDF document")
+        assert registry.intern("application/pdf") == pdf
+        assert registry.intern("image/png") == pdf + 1
+        assert registry.name(pdf) == "application/pdf"
+        assert registry.description(pdf) == "PDF document"
+        assert registry.category(pdf) == "document"
+        assert "image/png" in registry and len(registry) == 2
+    
+    def test_categories(self):
+        assert category_for("image/heic") == "image"
+        assert category_for("application/vnd.openxmlformats-officedocument.wordprocessingml.document") == "document"
+        assert category_for("application/x-tar") == "archive"
+        assert category_for("application/octet-stream") == "unknown"
+        assert category_for("application/x-something") == "other"
+    
+    def test_results_share_one_string(self):
+        media_type = "".join(["application/", "pdf"])
+        entry = EntryResult(name="a", media_type=media_type, confidence=100)
+        assert entry.type_id == MEDIA_TYPES.intern("application/pdf")
+        assert entry.media_type is detect_buffer(b"%PDF-1.5\n", use_libmagic=False).media_type
+        assert MEDIA_TYPES.description(entry.type_id) == "PDF document"
+    
+    def test_concurrent_intern(self):
+        registry = MediaTypeRegistry()
+        names = [f"application/x-test-{i % 50}" for i in range(2000)]
+        with ThreadPoolExecutor(8) as pool:
+            ids = list(pool.map(registry.intern, names))
+        assert len(registry) == 50
+        assert all(registry.name(i) == n for i, n in zip(ids, names))
+
+
+class TestDeadlines:
+    """Test timeout enforcement."""
+    
+    def test_deadline(self):
+        assert Deadline.after(None).remaining() is None
+        assert not Deadline.after(None).expired()
+        assert Deadline.after(0).expired()
+        assert Deadline.after(None).within(0).expired()
+        assert Deadline.after(60000).within(None).remaining() > 59
+    
+    @pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="Requires FIFOs")
+    def test_read_timeout(self, tmp_path):
+        fifo = tmp_path / "stalled"
+        os.mkfifo(fifo)
+        result = detect_file(fifo, use_libmagic=False, ceilings=Ceilings(timeout_ms=50))
+        assert any('timeout' in err.lower() for err in result.errors)
+    
+    @pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="Requires FIFOs")
+    def test_outer_deadline_caps_file_timeout(self, tmp_path):
+        fifo = tmp_path / "stalled"
+        os.mkfifo(fifo)
+        result = detect_file(fifo, use_libmagic=False, deadline=Deadline.after(50))
+        assert any('timeout' in err.lower() for err in result.errors)
+    
+    @pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="Requires FIFOs")
+    def test_reader_threads_are_reused(self, tmp_path, monkeypatch):
+        fifo = tmp_path / "stalled"
+        os.mkfifo(fifo)
+        detect_file(fifo, use_libmagic=False, deadline=Deadline.after(50))
+        
+        readers = set()
+        read_header = detect._read_header
+        
+        def spy(*args, **kwargs):
+            readers.add(threading.current_thread())
+            return read_header(*args, **kwargs)
+        
+        monkeypatch.setattr(detect, '_read_header', spy)
+        ceilings = Ceilings(timeout_ms=10000)
+        for _ in range(20):
+            result = detect_file(FIXTURES_DIR / "sample.pdf", use_libmagic=False, ceilings=ceilings)
+            assert result.media_type == "application/pdf"
+        assert len(readers) == 1
+        assert readers.pop() is not threading.current_thread()
+
+    def test_zip_deadline_truncates(self):
+        zip_path = FIXTURES_DIR / "archive.zip"
+        entries, _ = inspect_zip(zip_path, use_libmagic=False, deadline=Deadline.after(0))
+        assert entries[-1].name == "[TRUNCATED: timeout]"
+        assert all(e.name.startswith("[") for e in entries)
+
+
+class TestTracing:
+    """Test stage instrumentation."""
+    
+    def test_off_by_default(self):
+        assert trace.TRACER is None
+    
+    def test_profiler_collects_stages(self):
+        profiler = trace.Profiler()
+        with trace.tracing(profiler):
+            detect_file(FIXTURES_DIR / "archive.zip", use_libmagic=False)
+        assert trace.TRACER is None
+        
+        summary = profiler.summary()
+        stages = summary["stages"]
+        for name in ("detect_file", "stat", "read", "detect_buffer", "signatures", "zip_open", "zip_read"):
+            assert stages[name]["count"] >= 1
+        assert stages["detect_file"]["count"] == 1
+        assert stages["zip_read"]["count"] == 3
+        assert stages["read"]["bytes"] == (FIXTURES_DIR / "archive.zip").stat().st_size
+        assert summary["sources"]["magic_bytes"] >= 1
+        assert not profiler.events
+    
+    def test_chrome_trace(self, tmp_path):
+        profiler = trace.Profiler(keep_events=True)
+        with trace.tracing(profiler):
+            detect_buffer(b"plain text\n", use_libmagic=False)
+        trace_path = tmp_path / "trace.json"
+        profiler.write_chrome_trace(str(trace_path))
+        
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert [e["name"] for e in events] == ["signatures", "text_heuristic", "structured", "detect_buffer"]
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+        assert events[-1]["args"] == {"bytes": 11, "source": "heuristic"}
+
+
+class TestMagicPool:
+    """Test libmagic handle pooling."""
+    
+    def test_lazy_creation(self):
+        pool = MagicPool(factory=object)
+        assert pool.size == 0
+        with pool.handle():
+            assert pool.size == 1
+    
+    def test_handles_are_reused(self):
+        pool = MagicPool(factory=object)
+        with pool.handle() as first:
+            pass
+        with pool.handle() as second:
+            pass
+        assert first is second
+        assert pool.size == 1
+    
+    def test_concurrent_checkouts_get_distinct_handles(self):
+        pool = MagicPool(factory=object)
+        with pool.handle() as first:
+            with pool.handle() as second:
+                assert first is not second
+        assert pool.size == 2
+    
+    def test_max_size_discards_extra_handles(self):
+        pool = MagicPool(max_size=1, factory=object)
+        first = pool.acquire()
+        second = pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        assert pool.size == 1
+    
+    def test_reservations_raise_limit_temporarily(self):
+        pool = MagicPool(max_size=1, factory=object)
+        pool.reserve(2)
+        pool.reserve(1)
+        handles = [pool.acquire() for _ in range(3)]
+        for handle in handles:
+            pool.release(handle)
+        assert (pool.idle_limit, pool.size) == (3, 3)
+        pool.unreserve(1)
+        assert (pool.idle_limit, pool.size) == (2, 2)
+        pool.unreserve(2)
+        assert (pool.idle_limit, pool.size) == (1, 1)
+    
+    def test_detectors_release_reservations(self):
+        limit = detect.MAGIC_POOL.idle_limit
+        list(detect_many([b'text\n'] * 4, workers=limit + 8, use_libmagic=False))
+        assert detect.MAGIC_POOL.idle_limit == limit
+        
+        detector = aio.AsyncDetector(concurrency=limit + 8)
+        assert detect.MAGIC_POOL.idle_limit >= limit + 8
+        detector.close()
+        detector.close()
+        assert detect.MAGIC_POOL.idle_limit == limit
+    
+    def test_reset_after_fork(self, monkeypatch):
+        pool = MagicPool(factory=object)
+        with pool.handle() as first:
+            pass
+        monkeypatch.setattr(pool, '_pid', -1)
+        with pool.handle() as second:
+            pass
+        assert first is not second